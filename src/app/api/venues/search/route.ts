@@ -4,13 +4,39 @@
  */
 
 import { NextRequest, NextResponse } from 'next/server';
-import { getVenueSearchEngine } from '@/lib/venue-search';
-import type { VenueSearchFilters } from '@/lib/venue-search';
+import { activeFilters, getVenueSearchEngine, projectResult } from '@/lib/venue-search';
+import type { VenueSearchFilters, VenueSearchResult } from '@/lib/venue-search';
+
+// Resident Python search server (venue-crawler: python main.py --serve); when set, searches
+// are proxied to it instead of loading every venue file into this process
+const SEARCH_SERVER_URL = process.env.VENUE_SEARCH_URL;
+// A server that hangs instead of refusing the connection falls back to in-process search after this
+const SEARCH_SERVER_TIMEOUT_MS = Number(process.env.VENUE_SEARCH_TIMEOUT_MS ?? 2000);
+
+async function searchViaServer(
+  query: string,
+  filters: VenueSearchFilters | undefined,
+  maxResults: number,
+  fields: string[] | undefined
+): Promise<Partial<VenueSearchResult>[]> {
+  const response = await fetch(`${SEARCH_SERVER_URL}/search`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ query, filters, max_results: maxResults, fields }),
+    cache: 'no-store',
+    signal: AbortSignal.timeout(SEARCH_SERVER_TIMEOUT_MS)
+  });
+  if (!response.ok) {
+    throw new Error(`Search server responded ${response.status}`);
+  }
+  const data = await response.json();
+  return data.results;
+}
 
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json();
-    const { query, filters, maxResults = 10 } = body;
+    const { query, filters, maxResults = 10, fields } = body;
 
     if (!query || typeof query !== 'string') {
       return NextResponse.json(
@@ -19,12 +45,33 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    const searchEngine = getVenueSearchEngine();
-    const results = searchEngine.search(
-      query,
-      filters as VenueSearchFilters,
-      maxResults
-    );
+    if (fields !== undefined && !(Array.isArray(fields) && fields.every((field: unknown) => typeof field === 'string'))) {
+      return NextResponse.json(
+        { error: 'fields must be an array of strings' },
+        { status: 400 }
+      );
+    }
+
+    let results: Partial<VenueSearchResult>[] | undefined;
+    if (SEARCH_SERVER_URL) {
+      try {
+        // Only the filters the in-process fallback applies, with the same (truthy = set) meaning
+        results = await searchViaServer(query, activeFilters(filters), maxResults, fields);
+      } catch (error) {
+        console.warn('Venue search server unavailable, searching in-process:', error);
+      }
+    }
+
+    if (!results) {
+      const searchEngine = getVenueSearchEngine();
+      const matches = searchEngine.search(
+        query,
+        filters as VenueSearchFilters,
+        maxResults
+      );
+      // Same shape as the server's projected results
+      results = fields ? matches.map((match) => projectResult(match, fields)) : matches;
+    }
 
     return NextResponse.json({
       success: true,
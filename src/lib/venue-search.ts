@@ -107,10 +107,70 @@ export interface VenueSearchFilters {
   price_max?: number;
 }
 
+const FILTER_KEYS: (keyof VenueSearchFilters)[] = [
+  'min_capacity', 'max_capacity', 'has_kitchen', 'has_parking', 'has_accommodation', 'venue_type', 'price_max'
+];
+
+/**
+ * The filters applyFilters acts on: known keys with a truthy value (has_kitchen: false,
+ * min_capacity: 0 or venue_type: '' filter nothing), so the Python search server, which
+ * requires has_kitchen / has_parking whenever they are present, applies the same ones
+ */
+export function activeFilters(filters?: VenueSearchFilters): VenueSearchFilters | undefined {
+  if (!filters || typeof filters !== 'object') return undefined;
+  const active: Record<string, unknown> = {};
+  for (const key of FILTER_KEYS) {
+    if (filters[key]) active[key] = filters[key];
+  }
+  return active as VenueSearchFilters;
+}
+
+// Every match_type the Python search engine (venue-crawler/search) can return
+export type VenueMatchType = 'exact' | 'fuzzy' | 'location' | 'nearby' | 'text';
+
 export interface VenueSearchResult extends VenueData {
   match_score: number;
-  match_type: 'exact' | 'fuzzy' | 'location';
+  match_type: VenueMatchType;
   matched_keyword?: string;
+  distance_km?: number;
+}
+
+/**
+ * Copy only the requested fields of a search result, like the Python engine's `fields`
+ * projection: dotted paths keep their nesting, missing paths are skipped, and venue_id
+ * plus the match keys are always kept
+ */
+export function projectResult(result: VenueSearchResult, fields: string[]): Partial<VenueSearchResult> {
+  const projected: Record<string, unknown> = { venue_id: result.venue_id };
+  for (const field of fields) {
+    const parts = field.split('.');
+    let value: unknown = result;
+    let found = true;
+    for (const part of parts) {
+      if (typeof value !== 'object' || value === null || Array.isArray(value) || !(part in value)) {
+        found = false;
+        break;
+      }
+      value = (value as Record<string, unknown>)[part];
+    }
+    if (!found) continue;
+
+    let target = projected;
+    for (const part of parts.slice(0, -1)) {
+      target[part] = target[part] ?? {};
+      target = target[part] as Record<string, unknown>;
+    }
+    target[parts[parts.length - 1]] = value;
+  }
+
+  const { match_score, match_type, matched_keyword, distance_km } = result;
+  return {
+    ...projected,
+    match_score,
+    match_type,
+    ...(matched_keyword !== undefined && { matched_keyword }),
+    ...(distance_km !== undefined && { distance_km })
+  } as Partial<VenueSearchResult>;
 }
 
 class VenueSearchEngine {
@@ -0,0 +1,53 @@
+// src/test/venue-search.test.ts
+import { describe, it, expect } from 'vitest';
+import { activeFilters, projectResult } from '@/lib/venue-search';
+import type { VenueSearchResult } from '@/lib/venue-search';
+
+// The same cases venue-crawler/test_results.py runs against the Python engine's project()
+const result = {
+  venue_id: 'v',
+  basic_info: { official_name: 'Hall', aliases: ['H'] },
+  location: { address: 'Road', coordinates: null },
+  pricing: 5,
+  match_score: 85,
+  match_type: 'fuzzy',
+  matched_keyword: 'hall'
+} as unknown as VenueSearchResult;
+
+const matchInfo = { match_score: 85, match_type: 'fuzzy', matched_keyword: 'hall' };
+
+describe('Venue search result projection', () => {
+  it('keeps nesting of the requested dotted paths', () => {
+    expect(projectResult(result, ['basic_info.official_name', 'location.address', 'pricing'])).toEqual({
+      venue_id: 'v',
+      basic_info: { official_name: 'Hall' },
+      location: { address: 'Road' },
+      pricing: 5,
+      ...matchInfo
+    });
+  });
+
+  it('skips missing paths without leaving empty parents', () => {
+    expect(projectResult(result, ['location.coordinates.latitude', 'pricing.max', 'nope', 'basic_info.nope'])).toEqual({
+      venue_id: 'v',
+      ...matchInfo
+    });
+    expect(projectResult(result, ['location.coordinates'])).toEqual({
+      venue_id: 'v',
+      location: { coordinates: null },
+      ...matchInfo
+    });
+    expect(projectResult(result, [])).toEqual({ venue_id: 'v', ...matchInfo });
+  });
+});
+
+// The Python server drops the same unset filters (venue-crawler/test_search_server.py)
+describe('Venue search active filters', () => {
+  it('drops unset and unknown filters', () => {
+    expect(activeFilters({ has_kitchen: false, has_parking: true, min_capacity: 0, venue_type: '', price_max: 1500 }))
+      .toEqual({ has_parking: true, price_max: 1500 });
+    expect(activeFilters({ near: 'Kochi', max_capacity: 300 } as never)).toEqual({ max_capacity: 300 });
+    expect(activeFilters(undefined)).toBeUndefined();
+    expect(activeFilters({})).toEqual({});
+  });
+});
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Index Benchmark - Trigram-pruned vs full-scan keyword matching
+Checks that both return the same top-k and reports per-query latency as the keyword count grows
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from fuzzywuzzy import fuzz, process
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import FUZZY_MATCH_THRESHOLD
+from search.fuzzy_index import TrigramIndex
+
+WORDS = [
+    'grand', 'hyatt', 'bolgatty', 'casino', 'hotel', 'crowne', 'plaza', 'taj', 'malabar', 'le', 'meridien',
+    'ramada', 'resort', 'croft', 'trinita', 'casa', 'palace', 'marine', 'drive', 'kochi', 'ernakulam',
+    'banquet', 'hall', 'convention', 'centre', 'auditorium', 'lakeside', 'residency', 'gardens', 'international',
+    'kakkanad', 'edappally', 'vyttila', 'aluva', 'kaloor', 'fort', 'island', 'willingdon', 'heritage', 'royal'
+]
+
+
+def synthetic_keywords(count: int, rng: random.Random):
+    keywords = set()
+    while len(keywords) < count:
+        words = rng.sample(WORDS, rng.randint(1, 4))
+        keywords.add(' '.join(words) + (f' {rng.randint(1, 999)}' if rng.random() < 0.7 else ''))
+    return list(keywords)
+
+
+def typo(text: str, rng: random.Random) -> str:
+    chars = list(text)
+    for _ in range(rng.randint(0, 2)):
+        position = rng.randrange(len(chars))
+        operation = rng.choice(('drop', 'swap', 'insert'))
+        if operation == 'drop' and len(chars) > 3:
+            chars.pop(position)
+        elif operation == 'swap' and position + 1 < len(chars):
+            chars[position], chars[position + 1] = chars[position + 1], chars[position]
+        else:
+            chars.insert(position, rng.choice('abcdefghijklmnopqrstuvwxyz'))
+    return ''.join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark trigram-pruned fuzzy keyword lookup')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='Keyword counts')
+    parser.add_argument('--queries', type=int, default=50, help='Queries per size')
+    parser.add_argument('--verify', type=int, default=10, help='Queries per size also run as a full scan')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"\n  {'keywords':>9}{'build s':>10}{'candidates':>12}{'indexed ms':>12}{'full scan ms':>14}  top-k")
+
+    for size in args.sizes:
+        keywords = synthetic_keywords(size, rng)
+        queries = [typo(rng.choice(keywords), rng) for _ in range(args.queries // 2)]
+        queries += [' '.join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(args.queries - len(queries))]
+
+        start = time.perf_counter()
+        index = TrigramIndex(keywords)
+        build_time = time.perf_counter() - start
+
+        indexed_time, candidate_total, results = 0.0, 0, []
+        for query in queries:
+            start = time.perf_counter()
+            candidates = index.candidates(query, FUZZY_MATCH_THRESHOLD)
+            matches = process.extract(query, candidates, scorer=fuzz.token_sort_ratio, limit=20)
+            indexed_time += time.perf_counter() - start
+            candidate_total += len(candidates)
+            results.append([m for m in matches if m[1] >= FUZZY_MATCH_THRESHOLD])
+
+        full_time, identical = 0.0, True
+        for query, expected in zip(queries[:args.verify], results):
+            start = time.perf_counter()
+            matches = process.extract(query, keywords, scorer=fuzz.token_sort_ratio, limit=20)
+            full_time += time.perf_counter() - start
+            identical &= [m for m in matches if m[1] >= FUZZY_MATCH_THRESHOLD] == expected
+
+        verified = max(1, min(args.verify, len(queries)))
+        print(
+            f"  {size:>9}{build_time:>10.2f}{candidate_total / len(queries):>12.0f}"
+            f"{indexed_time / len(queries) * 1000:>12.2f}{full_time / verified * 1000:>14.2f}"
+            f"  {'identical' if identical else 'MISMATCH'}"
+        )
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Index Build Benchmark - Keyword postings and full index compile time vs venue count
+Compares array-backed ordinal postings with the old list-membership keyword map on synthetic venues
+"""
+
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from search.postings import KeywordPostings
+from search.index_store import CompiledIndex
+from search.venue_search import VenueSearchEngine
+
+NAMES = ['grand', 'hyatt', 'casino', 'crowne', 'plaza', 'malabar', 'meridien', 'ramada', 'croft', 'trinita',
+         'palace', 'lakeside', 'residency', 'gardens', 'heritage', 'royal', 'pearl', 'harbour', 'spice', 'coast']
+AREAS = ['Marine Drive', 'Kakkanad', 'Edappally', 'Vyttila', 'Aluva', 'Kaloor', 'Fort Kochi', 'Willingdon Island']
+# Carried by most venues, like "kochi" / "wedding venue" / "banquet hall" in crawled data
+COMMON = ['kochi', 'wedding venue', 'banquet hall', 'event venue', 'ernakulam', 'conference hall']
+
+
+def synthetic_venues(count: int, rng: random.Random) -> List[Dict]:
+    venues = []
+    for i in range(count):
+        name = f"{' '.join(rng.sample(NAMES, 2)).title()} {i}"
+        area = rng.choice(AREAS)
+        venues.append({
+            'venue_id': f"bench_{i}",
+            'basic_info': {'official_name': name, 'aliases': [name.split()[0] + f" {i}"],
+                           'venue_type': rng.choice(['hotel', 'convention_center', 'resort'])},
+            'location': {'address': f"{area}, Kochi, Kerala", 'pin_code': str(682000 + rng.randint(1, 40)),
+                         'coordinates': {'latitude': 9.9 + rng.random() / 5, 'longitude': 76.2 + rng.random() / 5}},
+            'capacity': {'event_spaces': [{'max_guests': rng.choice([100, 300, 800])}], 'parking_capacity': 50},
+            'catering': {'in_house_catering': rng.random() < 0.5},
+            'facilities': {'accommodation_available': rng.random() < 0.3},
+            'pricing': {'per_plate_cost_max': rng.choice([None, 900, 1800])},
+            'search_keywords': {
+                'primary_keywords': [name.lower(), f"{name.split()[0].lower()} {area.lower()}"],
+                'secondary_keywords': rng.sample(COMMON, 4) + [area.lower()]
+            }
+        })
+    return venues
+
+
+def legacy_keyword_map(venues: List[Dict]) -> Dict[str, List[str]]:
+    """The previous keyword -> venue_ids map (dedupe by list membership)"""
+    keyword_map: Dict[str, List[str]] = {}
+    for venue in venues:
+        venue_id = venue['venue_id']
+        keywords = venue.get('search_keywords', {})
+        for keyword in keywords.get('primary_keywords', []):
+            keyword_map.setdefault(keyword.lower(), []).append(venue_id)
+        for keyword in keywords.get('secondary_keywords', []) + venue.get('basic_info', {}).get('aliases', []):
+            venue_ids = keyword_map.setdefault(keyword.lower(), [])
+            if venue_id not in venue_ids:
+                venue_ids.append(venue_id)
+    return keyword_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark keyword postings and search index build time')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='Venue counts')
+    parser.add_argument('--legacy-max', type=int, default=10000,
+                        help='Largest venue count to also time the quadratic legacy keyword map at')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"\n  {'venues':>8}{'keywords':>10}{'postings s':>12}{'legacy s':>10}{'compile s':>11}  postings")
+
+    for size in args.sizes:
+        venues = synthetic_venues(size, rng)
+
+        start = time.perf_counter()
+        postings = KeywordPostings.build(venues, VenueSearchEngine._venue_keywords)
+        postings_time = time.perf_counter() - start
+
+        legacy_time, identical = None, None
+        if size <= args.legacy_max:
+            start = time.perf_counter()
+            keyword_map = legacy_keyword_map(venues)
+            legacy_time = time.perf_counter() - start
+            ordinals = {venue['venue_id']: i for i, venue in enumerate(venues)}
+            identical = list(keyword_map) == postings.keywords and all(
+                sorted({ordinals[venue_id] for venue_id in venue_ids}) == postings.posting(k).tolist()
+                for k, venue_ids in enumerate(keyword_map.values())
+            )
+
+        index_dir = Path(tempfile.mkdtemp(prefix='index-bench-'))
+        try:
+            start = time.perf_counter()
+            CompiledIndex.build(index_dir, 'bench', venues, postings)
+            compile_time = time.perf_counter() - start
+        finally:
+            shutil.rmtree(index_dir, ignore_errors=True)
+
+        legacy = f"{legacy_time:.3f}" if legacy_time is not None else '-'
+        print(
+            f"  {size:>8}{len(postings):>10}{postings_time:>12.3f}{legacy:>10}{compile_time:>11.2f}"
+            f"  {'-' if identical is None else 'identical' if identical else 'MISMATCH'}"
+        )
+    print()
+
+
+if __name__ == "__main__":
+    main()
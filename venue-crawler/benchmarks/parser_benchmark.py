@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Parser Benchmark - Listing-page throughput (pages/sec) per parser backend
+Uses pages saved in the HTTP cache (data/cache/<source>/http) or generated fixtures
+"""
+
+import sys
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import CACHE_DIR, PARSER_PROCESSES
+from crawlers.parsers import PARSER_BACKENDS, extract_listing
+from crawlers.venuemonk_crawler import VenueMonkCrawler
+from crawlers.weddingvenues_crawler import WeddingVenuesCrawler
+from crawlers.venuelook_crawler import VenuelookCrawler
+
+CRAWLERS = {
+    'venuemonk': VenueMonkCrawler,
+    'weddingvenues': WeddingVenuesCrawler,
+    'venuelook': VenuelookCrawler
+}
+
+
+def load_fixtures(fixtures_dir: Path):
+    """Read every saved .html page under a directory"""
+    return [path.read_text(encoding='utf-8', errors='replace') for path in sorted(fixtures_dir.rglob('*.html'))]
+
+
+def generate_fixtures(pages: int, cards_per_page: int):
+    """Listing pages shaped like a real site: page chrome, navigation, scripts and venue cards"""
+    rng = random.Random(42)
+    chrome = (
+        '<head><title>Wedding Venues in Kochi</title>'
+        + ''.join(f'<script src="/static/app{i}.js"></script>' for i in range(10))
+        + '<style>' + 'body { margin: 0 } ' * 200 + '</style></head>'
+        + '<nav><ul>' + ''.join(f'<li><a href="/kochi/{i}">Area {i}</a></li>' for i in range(60)) + '</ul></nav>'
+    )
+    footer = '<footer>' + ''.join(f'<p>Footer link <a href="/f/{i}">{i}</a></p>' for i in range(80)) + '</footer>'
+
+    fixtures = []
+    for page in range(pages):
+        cards = ''.join(
+            f'<div class="venue-card listing-card col-md-4">'
+            f'<div class="img"><img src="/img/{page}_{i}.jpg" alt="venue"></div>'
+            f'<h3 class="venue-name title"><a href="/kochi/venue-{page}-{i}">Venue {page} {i}</a></h3>'
+            f'<div class="location">Marine Drive, Kochi</div>'
+            f'<span>{rng.randint(1, 20) * 50} guests</span>'
+            f'<span class="price">₹ {rng.randint(6, 30) * 100} per plate</span>'
+            f'<span class="rating stars">{rng.randint(30, 50) / 10}</span>'
+            f'<p class="amenities">' + ' '.join(f'<i>amenity {k}</i>' for k in range(8)) + '</p>'
+            f'</div>'
+            for i in range(cards_per_page)
+        )
+        fixtures.append(f'<html>{chrome}<body><div class="container">{cards}</div>{footer}</body></html>')
+
+    return fixtures
+
+
+def run_inline(fixtures, spec, backend, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html_content in fixtures:
+            extract_listing(html_content, spec, backend)
+    return len(fixtures) * repeat / (time.perf_counter() - start)
+
+
+def run_pool(pool, fixtures, spec, backend, repeat):
+    pages = fixtures * repeat
+    list(pool.map(extract_listing, fixtures[:1], [spec], [backend]))  # warm the workers
+    start = time.perf_counter()
+    list(pool.map(extract_listing, pages, [spec] * len(pages), [backend] * len(pages), chunksize=4))
+    return len(pages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark listing-page parser backends')
+    parser.add_argument('--source', choices=list(CRAWLERS.keys()), default='venuemonk',
+                        help='Crawler whose listing selectors are used')
+    parser.add_argument('--fixtures', type=Path,
+                        help='Directory of saved listing pages (default: the source\'s HTTP cache)')
+    parser.add_argument('--generate', action='store_true', help='Use generated fixtures instead of saved pages')
+    parser.add_argument('--pages', type=int, default=20, help='Generated pages')
+    parser.add_argument('--cards', type=int, default=40, help='Venue cards per generated page')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the fixtures per backend')
+    parser.add_argument('--workers', type=int, default=PARSER_PROCESSES, help='Process pool size')
+    args = parser.parse_args()
+
+    spec = CRAWLERS[args.source].LISTING_SPEC
+
+    fixtures = []
+    if not args.generate:
+        fixtures = load_fixtures(args.fixtures or CACHE_DIR / args.source / 'http')
+    if not fixtures:
+        print(f"Generating {args.pages} pages x {args.cards} cards")
+        fixtures = generate_fixtures(args.pages, args.cards)
+
+    size_kb = sum(len(html_content) for html_content in fixtures) / len(fixtures) / 1024
+    print(f"\n{len(fixtures)} pages, avg {size_kb:.0f} KB, {args.source} selectors, {args.workers} workers\n")
+
+    baseline = None
+    for backend in PARSER_BACKENDS:
+        cards = sum(len(extract_listing(html_content, spec, backend)) for html_content in fixtures)
+        if baseline is None:
+            baseline = cards
+        mismatch = '' if cards == baseline else f'  (!= soup: {baseline} cards)'
+        print(f"  {backend:<9} cards found: {cards}{mismatch}")
+
+    print(f"\n  {'backend':<10}{'inline pages/s':>16}{'pool pages/s':>16}")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for backend in PARSER_BACKENDS:
+            inline = run_inline(fixtures, spec, backend, args.repeat)
+            pooled = run_pool(pool, fixtures, spec, backend, args.repeat)
+            print(f"  {backend:<10}{inline:>16.1f}{pooled:>16.1f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
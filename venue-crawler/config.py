@@ -15,10 +15,13 @@ BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 VENUES_DIR = DATA_DIR / "venues"
 CACHE_DIR = DATA_DIR / "cache"
+MANIFESTS_DIR = DATA_DIR / "manifests"
+ARCHIVE_DIR = DATA_DIR / "archive"
+SEARCH_INDEX_DIR = DATA_DIR / "index"
 LOGS_DIR = BASE_DIR / "logs"
 
 # Create directories if they don't exist
-for directory in [DATA_DIR, VENUES_DIR, CACHE_DIR, LOGS_DIR]:
+for directory in [DATA_DIR, VENUES_DIR, CACHE_DIR, MANIFESTS_DIR, ARCHIVE_DIR, SEARCH_INDEX_DIR, LOGS_DIR]:
     directory.mkdir(exist_ok=True, parents=True)
 
 # API Keys
@@ -27,7 +30,47 @@ GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
 # Crawling Configuration
 REQUESTS_PER_SECOND = int(os.getenv("REQUESTS_PER_SECOND", "2"))
 CONCURRENT_REQUESTS = int(os.getenv("CONCURRENT_REQUESTS", "5"))
+CRAWL_ENGINE = os.getenv("CRAWL_ENGINE", "sync")  # sync | async | pipeline
+LISTING_PREFETCH_PAGES = int(os.getenv("LISTING_PREFETCH_PAGES", "3"))  # speculative pages ahead during pagination
 REQUEST_TIMEOUT = 30
+
+# Per-host token bucket (see crawlers/rate_limiter.py)
+# Starts at REQUESTS_PER_SECOND, grows additively on success up to RATE_LIMIT_MAX_RPS,
+# and is multiplied by RATE_LIMIT_DECREASE_FACTOR on every 429/503
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "4"))
+RATE_LIMIT_MIN_RPS = float(os.getenv("RATE_LIMIT_MIN_RPS", "0.2"))
+RATE_LIMIT_MAX_RPS = float(os.getenv("RATE_LIMIT_MAX_RPS", str(REQUESTS_PER_SECOND * 2)))
+RATE_LIMIT_INCREASE_STEP = 0.05
+RATE_LIMIT_DECREASE_FACTOR = 0.5
+
+# HTTP response cache (see crawlers/http_cache.py)
+# Pages fetched within the TTL are reused without a request; older ones are
+# revalidated with If-None-Match / If-Modified-Since (0 = always revalidate)
+HTTP_CACHE_TTL_HOURS = float(os.getenv("HTTP_CACHE_TTL_HOURS", "12"))
+
+# Persistent crawl work queue (see crawlers/work_queue.py)
+QUEUE_DB = DATA_DIR / "crawl_queue.db"
+QUEUE_BATCH_SIZE = 25           # venues claimed per batch (checkpoint granularity)
+QUEUE_MAX_ATTEMPTS = 5          # attempts before a URL is dead-lettered
+QUEUE_BACKOFF_SECONDS = 2.0     # retry delay = QUEUE_BACKOFF_SECONDS * 2^(attempt - 1)
+
+# Staged pipeline engine (see crawlers/pipeline.py)
+# fetch threads -> parse/validate process pool -> batched writer thread
+PIPELINE_PARSE_WORKERS = int(os.getenv("PIPELINE_PARSE_WORKERS", str(os.cpu_count() or 2)))
+PIPELINE_QUEUE_SIZE = 50        # bound on pages waiting between stages (backpressure)
+PIPELINE_SAVE_BATCH = 20        # venues written per writer batch
+PIPELINE_BATCH_SIZE = 500       # venues claimed from the work queue per pipeline run
+
+# Listing-page parser backend (see crawlers/parsers.py)
+# soup: full BeautifulSoup tree | strainer: SoupStrainer partial tree | lxml: raw lxml XPath
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", "soup")
+PARSER_PROCESSES = int(os.getenv("PARSER_PROCESSES", str(os.cpu_count() or 2)))
+
+# Raw HTML archive for offline re-parsing (see crawlers/html_archive.py)
+# Content-addressed compressed blobs + a (source, url, fetched_at) index; zstd needs `zstandard`, else gzip
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+ARCHIVE_CODEC = os.getenv("ARCHIVE_CODEC", "zstd")  # zstd | gzip
+ARCHIVE_COMPRESSION_LEVEL = int(os.getenv("ARCHIVE_COMPRESSION_LEVEL", "9"))
 MAX_RETRIES = 3
 
 # User Agent
@@ -82,6 +125,24 @@ SCHEMA_VERSION = "2025-01-02"
 
 # Search Keywords Configuration
 FUZZY_MATCH_THRESHOLD = 80  # Minimum similarity score (0-100)
+TEXT_FUZZY_THRESHOLD = 80   # min similarity for expanding a misspelled query token (search_text)
+DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "256"))  # full venue documents kept decoded (LRU)
+GEO_GRID_CELL_DEG = 0.05    # geo index grid cell size in degrees (~5.5 km of latitude)
+INDEX_WATCH_INTERVAL_SECONDS = float(os.getenv("INDEX_WATCH_INTERVAL_SECONDS", "5"))  # venues dir polling (watch())
+INDEX_COMPACT_THRESHOLD = int(os.getenv("INDEX_COMPACT_THRESHOLD", "500"))  # appended + tombstoned venues before recompiling
+
+# Search result cache (see search/result_cache.py)
+# memory: per-process LRU | sqlite: RESULT_CACHE_DB shared by all workers on the host | none
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory")
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "300"))
+RESULT_CACHE_DB = DATA_DIR / "result_cache.db"
+
+# Search server (search/server.py, python main.py --serve)
+SEARCH_SERVER_HOST = os.getenv("SEARCH_SERVER_HOST", "127.0.0.1")
+SEARCH_SERVER_PORT = int(os.getenv("SEARCH_SERVER_PORT", "8765"))
+SEARCH_SERVER_WORKERS = int(os.getenv("SEARCH_SERVER_WORKERS", str(min(8, os.cpu_count() or 1))))  # search threads
+SEARCH_SERVER_WATCH = os.getenv("SEARCH_SERVER_WATCH", "false").lower() == "true"  # sync venue file changes
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -0,0 +1,250 @@
+"""
+Shared test fixtures - a local venue listing site and a crawler for it
+Crawls run against 127.0.0.1 with every output directory redirected to a pytest tmp_path
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# The fixture site is local: crawl it without the politeness delay
+os.environ.setdefault("REQUESTS_PER_SECOND", "1000")
+
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent / "crawlers"))
+
+import base_crawler
+import work_queue
+from base_crawler import BaseCrawler
+from crawl_manifest import CrawlManifest
+from html_archive import HtmlArchive
+from parsers import ListingSpec
+from work_queue import CrawlQueue
+
+SAMPLE_VENUE_FILE = Path(__file__).parent / "data" / "venues" / "kochi_casino_hotel_001.json"
+PAGE_SIZE = 5
+
+
+class VenueSite:
+    """
+    In-memory venue site: /venues?page=N listing pages and /venue/<slug> detail pages
+    Detail pages carry an ETag and answer a matching If-None-Match with 304; they can be
+    made slow, any path can be queued canned error responses, and broken paths always fail
+    """
+
+    def __init__(self, venues: Dict[str, tuple], detail_delay: float = 0.0):
+        self.venues = dict(venues)  # slug -> (name, max_guests)
+        self.detail_delay = detail_delay
+        self.banner = ''  # extra markup on every detail page that no extractor reads
+        self.failures: Dict[str, List[tuple]] = {}
+        self.broken = set()
+        self.requests: List[tuple] = []  # (path, request headers)
+        self.served: List[str] = []      # detail pages sent with a full body
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.url = None
+
+    def fail(self, path: str, *responses: tuple):
+        """Answer the next requests for `path` with (status, headers) before serving it normally"""
+        self.failures.setdefault(path, []).extend(responses)
+
+    def requested(self, path: str) -> List[Dict]:
+        return [headers for requested_path, headers in self.requests if requested_path == path]
+
+    def listing_html(self, page: int) -> str:
+        slugs = list(self.venues)[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        cards = ''.join(
+            f'<div class="venue-card"><h3 class="venue-name"><a href="/venue/{slug}">{self.venues[slug][0]}</a></h3>'
+            f'<span class="capacity">Up to {self.venues[slug][1]} guests</span></div>'
+            for slug in slugs
+        )
+        return f'<html><body><div class="listing">{cards}</div></body></html>'
+
+    def detail_html(self, slug: str) -> str:
+        name, max_guests = self.venues[slug]
+        return (
+            f'<html><head><title>{name}</title></head><body>{self.banner}'
+            f'<h1 class="venue-name">{name}</h1><p class="capacity">50 - {max_guests} guests</p>'
+            f'</body></html>'
+        )
+
+    def respond(self, path: str, query: Dict, headers: Dict) -> tuple:
+        """Return (status, headers, body) for a request"""
+        with self._lock:
+            self.requests.append((path, headers))
+            if path in self.broken:
+                return 500, {}, ''
+            pending = self.failures.get(path)
+            if pending:
+                status, extra_headers = pending.pop(0)
+                return status, extra_headers, ''
+
+        if path == '/venues':
+            return 200, {}, self.listing_html(int(query.get('page', ['1'])[0]))
+
+        slug = path.rsplit('/', 1)[-1]
+        if not path.startswith('/venue/') or slug not in self.venues:
+            return 404, {}, ''
+
+        body = self.detail_html(slug)
+        etag = '"' + hashlib.sha1(body.encode('utf-8')).hexdigest() + '"'
+        if headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, ''
+
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.detail_delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.served.append(path)
+        return 200, {'ETag': etag}, body
+
+
+def _handler(site: VenueSite):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            status, headers, body = site.respond(parsed.path, parse_qs(parsed.query), dict(self.headers))
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def make_site_venues(count: int) -> Dict[str, tuple]:
+    return {f"hall-{i:03d}": (f"Fixture Hall {i:03d}", 100 + 10 * i) for i in range(count)}
+
+
+@pytest.fixture
+def site():
+    """A running VenueSite with 12 venues (three listing pages)"""
+    venue_site = VenueSite(make_site_venues(12))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _handler(venue_site))
+    venue_site.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield venue_site
+    server.shutdown()
+    server.server_close()
+
+
+class FixtureCrawler(BaseCrawler):
+    """Crawler for VenueSite; detail pages become copies of a sample venue file"""
+
+    LISTING_SPEC = ListingSpec(
+        card_tags=('div',),
+        card_class=re.compile(r'venue-card'),
+        name_tags=('h3',),
+        name_class=re.compile(r'venue-name'),
+        previews=(('capacity_hint', 'text', re.compile(r'\d+ guests')),)
+    )
+
+    def __init__(self, base_url: str = "http://127.0.0.1", source_name: str = "fixture"):
+        super().__init__(source_name=source_name, base_url=base_url)
+        with open(SAMPLE_VENUE_FILE, 'r', encoding='utf-8') as f:
+            self.sample_venue = json.load(f)
+
+    def get_venue_list(self, city: str = "Kochi") -> List[Dict]:
+        venues = []
+        page = 1
+        while True:
+            response = self._rate_limited_request(f"{self.base_url}/venues?page={page}")
+            if not response:
+                break
+            soup = self._parse_html(response.text)
+            cards = soup.find_all('div', class_='venue-card')
+            if not cards:
+                break
+            for card in cards:
+                link = card.find('a')
+                venues.append({'name': link.get_text(strip=True), 'url': self.base_url + link['href']})
+            page += 1
+        return venues
+
+    def parse_venue_details(self, venue_url: str, html_content: str) -> Optional[Dict]:
+        soup = self._parse_html(html_content)
+        name_elem = soup.find('h1', class_='venue-name')
+        if not name_elem:
+            return None
+
+        name = name_elem.get_text(strip=True)
+        max_guests = int(soup.find(class_='capacity').get_text().split()[2])
+
+        venue = copy.deepcopy(self.sample_venue)
+        venue['venue_id'] = f"fixture_{self._venue_slug(venue_url).replace('-', '_')}"
+        venue['basic_info'].update({'official_name': name, 'brand_name': None, 'aliases': [name]})
+        venue['capacity']['event_spaces'] = venue['capacity']['event_spaces'][:1]
+        venue['capacity']['event_spaces'][0]['max_guests'] = max_guests
+        venue['search_keywords']['primary_keywords'] = [name.lower()]
+        venue['data_source'] = "fixture"
+        venue['last_updated'] = datetime.now()
+        return venue
+
+
+@pytest.fixture
+def crawl_dirs(tmp_path, monkeypatch):
+    """Point crawler output and state at tmp_path/<name>; returns a function taking the run name"""
+    monkeypatch.setattr(work_queue, 'QUEUE_BACKOFF_SECONDS', 0.01)
+
+    def use(name: str) -> Path:
+        root = tmp_path / name
+        venues_dir = root / "venues"
+        venues_dir.mkdir(parents=True, exist_ok=True)
+        monkeypatch.setattr(base_crawler, 'VENUES_DIR', venues_dir)
+        monkeypatch.setattr(base_crawler, 'CACHE_DIR', root / "cache")
+        monkeypatch.setattr(base_crawler, 'CrawlManifest', partial(CrawlManifest, manifests_dir=root / "manifests"))
+        monkeypatch.setattr(base_crawler, 'CrawlQueue', partial(CrawlQueue, root / "crawl_queue.db"))
+        monkeypatch.setattr(base_crawler, 'HtmlArchive', partial(HtmlArchive, root / "archive"))
+        return venues_dir
+
+    return use
+
+
+def saved_venues(venues_dir: Path) -> Dict[str, Dict]:
+    """venue_id -> saved venue file, without the per-run timestamp"""
+    venues = {}
+    for venue_file in sorted(venues_dir.glob("*.json")):
+        with open(venue_file, 'r', encoding='utf-8') as f:
+            venue = json.load(f)
+        venue.pop('last_updated', None)
+        venues[venue_file.stem] = venue
+    return venues
+
+
+def keyword_map(venues) -> Dict[str, List[str]]:
+    """keyword -> venue_ids the way the original search index built it (lowercased, first-seen order)"""
+    mapping: Dict[str, List[str]] = {}
+    for venue in venues:
+        keywords = venue.get('search_keywords', {})
+        for keyword in (keywords.get('primary_keywords', []) + keywords.get('secondary_keywords', [])
+                        + venue.get('basic_info', {}).get('aliases', [])):
+            venue_ids = mapping.setdefault(keyword.lower(), [])
+            if venue['venue_id'] not in venue_ids:
+                venue_ids.append(venue['venue_id'])
+    return mapping
@@ -1,5 +1,12 @@
 """EventFoundry Venue Crawlers"""
 
+import sys
+from pathlib import Path
+
+# Crawler modules import each other as top-level modules (e.g. `from base_crawler import ...`)
+# so they also run standalone from this directory
+sys.path.append(str(Path(__file__).parent))
+
 from .venuemonk_crawler import VenueMonkCrawler
 from .weddingvenues_crawler import WeddingVenuesCrawler
 from .venuelook_crawler import VenuelookCrawler
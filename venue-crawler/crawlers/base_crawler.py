@@ -5,31 +5,50 @@ Provides common functionality: rate limiting, error handling, data validation
 
 import time
 import json
+import asyncio
+from concurrent.futures import as_completed
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from pathlib import Path
 from loguru import logger
 import requests
+import aiohttp
 from bs4 import BeautifulSoup
-from ratelimit import limits, sleep_and_retry
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config import (
-    REQUESTS_PER_SECOND,
+    CONCURRENT_REQUESTS,
+    LISTING_PREFETCH_PAGES,
     REQUEST_TIMEOUT,
     MAX_RETRIES,
+    QUEUE_BATCH_SIZE,
+    PIPELINE_BATCH_SIZE,
+    PIPELINE_PARSE_WORKERS,
+    ARCHIVE_ENABLED,
+    PARSER_BACKEND,
+    PARSER_PROCESSES,
     USER_AGENT,
     VENUES_DIR,
     CACHE_DIR
 )
 from models.venue_schema import Venue
+from rate_limiter import get_host_limiter, parse_retry_after, THROTTLE_STATUS_CODES
+from http_cache import HttpCache, FetchedPage
+from crawl_manifest import CrawlManifest, fingerprint_html, fingerprint_venue
+from work_queue import CrawlQueue, DONE, DEAD
+from pipeline import CrawlPipeline, _parse_in_worker, parse_pool
+from html_archive import HtmlArchive
+from parsers import ListingSpec, extract_listing, extract_listings, get_parser_pool
 
 
 class BaseCrawler(ABC):
     """Abstract base crawler for venue data extraction"""
 
+    # Listing-page card selectors (see crawlers/parsers.py), defined by each source crawler
+    LISTING_SPEC: Optional[ListingSpec] = None
+
     def __init__(self, source_name: str, base_url: str):
         self.source_name = source_name
         self.base_url = base_url
@@ -45,14 +64,19 @@ class BaseCrawler(ABC):
         # Cache directory for this source
         self.cache_dir = CACHE_DIR / source_name
         self.cache_dir.mkdir(exist_ok=True, parents=True)
+        self.http_cache = HttpCache(self.cache_dir / "http")
+        self.archive = HtmlArchive() if ARCHIVE_ENABLED else None
+        self.last_crawl_stats: Dict[str, int] = {}
+        self.parser_backend = PARSER_BACKEND
 
         logger.info(f"Initialized {source_name} crawler")
 
-    @sleep_and_retry
-    @limits(calls=REQUESTS_PER_SECOND, period=1)
     def _rate_limited_request(self, url: str, method: str = 'GET', **kwargs) -> Optional[requests.Response]:
-        """Make rate-limited HTTP request with retries"""
+        """Make rate-limited HTTP request with retries (per-host token bucket)"""
+        limiter = get_host_limiter(url)
+
         for attempt in range(MAX_RETRIES):
+            limiter.acquire()
             try:
                 logger.debug(f"Request attempt {attempt + 1}/{MAX_RETRIES}: {url}")
 
@@ -64,14 +88,15 @@ class BaseCrawler(ABC):
                     raise ValueError(f"Unsupported HTTP method: {method}")
 
                 response.raise_for_status()
+                limiter.on_success()
                 logger.info(f"✓ Successfully fetched: {url}")
                 return response
 
             except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:  # Rate limited
-                    wait_time = (attempt + 1) * 5
-                    logger.warning(f"Rate limited. Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
+                if e.response.status_code in THROTTLE_STATUS_CODES:
+                    # The limiter pauses this host, so the next acquire() waits it out
+                    limiter.on_throttle(parse_retry_after(e.response.headers.get('Retry-After')))
+                    logger.warning(f"Rate limited ({e.response.status_code}): {url}")
                 else:
                     logger.error(f"HTTP error {e.response.status_code}: {url}")
                     if attempt == MAX_RETRIES - 1:
@@ -89,11 +114,33 @@ class BaseCrawler(ABC):
 
         return None
 
+    def fetch_page(self, url: str) -> Optional[FetchedPage]:
+        """
+        Fetch a page through the HTTP cache
+        Fresh entries skip the network; stale ones are revalidated with a conditional request
+        """
+        entry = self.http_cache.get(url)
+        if entry and self.http_cache.is_fresh(entry):
+            logger.debug(f"HTTP cache fresh: {url}")
+            return FetchedPage(url, entry['body'], not_modified=True)
+
+        response = self._rate_limited_request(url, headers=self.http_cache.conditional_headers(entry))
+        if response is None:
+            return None
+
+        if response.status_code == 304 and entry:
+            logger.info(f"✓ Not modified: {url}")
+            self.http_cache.touch(url, response.headers)
+            return FetchedPage(url, entry['body'], not_modified=True)
+
+        self.http_cache.store(url, response.text, response.headers)
+        return FetchedPage(url, response.text)
+
     def _save_to_cache(self, filename: str, data: Dict):
         """Save data to cache directory"""
         cache_file = self.cache_dir / f"{filename}.json"
         with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
         logger.debug(f"Cached data to: {cache_file}")
 
     def _load_from_cache(self, filename: str) -> Optional[Dict]:
@@ -109,6 +156,35 @@ class BaseCrawler(ABC):
         """Parse HTML content with BeautifulSoup"""
         return BeautifulSoup(html_content, 'lxml')
 
+    def parse_listing_pages(self, html_pages: List[str]) -> List[List[Dict]]:
+        """
+        Extract venue cards from listing pages with the configured parser backend
+        Several pages are parsed in the shared process pool; URLs are made absolute
+        Returns: One list of {name, url, preview} per page
+        """
+        listings = extract_listings(html_pages, self.LISTING_SPEC, self.parser_backend)
+        return [self._absolute_listing(venues) for venues in listings]
+
+    def parse_listing_page(self, html_content: str) -> List[Dict]:
+        """Extract venue cards from a single listing page"""
+        return self.parse_listing_pages([html_content])[0]
+
+    async def parse_listing_page_async(self, html_content: str) -> List[Dict]:
+        """Extract venue cards off the event loop (in the parser process pool when enabled)"""
+        executor = get_parser_pool() if PARSER_PROCESSES > 1 else None
+        venues = await asyncio.get_running_loop().run_in_executor(
+            executor, extract_listing, html_content, self.LISTING_SPEC, self.parser_backend
+        )
+        return self._absolute_listing(venues)
+
+    def _absolute_listing(self, venues: List[Dict]) -> List[Dict]:
+        """Ensure absolute venue URLs"""
+        for venue in venues:
+            if not venue['url'].startswith('http'):
+                venue['url'] = self.base_url + venue['url']
+            logger.debug(f"Found venue: {venue['name']}")
+        return venues
+
     @abstractmethod
     def get_venue_list(self, city: str = "Kochi") -> List[Dict]:
         """
@@ -118,12 +194,186 @@ class BaseCrawler(ABC):
         pass
 
     @abstractmethod
+    def parse_venue_details(self, venue_url: str, html_content: str) -> Optional[Dict]:
+        """
+        Parse a fetched venue detail page
+        Returns: Dictionary with complete venue data matching our schema
+        """
+        pass
+
+    def _venue_slug(self, venue_url: str) -> str:
+        """Derive the cache/venue_id slug from a detail page URL"""
+        return venue_url.split('/')[-1]
+
+    def _load_cached_details(self, venue_url: str) -> Optional[Dict]:
+        """Load previously parsed venue details from cache"""
+        return self._load_from_cache(f"venue_{self._venue_slug(venue_url)}")
+
+    def _parse_and_cache(self, venue_url: str, html_content: str) -> Optional[Dict]:
+        """Parse a detail page and cache the extracted data"""
+        venue_data = self.parse_venue_details(venue_url, html_content)
+        if venue_data:
+            self._save_to_cache(f"venue_{self._venue_slug(venue_url)}", venue_data)
+        return venue_data
+
+    def _details_from_page(self, page: FetchedPage) -> Optional[Dict]:
+        """Turn a fetched detail page into venue data, skipping the parse when unchanged"""
+        if page.not_modified:
+            cached_data = self._load_cached_details(page.url)
+            if cached_data:
+                logger.info(f"Page not modified, using cached venue details: {page.url}")
+                return cached_data
+
+        return self._parse_and_cache(page.url, page.html)
+
     def extract_venue_details(self, venue_url: str) -> Optional[Dict]:
         """
         Extract detailed information for a single venue
         Returns: Dictionary with complete venue data matching our schema
         """
-        pass
+        logger.info(f"Extracting details from: {venue_url}")
+
+        page = self.fetch_page(venue_url)
+        if page is None:
+            return None
+
+        return self._details_from_page(page)
+
+    # ============================================
+    # ASYNC FETCH ENGINE
+    # ============================================
+
+    async def _fetch_page_async(self, session: aiohttp.ClientSession, url: str) -> Optional[FetchedPage]:
+        """Fetch a page asynchronously through the HTTP cache, with rate limiting and retries"""
+        entry = self.http_cache.get(url)
+        if entry and self.http_cache.is_fresh(entry):
+            logger.debug(f"HTTP cache fresh: {url}")
+            return FetchedPage(url, entry['body'], not_modified=True)
+
+        conditional_headers = self.http_cache.conditional_headers(entry)
+        limiter = get_host_limiter(url)
+
+        for attempt in range(MAX_RETRIES):
+            await limiter.acquire_async()
+            try:
+                logger.debug(f"Async request attempt {attempt + 1}/{MAX_RETRIES}: {url}")
+
+                async with session.get(url, headers=conditional_headers) as response:
+                    if response.status in THROTTLE_STATUS_CODES:
+                        limiter.on_throttle(parse_retry_after(response.headers.get('Retry-After')))
+                        logger.warning(f"Rate limited ({response.status}): {url}")
+                        continue
+
+                    if response.status == 304 and entry:
+                        limiter.on_success()
+                        logger.info(f"✓ Not modified: {url}")
+                        self.http_cache.touch(url, response.headers)
+                        return FetchedPage(url, entry['body'], not_modified=True)
+
+                    response.raise_for_status()
+                    html_content = await response.text()
+                    limiter.on_success()
+                    logger.info(f"✓ Successfully fetched: {url}")
+                    self.http_cache.store(url, html_content, response.headers)
+                    return FetchedPage(url, html_content)
+
+            except aiohttp.ClientResponseError as e:
+                logger.error(f"HTTP error {e.status}: {url}")
+
+            except asyncio.TimeoutError:
+                logger.warning(f"Timeout on attempt {attempt + 1}: {url}")
+
+            except Exception as e:
+                logger.error(f"Request failed: {str(e)}")
+
+        return None
+
+    async def _fetch_page_limited(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        url: str
+    ) -> Optional[FetchedPage]:
+        async with semaphore:
+            return await self._fetch_page_async(session, url)
+
+    async def _fetch_all_async(self, urls: List[str]) -> List[Optional[FetchedPage]]:
+        """Fetch all venue detail pages with up to CONCURRENT_REQUESTS in flight"""
+        semaphore = asyncio.Semaphore(CONCURRENT_REQUESTS)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        connector = aiohttp.TCPConnector(limit=CONCURRENT_REQUESTS)
+
+        async with aiohttp.ClientSession(
+            headers=dict(self.session.headers),
+            timeout=timeout,
+            connector=connector
+        ) as session:
+            tasks = [self._fetch_page_limited(session, semaphore, url) for url in urls]
+            return await asyncio.gather(*tasks)
+
+    def fetch_paginated_listing(
+        self,
+        page_url: Callable[[int], str],
+        max_pages: int,
+        prefetch: int = LISTING_PREFETCH_PAGES
+    ) -> List[Dict]:
+        """
+        Fetch and parse numbered listing pages until one fails or comes back empty
+        Up to `prefetch` pages ahead are fetched speculatively through the host's rate limiter
+        and cancelled once the end of the listing is detected
+        Returns: Venues from every page, in page order
+        """
+        return asyncio.run(self._fetch_paginated_listing_async(page_url, max_pages, prefetch))
+
+    async def _fetch_paginated_listing_async(
+        self,
+        page_url: Callable[[int], str],
+        max_pages: int,
+        prefetch: int
+    ) -> List[Dict]:
+        venues = []
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        connector = aiohttp.TCPConnector(limit=prefetch + 1)
+
+        async with aiohttp.ClientSession(
+            headers=dict(self.session.headers),
+            timeout=timeout,
+            connector=connector
+        ) as session:
+            fetches: Dict[int, asyncio.Task] = {}
+            next_page = 1
+
+            try:
+                for page in range(1, max_pages + 1):
+                    # Keep the current page plus `prefetch` speculative pages in flight
+                    while next_page <= min(page + prefetch, max_pages):
+                        fetches[next_page] = asyncio.create_task(
+                            self._fetch_page_async(session, page_url(next_page))
+                        )
+                        next_page += 1
+
+                    listing_page = await fetches.pop(page)
+                    if not listing_page:
+                        logger.warning(f"Failed to fetch page {page}")
+                        break
+
+                    page_venues = await self.parse_listing_page_async(listing_page.html)
+                    if not page_venues:
+                        logger.info(f"No more venues found on page {page}")
+                        break
+
+                    venues.extend(page_venues)
+                    logger.info(f"Page {page}: Found {len(page_venues)} venues (total: {len(venues)})")
+
+            finally:
+                # Pages past the end of the listing: cancel whatever is still queued or in flight
+                for task in fetches.values():
+                    task.cancel()
+                if fetches:
+                    await asyncio.gather(*fetches.values(), return_exceptions=True)
+                    logger.debug(f"Cancelled {len(fetches)} speculative listing page fetches")
+
+        return venues
 
     def validate_venue_data(self, venue_data: Dict) -> tuple[bool, Optional[Venue]]:
         """
@@ -146,41 +396,333 @@ class BaseCrawler(ABC):
             json.dump(venue.model_dump(), f, indent=2, ensure_ascii=False, default=str)
         logger.success(f"✓ Saved venue: {output_file}")
 
-    def crawl_all(self, city: str = "Kochi", max_venues: Optional[int] = None) -> List[Venue]:
+    def _iter_venue_pages(self, venue_list: List[Dict], engine: str):
+        """Yield (venue_info, fetched page) pairs using the selected fetch engine"""
+        if engine == 'async':
+            logger.info(f"Async engine: up to {CONCURRENT_REQUESTS} concurrent requests")
+            pages = asyncio.run(self._fetch_all_async([venue_info['url'] for venue_info in venue_list]))
+            yield from zip(venue_list, pages)
+
+        elif engine == 'sync':
+            for venue_info in venue_list:
+                yield venue_info, self.fetch_page(venue_info['url'])
+
+        else:
+            raise ValueError(f"Unsupported crawl engine: {engine}")
+
+    def _prepare_page(
+        self,
+        venue_info: Dict,
+        page: Optional[FetchedPage],
+        manifest: CrawlManifest,
+        incremental: bool
+    ) -> tuple[Optional[str], Optional[Dict]]:
+        """
+        Archive a fetched page and fingerprint it against the manifest
+        Returns: (status, None) when no parsing is needed, otherwise (None, parse job)
+        """
+        if page is None:
+            logger.warning(f"Failed to fetch: {venue_info.get('name')}")
+            return 'failed', None
+
+        if self.archive:
+            try:
+                self.archive.store(self.source_name, page.url, page.html, name=venue_info.get('name'))
+            except Exception as e:
+                logger.warning(f"Could not archive {page.url}: {str(e)}")
+
+        return self._page_job(venue_info, page, manifest, incremental)
+
+    def _page_job(
+        self,
+        venue_info: Dict,
+        page: FetchedPage,
+        manifest: CrawlManifest,
+        incremental: bool
+    ) -> tuple[Optional[str], Optional[Dict]]:
+        """
+        Fingerprint a page against the manifest, without archiving it (used directly when
+        re-parsing pages read back from the archive)
+        Returns: (status, None) when no parsing is needed, otherwise (None, parse job)
+        """
+        html_hash = fingerprint_html(page.html)
+        known_id, known_entry = manifest.lookup(page.url)
+        saved = known_id is not None and (VENUES_DIR / f"{known_id}.json").exists()
+
+        # Same page bytes as last time: skip parsing, validation and writes entirely
+        if incremental and saved and known_entry['html_hash'] == html_hash:
+            logger.info(f"Unchanged page, skipping: {venue_info.get('name')}")
+            return 'unchanged', None
+
+        return None, {
+            'venue_info': venue_info,
+            'url': page.url,
+            'html': page.html,
+            'html_hash': html_hash,
+            'cached_data': self._load_cached_details(page.url) if page.not_modified else None,
+            'known_id': known_id,
+            'known_entry': known_entry,
+            'skip_data_hash': known_entry['data_hash'] if incremental and saved else None
+        }
+
+    def _parse_job(
+        self,
+        venue_url: str,
+        html_content: str,
+        cached_data: Optional[Dict],
+        skip_data_hash: Optional[str]
+    ) -> tuple[Optional[Dict], Optional[str], Optional[Venue]]:
+        """
+        CPU-bound part of processing a page: parse, fingerprint and validate
+        Runs in-process for the sync/async engines and in a worker process for the pipeline engine
+        Returns: (venue_data, data_hash, venue); venue is None if invalid or data is unchanged
+        """
+        venue_data = cached_data or self.parse_venue_details(venue_url, html_content)
+        if not venue_data:
+            return None, None, None
+
+        data_hash = fingerprint_venue(venue_data)
+        if data_hash == skip_data_hash:
+            return venue_data, data_hash, None
+
+        is_valid, venue = self.validate_venue_data(venue_data)
+        return venue_data, data_hash, venue if is_valid else None
+
+    def _commit_job(
+        self,
+        job: Dict,
+        venue_data: Optional[Dict],
+        data_hash: Optional[str],
+        venue: Optional[Venue],
+        manifest: CrawlManifest
+    ) -> tuple[str, Optional[Venue]]:
+        """
+        Save a parsed venue and classify it against the manifest
+        Returns: (status, venue) where status is added | changed | unchanged | invalid
+        """
+        venue_name = job['venue_info'].get('name')
+        if not venue_data:
+            logger.warning(f"Failed to extract data for: {venue_name}")
+            return 'invalid', None
+
+        if job['cached_data'] is None:
+            self._save_to_cache(f"venue_{self._venue_slug(job['url'])}", venue_data)
+
+        # Page markup changed but the extracted venue did not (ads, timestamps, ...)
+        if venue is None and data_hash == job['skip_data_hash']:
+            manifest.record(job['known_id'], job['url'], job['html_hash'], data_hash)
+            logger.info(f"Unchanged venue data, skipping: {venue_name}")
+            return 'unchanged', None
+
+        if venue is None:
+            logger.warning(f"Validation failed for: {venue_name}")
+            return 'invalid', None
+
+        self.save_venue(venue)
+        manifest.record(venue.venue_id, job['url'], job['html_hash'], data_hash)
+
+        if job['known_id'] is None:
+            return 'added', venue
+        return ('unchanged' if job['known_entry']['data_hash'] == data_hash else 'changed'), venue
+
+    def _process_page(
+        self,
+        venue_info: Dict,
+        page: Optional[FetchedPage],
+        manifest: CrawlManifest,
+        incremental: bool
+    ) -> tuple[str, Optional[Venue]]:
+        """
+        Parse, validate and save one fetched venue page
+        Returns: (status, venue) where status is added | changed | unchanged | failed | invalid
+        (failed = fetch error worth retrying, invalid = extraction/validation error)
+        """
+        status, job = self._prepare_page(venue_info, page, manifest, incremental)
+        if job is None:
+            return status, None
+
+        venue_data, data_hash, venue = self._parse_job(
+            job['url'], job['html'], job['cached_data'], job['skip_data_hash']
+        )
+        return self._commit_job(job, venue_data, data_hash, venue, manifest)
+
+    def _process_batch(self, batch: List[Dict], engine: str, manifest: CrawlManifest, incremental: bool):
+        """Yield (venue_info, status, venue) for each claimed venue, in completion order"""
+        if engine == 'pipeline':
+            yield from CrawlPipeline(self).run(batch, manifest, incremental)
+            return
+
+        for venue_info, page in self._iter_venue_pages(batch, engine):
+            try:
+                status, venue = self._process_page(venue_info, page, manifest, incremental)
+            except Exception as e:
+                logger.exception(e)
+                status, venue = 'error', None
+            yield venue_info, status, venue
+
+    def crawl_all(
+        self,
+        city: str = "Kochi",
+        max_venues: Optional[int] = None,
+        engine: str = "sync",
+        incremental: bool = False,
+        resume: bool = False
+    ) -> List[Venue]:
         """
         Main crawling workflow:
-        1. Get venue list
-        2. Extract details for each venue
-        3. Validate and save
+        1. Get venue list and queue it in the persistent work queue
+           (resume=True continues the queued run instead)
+        2. Fetch details for each queued venue (sync, async or staged pipeline engine)
+        3. Validate and save (incremental mode skips venues whose fingerprints are unchanged)
+
+        Failed venues are retried with exponential backoff and dead-lettered after
+        QUEUE_MAX_ATTEMPTS. Per-status counts are left in self.last_crawl_stats
         """
-        logger.info(f"Starting crawl for {city} on {self.source_name}")
+        mode = "incremental" if incremental else "full"
+        queue = CrawlQueue()
+        run = queue.get_run(self.source_name) if resume else None
+
+        if run:
+            city, max_venues = run['city'], run['max_venues']
+            recovered = queue.recover(self.source_name)
+            logger.info(f"Resuming {mode} crawl for {city} on {self.source_name} ({engine} engine)")
+            logger.info(f"Queue: {queue.counts(self.source_name)} ({recovered} in-flight venues re-queued)")
+        else:
+            if resume:
+                logger.info(f"No checkpoint for {self.source_name}, starting a new crawl")
+            logger.info(f"Starting {mode} crawl for {city} on {self.source_name} ({engine} engine)")
+
+            # Step 1: Get venue list
+            venue_list = self.get_venue_list(city)
+            logger.info(f"Found {len(venue_list)} venues")
 
-        # Step 1: Get venue list
-        venue_list = self.get_venue_list(city)
-        logger.info(f"Found {len(venue_list)} venues")
+            if max_venues:
+                venue_list = venue_list[:max_venues]
+                logger.info(f"Limited to {max_venues} venues for this run")
 
-        if max_venues:
-            venue_list = venue_list[:max_venues]
-            logger.info(f"Limited to {max_venues} venues for this run")
+            queue.reset(self.source_name, city, venue_list, max_venues)
+
+        manifest = CrawlManifest(self.source_name)
+        stats = {'added': 0, 'changed': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+        remaining = sum(
+            count for state, count in queue.counts(self.source_name).items() if state not in (DONE, DEAD)
+        )
 
         # Step 2 & 3: Extract, validate, save
         validated_venues = []
-        for idx, venue_info in enumerate(venue_list, 1):
-            logger.info(f"Processing venue {idx}/{len(venue_list)}: {venue_info.get('name', 'Unknown')}")
-
-            # Extract details
-            venue_data = self.extract_venue_details(venue_info['url'])
-            if not venue_data:
-                logger.warning(f"Failed to extract data for: {venue_info.get('name')}")
+        processed = 0
+        batch_size = PIPELINE_BATCH_SIZE if engine == 'pipeline' else QUEUE_BATCH_SIZE
+        while True:
+            batch = queue.claim(self.source_name, batch_size)
+            if not batch:
+                next_retry_at = queue.next_retry_at(self.source_name)
+                if next_retry_at is None:
+                    break
+                wait_time = max(0.0, next_retry_at - time.time())
+                logger.info(f"Waiting {wait_time:.1f}s before retrying failed venues")
+                time.sleep(wait_time)
                 continue
 
-            # Validate
-            is_valid, venue = self.validate_venue_data(venue_data)
-            if is_valid and venue:
-                self.save_venue(venue)
-                validated_venues.append(venue)
-            else:
-                logger.warning(f"Validation failed for: {venue_info.get('name')}")
+            for venue_info, status, venue in self._process_batch(batch, engine, manifest, incremental):
+                processed += 1
+                logger.info(f"Processed venue {processed}/{remaining} ({status}): {venue_info.get('name') or 'Unknown'}")
+
+                if status in ('failed', 'invalid', 'error'):
+                    reason = {
+                        'failed': 'fetch failed',
+                        'invalid': 'extraction or validation failed',
+                        'error': 'unexpected error while processing'
+                    }[status]
+                    # Extraction/validation is deterministic for a given page, so don't retry it
+                    state = queue.mark_failed(self.source_name, venue_info['url'], reason, retry=(status != 'invalid'))
+                    if state == DEAD:
+                        stats['failed'] += 1
+                    else:
+                        remaining += 1
+                    continue
+
+                queue.mark_done(self.source_name, venue_info['url'])
+                stats[status] += 1
+                if venue:
+                    validated_venues.append(venue)
+
+            # Checkpoint fingerprints along with the queue
+            manifest.save()
+
+        # A partial (--limit) run cannot tell which venues disappeared from the listing
+        if not max_venues:
+            removed = manifest.remove_unlisted(queue.urls(self.source_name))
+            stats['removed'] = len(removed)
+            for venue_id in removed:
+                logger.warning(f"No longer listed on {self.source_name}: {venue_id}")
+
+        manifest.save()
+        self.last_crawl_stats = stats
+
+        for dead in queue.dead_letters(self.source_name):
+            logger.warning(f"Dead-lettered after {dead['attempts']} attempts ({dead['last_error']}): {dead['url']}")
+
+        counts = queue.counts(self.source_name)
+        queue.close()
+
+        logger.success(f"✓ Completed! Successfully crawled {len(validated_venues)} venues (queue: {counts})")
+        logger.success(
+            f"  added={stats['added']} changed={stats['changed']} unchanged={stats['unchanged']} "
+            f"removed={stats['removed']} failed={stats['failed']}"
+        )
+        return validated_venues
+
+    def reparse_archive(self) -> List[Venue]:
+        """
+        Re-run detail extraction over the latest archived page of every venue, with no network
+        Pages are parsed and validated in a process pool; venues, parsed-data cache and
+        manifest are rewritten; the archive itself is only read. Per-status counts are left in
+        self.last_crawl_stats
+        """
+        if not self.archive:
+            logger.error("HTML archive is disabled (ARCHIVE_ENABLED=false)")
+            return []
+
+        manifest = CrawlManifest(self.source_name)
+        stats = {'added': 0, 'changed': 0, 'unchanged': 0, 'invalid': 0, 'error': 0}
+        validated_venues = []
+        pages = self.archive.iter_latest_pages(self.source_name)
+
+        logger.info(f"Re-parsing archived {self.source_name} pages with {PIPELINE_PARSE_WORKERS} workers")
+
+        with parse_pool(PIPELINE_PARSE_WORKERS) as pool:
+            while True:
+                # Bounded batches keep only PIPELINE_BATCH_SIZE page bodies in memory
+                futures = {}
+                for snapshot in pages:
+                    venue_info = {'url': snapshot['url'], 'name': snapshot['name']}
+                    _, job = self._page_job(venue_info, FetchedPage(snapshot['url'], snapshot['html']), manifest, False)
+                    future = pool.submit(_parse_in_worker, type(self), job['url'], job['html'], None, None)
+                    futures[future] = job
+                    if len(futures) >= PIPELINE_BATCH_SIZE:
+                        break
+
+                if not futures:
+                    break
+
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        status, venue = self._commit_job(job, *future.result(), manifest)
+                    except Exception as e:
+                        logger.error(f"Re-parse failed for {job['url']}: {str(e)}")
+                        status, venue = 'error', None
+
+                    stats[status] += 1
+                    if venue:
+                        validated_venues.append(venue)
+
+                manifest.save()
 
-        logger.success(f"✓ Completed! Successfully crawled {len(validated_venues)}/{len(venue_list)} venues")
+        self.last_crawl_stats = stats
+        logger.success(f"✓ Re-parsed {sum(stats.values())} archived pages: {len(validated_venues)} valid venues")
+        logger.success(
+            f"  added={stats['added']} changed={stats['changed']} unchanged={stats['unchanged']} "
+            f"invalid={stats['invalid']} error={stats['error']}"
+        )
         return validated_venues
@@ -0,0 +1,88 @@
+"""
+Crawl Manifest - Content fingerprints per venue for incremental re-crawls
+Records the hash of each fetched page and extracted venue dict so unchanged venues can be skipped
+"""
+
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from loguru import logger
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import MANIFESTS_DIR
+
+# Fields that change on every extraction without the venue itself changing
+VOLATILE_FIELDS = ('last_updated',)
+
+
+def fingerprint_html(html_content: str) -> str:
+    """Hash of a raw detail page"""
+    return hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+
+
+def fingerprint_venue(venue_data: Dict) -> str:
+    """Hash of an extracted venue dict, ignoring volatile metadata"""
+    stable = {key: value for key, value in venue_data.items() if key not in VOLATILE_FIELDS}
+    payload = json.dumps(stable, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CrawlManifest:
+    """Per-source manifest of venue_id -> {url, html_hash, data_hash, updated_at}"""
+
+    def __init__(self, source_name: str, manifests_dir: Path = MANIFESTS_DIR):
+        self.source_name = source_name
+        self.manifest_file = manifests_dir / f"{source_name}.json"
+        self.entries: Dict[str, Dict] = {}
+        self.url_index: Dict[str, str] = {}  # url -> venue_id
+
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable manifest {self.manifest_file}: {str(e)}")
+
+        for venue_id, entry in self.entries.items():
+            self.url_index[entry['url']] = venue_id
+
+    def lookup(self, url: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """Return (venue_id, entry) previously recorded for a URL"""
+        venue_id = self.url_index.get(url)
+        if venue_id is None:
+            return None, None
+        return venue_id, self.entries.get(venue_id)
+
+    def record(self, venue_id: str, url: str, html_hash: str, data_hash: str):
+        """Record the latest fingerprints for a venue"""
+        self.entries[venue_id] = {
+            'url': url,
+            'html_hash': html_hash,
+            'data_hash': data_hash,
+            'updated_at': datetime.now().isoformat()
+        }
+        self.url_index[url] = venue_id
+
+    def remove_unlisted(self, listed_urls) -> List[str]:
+        """Drop venues whose URL no longer appears in the source listing; returns their IDs"""
+        listed_urls = set(listed_urls)
+        removed = [venue_id for venue_id, entry in self.entries.items() if entry['url'] not in listed_urls]
+
+        for venue_id in removed:
+            entry = self.entries.pop(venue_id)
+            self.url_index.pop(entry['url'], None)
+
+        return removed
+
+    def save(self):
+        """Persist the manifest atomically"""
+        self.manifest_file.parent.mkdir(exist_ok=True, parents=True)
+        tmp_file = self.manifest_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        tmp_file.replace(self.manifest_file)
+        logger.debug(f"Saved manifest: {self.manifest_file} ({len(self.entries)} venues)")
@@ -0,0 +1,149 @@
+"""
+HTML Archive - Compressed, content-addressed store of raw venue pages
+Keeps every distinct page body (keyed by URL and fetch time) so extractors can be re-run offline
+"""
+
+import gzip
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Iterator, List, Optional
+from pathlib import Path
+from loguru import logger
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import ARCHIVE_DIR, ARCHIVE_CODEC, ARCHIVE_COMPRESSION_LEVEL
+
+try:
+    import zstandard
+except ImportError:  # optional: archive falls back to gzip
+    zstandard = None
+
+CODEC_EXTENSIONS = {'zstd': '.html.zst', 'gzip': '.html.gz'}
+
+if ARCHIVE_CODEC == 'zstd' and zstandard is None:
+    logger.debug("zstandard not installed, archiving with gzip")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    name TEXT,
+    PRIMARY KEY (source, url, fetched_at)
+);
+
+CREATE INDEX IF NOT EXISTS idx_snapshots_latest ON snapshots (source, url, fetched_at DESC);
+"""
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=ARCHIVE_COMPRESSION_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=ARCHIVE_COMPRESSION_LEVEL)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd archive blobs")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class HtmlArchive:
+    """Blob store (data/archive/blobs/<hh>/<sha256>) plus a SQLite snapshot index"""
+
+    def __init__(self, archive_dir: Path = ARCHIVE_DIR, codec: str = ARCHIVE_CODEC):
+        if codec == 'zstd' and zstandard is None:
+            codec = 'gzip'
+        if codec not in CODEC_EXTENSIONS:
+            raise ValueError(f"Unsupported archive codec: {codec}")
+
+        self.codec = codec
+        self.blobs_dir = archive_dir / "blobs"
+        self.blobs_dir.mkdir(exist_ok=True, parents=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(archive_dir / "archive.db"), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def _blob_path(self, content_hash: str, codec: str) -> Path:
+        return self.blobs_dir / content_hash[:2] / f"{content_hash}{CODEC_EXTENSIONS[codec]}"
+
+    def store(self, source: str, url: str, html_content: str, name: Optional[str] = None,
+              fetched_at: Optional[float] = None) -> str:
+        """
+        Archive a page body; identical bodies share one blob, and a snapshot row is only
+        added when the URL's content differs from its latest snapshot
+        Returns: content hash (sha256 of the body)
+        """
+        data = html_content.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            latest = self._conn.execute(
+                "SELECT content_hash FROM snapshots WHERE source = ? AND url = ? ORDER BY fetched_at DESC LIMIT 1",
+                (source, url)
+            ).fetchone()
+            if latest and latest['content_hash'] == content_hash:
+                return content_hash
+
+            blob_file = self._blob_path(content_hash, self.codec)
+            if not blob_file.exists():
+                blob_file.parent.mkdir(exist_ok=True)
+                tmp_file = blob_file.with_name(blob_file.name + '.tmp')
+                tmp_file.write_bytes(_compress(data, self.codec))
+                tmp_file.replace(blob_file)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (source, url, fetched_at, content_hash, codec, name) VALUES (?, ?, ?, ?, ?, ?)",
+                (source, url, fetched_at or time.time(), content_hash, self.codec, name)
+            )
+
+        logger.debug(f"Archived {url} ({content_hash[:12]})")
+        return content_hash
+
+    def load(self, content_hash: str, codec: str) -> str:
+        """Read an archived body back"""
+        return _decompress(self._blob_path(content_hash, codec).read_bytes(), codec).decode('utf-8')
+
+    def history(self, source: str, url: str) -> List[Dict]:
+        """All snapshots of a URL, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM snapshots WHERE source = ? AND url = ? ORDER BY fetched_at DESC", (source, url)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest(self, source: str) -> List[Dict]:
+        """Latest snapshot of every archived URL for a source"""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT s.* FROM snapshots s
+                   JOIN (SELECT url, MAX(fetched_at) AS fetched_at FROM snapshots WHERE source = ? GROUP BY url) l
+                     ON s.url = l.url AND s.fetched_at = l.fetched_at
+                   WHERE s.source = ? ORDER BY s.url""",
+                (source, source)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def iter_latest_pages(self, source: str) -> Iterator[Dict]:
+        """Yield the latest snapshot of every URL for a source, with its decompressed body"""
+        for snapshot in self.latest(source):
+            try:
+                snapshot['html'] = self.load(snapshot['content_hash'], snapshot['codec'])
+            except Exception as e:
+                logger.error(f"Unreadable archive blob for {snapshot['url']}: {str(e)}")
+                continue
+            yield snapshot
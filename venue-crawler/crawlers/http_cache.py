@@ -0,0 +1,96 @@
+"""
+HTTP Cache - Raw response bodies with ETag / Last-Modified validators
+Lets re-crawls send conditional requests and skip parsing on 304 Not Modified
+"""
+
+import time
+import json
+import hashlib
+from typing import Dict, NamedTuple, Optional
+from pathlib import Path
+from loguru import logger
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import HTTP_CACHE_TTL_HOURS
+
+
+class FetchedPage(NamedTuple):
+    """A fetched page; not_modified means the body came from the HTTP cache unchanged"""
+    url: str
+    html: str
+    not_modified: bool = False
+
+
+class HttpCache:
+    """Per-source store of response bodies and their validators"""
+
+    def __init__(self, cache_dir: Path, ttl_hours: float = HTTP_CACHE_TTL_HOURS):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        self.ttl_seconds = ttl_hours * 3600
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.html"
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry (validators + body) for a URL, if any"""
+        meta_file, body_file = self._paths(url)
+        if not meta_file.exists() or not body_file.exists():
+            return None
+
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['body'] = body_file.read_text(encoding='utf-8')
+            return entry
+        except Exception as e:
+            logger.warning(f"Unreadable HTTP cache entry for {url}: {str(e)}")
+            return None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """True if the entry was validated recently enough to skip the network entirely"""
+        return time.time() - entry.get('fetched_at', 0) < self.ttl_seconds
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from a cached entry"""
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, body: str, headers) -> None:
+        """Save a 200 response body together with its validators"""
+        meta_file, body_file = self._paths(url)
+        body_file.write_text(body, encoding='utf-8')
+        self._write_meta(meta_file, {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time()
+        })
+        logger.debug(f"HTTP cached: {url}")
+
+    def touch(self, url: str, headers) -> None:
+        """Record a successful 304 revalidation, picking up any refreshed validators"""
+        meta_file, _ = self._paths(url)
+        entry = self.get(url)
+        if not entry:
+            return
+        entry.pop('body', None)
+        entry['etag'] = headers.get('ETag') or entry.get('etag')
+        entry['last_modified'] = headers.get('Last-Modified') or entry.get('last_modified')
+        entry['fetched_at'] = time.time()
+        self._write_meta(meta_file, entry)
+
+    def _write_meta(self, meta_file: Path, entry: Dict) -> None:
+        tmp_file = meta_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2, ensure_ascii=False)
+        tmp_file.replace(meta_file)
@@ -0,0 +1,216 @@
+"""
+Parser Backends - Pluggable HTML parsing for venue listing pages
+soup: full BeautifulSoup tree | strainer: SoupStrainer-restricted partial tree | lxml: raw lxml XPath
+"""
+
+import re
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from pathlib import Path
+from loguru import logger
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import PARSER_BACKEND, PARSER_PROCESSES
+from pipeline import parse_pool
+
+PARSER_BACKENDS = ('soup', 'strainer', 'lxml')
+
+EXSLT_REGEX_NS = {'re': 'http://exslt.org/regular-expressions'}
+
+
+class ListingSpec(NamedTuple):
+    """Declarative description of venue cards on a source's listing page"""
+    card_tags: Tuple[str, ...]
+    card_class: re.Pattern
+    name_tags: Tuple[str, ...]
+    name_class: re.Pattern
+    # (field, 'text' | 'class', pattern): first matching text node / element inside the card
+    previews: Tuple[Tuple[str, str, re.Pattern], ...] = ()
+    # Use the name element's href even when it is not an <a> (VenueMonk puts it on headings)
+    name_href_any_tag: bool = False
+
+
+# ============================================
+# BEAUTIFULSOUP BACKENDS (soup, strainer)
+# ============================================
+
+def _listing_from_soup(soup: BeautifulSoup, spec: ListingSpec) -> List[Dict]:
+    venues = []
+
+    for card in soup.find_all(list(spec.card_tags), class_=spec.card_class):
+        try:
+            name_elem = card.find(list(spec.name_tags), class_=spec.name_class)
+            if not name_elem:
+                continue
+
+            venue_url = name_elem.get('href') if spec.name_href_any_tag or name_elem.name == 'a' else None
+            if not venue_url:
+                link = card.find('a', href=True)
+                if not link:
+                    continue
+                venue_url = link['href']
+
+            preview = {}
+            for field, kind, pattern in spec.previews:
+                if kind == 'text':
+                    text_elem = card.find(string=pattern)
+                    preview[field] = text_elem.strip() if text_elem else None
+                else:
+                    class_elem = card.find(class_=pattern)
+                    preview[field] = class_elem.get_text(strip=True) if class_elem else None
+
+            venues.append({
+                'name': name_elem.get_text(strip=True),
+                'url': venue_url,
+                'preview': preview
+            })
+
+        except Exception as e:
+            logger.error(f"Error parsing venue card: {str(e)}")
+            continue
+
+    return venues
+
+
+# ============================================
+# LXML XPATH BACKEND
+# ============================================
+
+def _tag_test(tags: Tuple[str, ...]) -> str:
+    return ' or '.join(f'self::{tag}' for tag in tags)
+
+
+def _regex_flags(pattern: re.Pattern) -> str:
+    return 'i' if pattern.flags & re.IGNORECASE else ''
+
+
+@lru_cache(maxsize=None)
+def _compile_xpaths(spec: ListingSpec) -> Dict:
+    """Compile (once per spec) the XPath expressions equivalent to the BeautifulSoup lookups"""
+    def class_match(pattern: re.Pattern) -> str:
+        return f"re:test(@class, '{pattern.pattern}', '{_regex_flags(pattern)}')"
+
+    return {
+        'cards': etree.XPath(
+            f"//*[{_tag_test(spec.card_tags)}][{class_match(spec.card_class)}]",
+            namespaces=EXSLT_REGEX_NS
+        ),
+        'name': etree.XPath(
+            f".//*[{_tag_test(spec.name_tags)}][{class_match(spec.name_class)}][1]",
+            namespaces=EXSLT_REGEX_NS
+        ),
+        'link': etree.XPath(".//a[@href][1]"),
+        'previews': {
+            field: etree.XPath(f".//*[{class_match(pattern)}][1]", namespaces=EXSLT_REGEX_NS)
+            for field, kind, pattern in spec.previews if kind == 'class'
+        }
+    }
+
+
+def _element_text(element) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True)"""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+def _listing_from_lxml(html_content: str, spec: ListingSpec) -> List[Dict]:
+    xpaths = _compile_xpaths(spec)
+    venues = []
+
+    try:
+        tree = lxml_html.fromstring(html_content)
+    except (etree.ParserError, ValueError):
+        return venues
+
+    for card in xpaths['cards'](tree):
+        try:
+            names = xpaths['name'](card)
+            if not names:
+                continue
+            name_elem = names[0]
+
+            venue_url = name_elem.get('href') if spec.name_href_any_tag or name_elem.tag == 'a' else None
+            if not venue_url:
+                links = xpaths['link'](card)
+                if not links:
+                    continue
+                venue_url = links[0].get('href')
+
+            preview = {}
+            for field, kind, pattern in spec.previews:
+                if kind == 'text':
+                    text = next((t for t in card.itertext() if pattern.search(t)), None)
+                    preview[field] = text.strip() if text else None
+                else:
+                    matches = xpaths['previews'][field](card)
+                    preview[field] = _element_text(matches[0]) if matches else None
+
+            venues.append({
+                'name': _element_text(name_elem),
+                'url': venue_url,
+                'preview': preview
+            })
+
+        except Exception as e:
+            logger.error(f"Error parsing venue card: {str(e)}")
+            continue
+
+    return venues
+
+
+# ============================================
+# PUBLIC API
+# ============================================
+
+def extract_listing(html_content: str, spec: ListingSpec, backend: str = PARSER_BACKEND) -> List[Dict]:
+    """Extract {name, url, preview} venue cards from one listing page"""
+    if backend == 'soup':
+        return _listing_from_soup(BeautifulSoup(html_content, 'lxml'), spec)
+
+    if backend == 'strainer':
+        # Only build tree nodes for the cards themselves (and their subtrees)
+        strainer = SoupStrainer(list(spec.card_tags), class_=spec.card_class)
+        return _listing_from_soup(BeautifulSoup(html_content, 'lxml', parse_only=strainer), spec)
+
+    if backend == 'lxml':
+        return _listing_from_lxml(html_content, spec)
+
+    raise ValueError(f"Unsupported parser backend: {backend}")
+
+
+_parser_pool: Optional[ProcessPoolExecutor] = None
+_parser_pool_lock = threading.Lock()
+
+
+def get_parser_pool() -> ProcessPoolExecutor:
+    """
+    Shared process pool for listing-page parsing, created on first use
+
+    Started like the pipeline's parse pool (forkserver, not fork); the lock keeps source
+    crawlers running in parallel threads from each creating one.
+    """
+    global _parser_pool
+    with _parser_pool_lock:
+        if _parser_pool is None:
+            _parser_pool = parse_pool(PARSER_PROCESSES)
+            atexit.register(_parser_pool.shutdown)
+        return _parser_pool
+
+
+def extract_listings(
+    html_pages: List[str],
+    spec: ListingSpec,
+    backend: str = PARSER_BACKEND
+) -> List[List[Dict]]:
+    """Extract several listing pages in the process pool (inline for a single page)"""
+    if len(html_pages) <= 1 or PARSER_PROCESSES <= 1:
+        return [extract_listing(html_content, spec, backend) for html_content in html_pages]
+
+    pool = get_parser_pool()
+    return list(pool.map(extract_listing, html_pages, [spec] * len(html_pages), [backend] * len(html_pages)))
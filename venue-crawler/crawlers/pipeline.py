@@ -0,0 +1,221 @@
+"""
+Crawl Pipeline - Staged fetch / parse / validate / save engine
+Fetching runs on I/O threads, parsing and validation in a process pool, saving on a
+batched writer thread; stages are connected by bounded queues for backpressure
+"""
+
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED, ALL_COMPLETED
+from typing import Dict, Iterator, List, Optional
+from pathlib import Path
+from loguru import logger
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    CONCURRENT_REQUESTS,
+    PIPELINE_PARSE_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    PIPELINE_SAVE_BATCH
+)
+
+# End-of-stream marker passed down the stage queues
+_DONE = object()
+
+# One crawler instance per worker process and crawler class, created on first use
+_worker_crawlers: Dict[type, object] = {}
+
+
+def _parse_in_worker(crawler_cls: type, venue_url: str, html_content: str,
+                     cached_data: Optional[Dict], skip_data_hash: Optional[str]):
+    """Process pool entry point: run the crawler's CPU-bound parse/validate step"""
+    crawler = _worker_crawlers.get(crawler_cls)
+    if crawler is None:
+        crawler = crawler_cls()
+        _worker_crawlers[crawler_cls] = crawler
+    return crawler._parse_job(venue_url, html_content, cached_data, skip_data_hash)
+
+
+def parse_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for _parse_in_worker, started via forkserver (spawn where unavailable)
+
+    Crawls run in threads (pipeline stages, --parallel sources); forking such a process copies
+    locks other threads hold (loguru's sink, sqlite, HTTP connection pools) into the workers,
+    where they can never be released. Workers build their own crawler, so nothing needs to be
+    inherited.
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+class CrawlPipeline:
+    """Runs a batch of queued venues through the staged pipeline for one crawler"""
+
+    def __init__(
+        self,
+        crawler,
+        fetch_workers: int = CONCURRENT_REQUESTS,
+        parse_workers: int = PIPELINE_PARSE_WORKERS,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        save_batch_size: int = PIPELINE_SAVE_BATCH
+    ):
+        self.crawler = crawler
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+        self.save_batch_size = save_batch_size
+
+    def run(self, batch: List[Dict], manifest, incremental: bool) -> Iterator[tuple]:
+        """Yield (venue_info, status, venue) for every venue in the batch, in completion order"""
+        logger.info(
+            f"Pipeline engine: {self.fetch_workers} fetchers, {self.parse_workers} parse workers, "
+            f"queue bound {self.queue_size}"
+        )
+
+        tasks: queue.Queue = queue.Queue()
+        for venue_info in batch:
+            tasks.put(venue_info)
+
+        parse_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        save_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        outcomes: queue.Queue = queue.Queue()
+
+        with parse_pool(self.parse_workers) as pool:
+            stages = [
+                threading.Thread(
+                    target=self._fetch_stage, args=(tasks, parse_queue, outcomes, manifest, incremental),
+                    name="pipeline-fetch", daemon=True
+                ),
+                threading.Thread(
+                    target=self._parse_stage, args=(pool, parse_queue, save_queue, outcomes),
+                    name="pipeline-parse", daemon=True
+                ),
+                threading.Thread(
+                    target=self._save_stage, args=(save_queue, outcomes, manifest),
+                    name="pipeline-save", daemon=True
+                )
+            ]
+            for stage in stages:
+                stage.start()
+
+            while True:
+                outcome = outcomes.get()
+                if outcome is _DONE:
+                    break
+                yield outcome
+
+            for stage in stages:
+                stage.join()
+
+    # ============================================
+    # STAGES
+    # ============================================
+
+    def _fetch_stage(self, tasks: queue.Queue, parse_queue: queue.Queue, outcomes: queue.Queue,
+                     manifest, incremental: bool):
+        """I/O stage: fetch pages concurrently and fingerprint them against the manifest"""
+
+        def fetcher():
+            while True:
+                try:
+                    venue_info = tasks.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    page = self.crawler.fetch_page(venue_info['url'])
+                    status, job = self.crawler._prepare_page(venue_info, page, manifest, incremental)
+                except Exception as e:
+                    logger.exception(e)
+                    status, job = 'error', None
+
+                if job is None:
+                    outcomes.put((venue_info, status, None))
+                else:
+                    parse_queue.put(job)  # blocks while the parse stage is behind
+
+        fetchers = [
+            threading.Thread(target=fetcher, name=f"pipeline-fetch-{i}", daemon=True)
+            for i in range(self.fetch_workers)
+        ]
+        try:
+            for thread in fetchers:
+                thread.start()
+            for thread in fetchers:
+                thread.join()
+        finally:
+            parse_queue.put(_DONE)
+
+    def _parse_stage(self, pool: ProcessPoolExecutor, parse_queue: queue.Queue, save_queue: queue.Queue,
+                     outcomes: queue.Queue):
+        """CPU stage: parse and validate in the process pool, keeping a bounded number in flight"""
+        in_flight: Dict[Future, Dict] = {}
+        max_in_flight = self.parse_workers * 2
+
+        def drain(return_when):
+            done, _ = wait(list(in_flight), return_when=return_when)
+            for future in done:
+                job = in_flight.pop(future)
+                try:
+                    save_queue.put((job, future.result()))
+                except Exception as e:
+                    logger.error(f"Parse worker failed for {job['url']}: {str(e)}")
+                    outcomes.put((job['venue_info'], 'error', None))
+
+        try:
+            while True:
+                job = parse_queue.get()
+                if job is _DONE:
+                    break
+
+                future = pool.submit(
+                    _parse_in_worker, type(self.crawler),
+                    job['url'], job['html'], job['cached_data'], job['skip_data_hash']
+                )
+                in_flight[future] = job
+
+                if len(in_flight) >= max_in_flight:
+                    drain(FIRST_COMPLETED)
+
+            if in_flight:
+                drain(ALL_COMPLETED)
+        finally:
+            save_queue.put(_DONE)
+
+    def _save_stage(self, save_queue: queue.Queue, outcomes: queue.Queue, manifest):
+        """Writer stage: save venues and checkpoint the manifest in batches"""
+        finished = False
+        try:
+            while not finished:
+                pending = []
+                deadline = time.monotonic() + 0.5
+                item = save_queue.get()
+                while True:
+                    if item is _DONE:
+                        finished = True
+                        break
+                    pending.append(item)
+                    if len(pending) >= self.save_batch_size:
+                        break
+                    try:
+                        item = save_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+
+                for job, (venue_data, data_hash, venue) in pending:
+                    try:
+                        status, venue = self.crawler._commit_job(job, venue_data, data_hash, venue, manifest)
+                    except Exception as e:
+                        logger.exception(e)
+                        status, venue = 'error', None
+                    outcomes.put((job['venue_info'], status, venue))
+
+                if pending:
+                    manifest.save()
+        finally:
+            outcomes.put(_DONE)
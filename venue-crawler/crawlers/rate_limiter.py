@@ -0,0 +1,148 @@
+"""
+Rate Limiter - Per-host token buckets for sync and async crawling
+Burst capacity, Retry-After support and AIMD rate adaptation on 429/503
+"""
+
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from loguru import logger
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    REQUESTS_PER_SECOND,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MIN_RPS,
+    RATE_LIMIT_MAX_RPS,
+    RATE_LIMIT_INCREASE_STEP,
+    RATE_LIMIT_DECREASE_FACTOR
+)
+
+# Responses that mean "slow down" rather than "this URL is broken"
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds to wait"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Token bucket with reservation semantics, safe to share between threads and event loops
+
+    Each acquire reserves a token immediately (the balance may go negative) and then
+    waits outside the lock, so sync callers sleep and async callers await the same schedule.
+    """
+
+    def __init__(
+        self,
+        rate: float = REQUESTS_PER_SECOND,
+        capacity: int = RATE_LIMIT_BURST,
+        min_rate: float = RATE_LIMIT_MIN_RPS,
+        max_rate: float = RATE_LIMIT_MAX_RPS
+    ):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.min_rate = float(min_rate)
+        self.max_rate = max(float(max_rate), self.rate)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait_time, self.blocked_until - now)
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent"""
+        wait_time = self._reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def acquire_async(self):
+        """Suspend the calling coroutine until a request may be sent"""
+        wait_time = self._reserve()
+        if wait_time > 0:
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                # Cancelled before sending (e.g. a speculative prefetch): give the token back
+                self._release()
+                raise
+
+    def _release(self):
+        """Return an unused reservation to the bucket"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def on_success(self):
+        """Additive increase after a successful response"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + RATE_LIMIT_INCREASE_STEP)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Multiplicative decrease after a 429/503, pausing the bucket for Retry-After if given"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * RATE_LIMIT_DECREASE_FACTOR)
+
+            # Drop any saved-up burst so the host sees the reduced rate straight away
+            self.tokens = min(self.tokens, 0.0)
+
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self.blocked_until = max(self.blocked_until, now + pause)
+
+        logger.warning(f"Throttled: rate reduced to {self.rate:.2f} req/s, pausing {pause:.1f}s")
+
+
+_host_buckets: Dict[str, TokenBucket] = {}
+_host_buckets_lock = threading.Lock()
+
+
+def get_host_limiter(url: str) -> TokenBucket:
+    """Return the shared token bucket for the host of a URL"""
+    host = urlparse(url).netloc.lower() or url.lower()
+
+    with _host_buckets_lock:
+        bucket = _host_buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket()
+            _host_buckets[host] = bucket
+            logger.debug(f"Created rate limiter for {host}: {bucket.rate} req/s, burst {bucket.capacity:.0f}")
+        return bucket
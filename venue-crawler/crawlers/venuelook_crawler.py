@@ -10,11 +10,19 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 
 from base_crawler import BaseCrawler
+from parsers import ListingSpec
 
 
 class VenuelookCrawler(BaseCrawler):
     """Venuelook.com data extractor"""
 
+    LISTING_SPEC = ListingSpec(
+        card_tags=('div', 'li'),
+        card_class=re.compile(r'venue|property|listing', re.I),
+        name_tags=('a', 'h2', 'h3'),
+        name_class=re.compile(r'title|name', re.I)
+    )
+
     def __init__(self):
         super().__init__(
             source_name="venuelook",
@@ -26,61 +34,21 @@ class VenuelookCrawler(BaseCrawler):
         """Extract venue list from Venuelook"""
         logger.info(f"Fetching venue list from Venuelook for {city}")
 
-        cached_list = self._load_from_cache(f"{city.lower()}_venue_list")
-        if cached_list:
-            return cached_list
-
         venues = []
-        response = self._rate_limited_request(self.kochi_url)
+        page = self.fetch_page(self.kochi_url)
 
-        if not response:
+        if not page:
             return venues
 
-        soup = self._parse_html(response.text)
-        venue_cards = soup.find_all(['div', 'li'], class_=re.compile(r'venue|property|listing', re.I))
-
-        for card in venue_cards:
-            try:
-                name_elem = card.find(['a', 'h2', 'h3'], class_=re.compile(r'title|name', re.I))
-                if not name_elem:
-                    continue
-
-                venue_name = name_elem.get_text(strip=True)
-                venue_url = name_elem.get('href') if name_elem.name == 'a' else card.find('a')['href']
-
-                if not venue_url.startswith('http'):
-                    venue_url = self.base_url + venue_url
-
-                venues.append({
-                    'name': venue_name,
-                    'url': venue_url,
-                    'preview': {}
-                })
+        venues = self.parse_listing_page(page.html)
 
-                logger.debug(f"Found: {venue_name}")
-
-            except Exception as e:
-                logger.error(f"Error: {str(e)}")
-                continue
-
-        self._save_to_cache(f"{city.lower()}_venue_list", venues)
         logger.success(f"✓ Extracted {len(venues)} venues from Venuelook")
         return venues
 
-    def extract_venue_details(self, venue_url: str) -> Optional[Dict]:
+    def parse_venue_details(self, venue_url: str, html_content: str) -> Optional[Dict]:
         """Extract venue details"""
-        logger.info(f"Extracting from: {venue_url}")
-
-        venue_id_slug = venue_url.split('/')[-1]
-        cached_data = self._load_from_cache(f"venue_{venue_id_slug}")
-        if cached_data:
-            return cached_data
-
-        response = self._rate_limited_request(venue_url)
-        if not response:
-            return None
-
-        soup = self._parse_html(response.text)
+        venue_id_slug = self._venue_slug(venue_url)
+        soup = self._parse_html(html_content)
 
         try:
             venue_name = soup.find('h1').get_text(strip=True) if soup.find('h1') else "Unknown Venue"
@@ -196,7 +164,6 @@ class VenuelookCrawler(BaseCrawler):
                 "manual_verification_required": True
             }
 
-            self._save_to_cache(f"venue_{venue_id_slug}", venue_data)
             return venue_data
 
         except Exception as e:
@@ -10,11 +10,27 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 
 from base_crawler import BaseCrawler
+from parsers import ListingSpec
 
 
 class VenueMonkCrawler(BaseCrawler):
     """VenueMonk venue data extractor"""
 
+    # VenueMonk structure: venue cards with links
+    # (NOTE: Actual selectors need to be updated based on real HTML structure)
+    LISTING_SPEC = ListingSpec(
+        card_tags=('div',),
+        card_class=re.compile(r'venue-card|listing-card', re.I),
+        name_tags=('h2', 'h3', 'a'),
+        name_class=re.compile(r'venue-name|title', re.I),
+        previews=(
+            ('capacity_hint', 'text', re.compile(r'\d+\s*guests?', re.I)),
+            ('price_hint', 'text', re.compile(r'₹|INR', re.I)),
+            ('rating_hint', 'class', re.compile(r'rating|stars', re.I))
+        ),
+        name_href_any_tag=True
+    )
+
     def __init__(self):
         super().__init__(
             source_name="venuemonk",
@@ -29,96 +45,24 @@ class VenueMonkCrawler(BaseCrawler):
         """
         logger.info(f"Fetching venue list from VenueMonk for {city}")
 
-        # Check cache first
-        cached_list = self._load_from_cache(f"{city.lower()}_venue_list")
-        if cached_list:
-            logger.info("Using cached venue list")
-            return cached_list
-
-        venues = []
-        page = 1
         max_pages = 10  # Safety limit
 
-        while page <= max_pages:
-            url = f"{self.kochi_wedding_url}?page={page}" if page > 1 else self.kochi_wedding_url
-            response = self._rate_limited_request(url)
-
-            if not response:
-                logger.warning(f"Failed to fetch page {page}")
-                break
-
-            soup = self._parse_html(response.text)
-
-            # VenueMonk structure: venue cards with links
-            # (NOTE: Actual selectors need to be updated based on real HTML structure)
-            venue_cards = soup.find_all('div', class_=re.compile(r'venue-card|listing-card', re.I))
-
-            if not venue_cards:
-                logger.info(f"No more venues found on page {page}")
-                break
-
-            for card in venue_cards:
-                try:
-                    # Extract basic info
-                    name_elem = card.find(['h2', 'h3', 'a'], class_=re.compile(r'venue-name|title', re.I))
-                    if not name_elem:
-                        continue
-
-                    venue_name = name_elem.get_text(strip=True)
-                    venue_url = name_elem.get('href') or card.find('a', href=True)['href']
-
-                    # Ensure absolute URL
-                    if not venue_url.startswith('http'):
-                        venue_url = self.base_url + venue_url
-
-                    # Extract preview data (capacity, price, rating if visible)
-                    capacity_elem = card.find(string=re.compile(r'\d+\s*guests?', re.I))
-                    price_elem = card.find(string=re.compile(r'₹|INR', re.I))
-                    rating_elem = card.find(class_=re.compile(r'rating|stars', re.I))
-
-                    venues.append({
-                        'name': venue_name,
-                        'url': venue_url,
-                        'preview': {
-                            'capacity_hint': capacity_elem.strip() if capacity_elem else None,
-                            'price_hint': price_elem.strip() if price_elem else None,
-                            'rating_hint': rating_elem.get_text(strip=True) if rating_elem else None
-                        }
-                    })
-
-                    logger.debug(f"Found venue: {venue_name}")
-
-                except Exception as e:
-                    logger.error(f"Error parsing venue card: {str(e)}")
-                    continue
-
-            logger.info(f"Page {page}: Found {len(venue_cards)} venues (total: {len(venues)})")
-            page += 1
+        # Pages are prefetched concurrently; anything past the first empty page is cancelled
+        venues = self.fetch_paginated_listing(
+            lambda page: f"{self.kochi_wedding_url}?page={page}" if page > 1 else self.kochi_wedding_url,
+            max_pages
+        )
 
-        # Cache the venue list
-        self._save_to_cache(f"{city.lower()}_venue_list", venues)
         logger.success(f"✓ Extracted {len(venues)} venues from VenueMonk")
         return venues
 
-    def extract_venue_details(self, venue_url: str) -> Optional[Dict]:
+    def parse_venue_details(self, venue_url: str, html_content: str) -> Optional[Dict]:
         """
         Extract complete venue details from detail page
         Returns: Dictionary matching Venue schema
         """
-        logger.info(f"Extracting details from: {venue_url}")
-
-        # Check cache
-        venue_id_slug = venue_url.split('/')[-1]
-        cached_data = self._load_from_cache(f"venue_{venue_id_slug}")
-        if cached_data:
-            logger.info("Using cached venue details")
-            return cached_data
-
-        response = self._rate_limited_request(venue_url)
-        if not response:
-            return None
-
-        soup = self._parse_html(response.text)
+        venue_id_slug = self._venue_slug(venue_url)
+        soup = self._parse_html(html_content)
 
         try:
             # Extract venue name
@@ -149,9 +93,6 @@ class VenueMonkCrawler(BaseCrawler):
                 "manual_verification_required": True
             }
 
-            # Cache the extracted data
-            self._save_to_cache(f"venue_{venue_id_slug}", venue_data)
-
             return venue_data
 
         except Exception as e:
@@ -10,11 +10,24 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 
 from base_crawler import BaseCrawler
+from parsers import ListingSpec
 
 
 class WeddingVenuesCrawler(BaseCrawler):
     """WeddingVenues.in data extractor"""
 
+    # WeddingVenues.in structure: venue listings
+    LISTING_SPEC = ListingSpec(
+        card_tags=('div', 'article'),
+        card_class=re.compile(r'venue|listing|property', re.I),
+        name_tags=('h2', 'h3', 'a'),
+        name_class=re.compile(r'name|title', re.I),
+        previews=(
+            ('location_hint', 'class', re.compile(r'location|address', re.I)),
+            ('capacity_hint', 'text', re.compile(r'\d+\s*guests?', re.I))
+        )
+    )
+
     def __init__(self):
         super().__init__(
             source_name="weddingvenues",
@@ -26,71 +39,26 @@ class WeddingVenuesCrawler(BaseCrawler):
         """Extract venue list from WeddingVenues.in"""
         logger.info(f"Fetching venue list from WeddingVenues.in for {city}")
 
-        cached_list = self._load_from_cache(f"{city.lower()}_venue_list")
-        if cached_list:
-            return cached_list
-
         venues = []
-        response = self._rate_limited_request(self.kochi_url)
+        page = self.fetch_page(self.kochi_url)
 
-        if not response:
+        if not page:
             logger.error("Failed to fetch venue list")
             return venues
 
-        soup = self._parse_html(response.text)
-
-        # WeddingVenues.in structure: venue listings
-        venue_cards = soup.find_all(['div', 'article'], class_=re.compile(r'venue|listing|property', re.I))
-
-        for card in venue_cards:
-            try:
-                name_elem = card.find(['h2', 'h3', 'a'], class_=re.compile(r'name|title', re.I))
-                if not name_elem:
-                    continue
-
-                venue_name = name_elem.get_text(strip=True)
-                venue_url = name_elem.get('href') if name_elem.name == 'a' else card.find('a')['href']
-
-                if not venue_url.startswith('http'):
-                    venue_url = self.base_url + venue_url
-
-                # Extract preview data
-                location_elem = card.find(class_=re.compile(r'location|address', re.I))
-                capacity_elem = card.find(string=re.compile(r'\d+\s*guests?', re.I))
+        venues = self.parse_listing_page(page.html)
 
-                venues.append({
-                    'name': venue_name,
-                    'url': venue_url,
-                    'preview': {
-                        'location_hint': location_elem.get_text(strip=True) if location_elem else None,
-                        'capacity_hint': capacity_elem.strip() if capacity_elem else None
-                    }
-                })
-
-                logger.debug(f"Found: {venue_name}")
-
-            except Exception as e:
-                logger.error(f"Error parsing card: {str(e)}")
-                continue
-
-        self._save_to_cache(f"{city.lower()}_venue_list", venues)
         logger.success(f"✓ Extracted {len(venues)} venues from WeddingVenues.in")
         return venues
 
-    def extract_venue_details(self, venue_url: str) -> Optional[Dict]:
-        """Extract detailed venue information"""
-        logger.info(f"Extracting from: {venue_url}")
-
-        venue_id_slug = venue_url.split('/')[-1].replace('.html', '')
-        cached_data = self._load_from_cache(f"venue_{venue_id_slug}")
-        if cached_data:
-            return cached_data
-
-        response = self._rate_limited_request(venue_url)
-        if not response:
-            return None
+    def _venue_slug(self, venue_url: str) -> str:
+        """WeddingVenues.in detail URLs end in .html"""
+        return venue_url.split('/')[-1].replace('.html', '')
 
-        soup = self._parse_html(response.text)
+    def parse_venue_details(self, venue_url: str, html_content: str) -> Optional[Dict]:
+        """Extract detailed venue information"""
+        venue_id_slug = self._venue_slug(venue_url)
+        soup = self._parse_html(html_content)
 
         try:
             venue_name = self._extract_name(soup)
@@ -163,7 +131,6 @@ class WeddingVenuesCrawler(BaseCrawler):
                 "manual_verification_required": True
             }
 
-            self._save_to_cache(f"venue_{venue_id_slug}", venue_data)
             return venue_data
 
         except Exception as e:
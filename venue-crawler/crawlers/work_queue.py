@@ -0,0 +1,174 @@
+"""
+Crawl Work Queue - Persistent per-source queue of venue URLs (SQLite)
+Lets an interrupted crawl resume where it stopped, with exponential backoff and a dead-letter list
+"""
+
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+from pathlib import Path
+from loguru import logger
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import QUEUE_DB, QUEUE_MAX_ATTEMPTS, QUEUE_BACKOFF_SECONDS
+
+# Task states
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'  # waiting for a retry
+DEAD = 'dead'      # gave up: dead-letter list
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_runs (
+    source TEXT PRIMARY KEY,
+    city TEXT NOT NULL,
+    max_venues INTEGER,
+    started_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS crawl_tasks (
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    name TEXT,
+    position INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at REAL,
+    PRIMARY KEY (source, url)
+);
+
+CREATE INDEX IF NOT EXISTS idx_crawl_tasks_ready ON crawl_tasks (source, state, next_attempt_at);
+"""
+
+
+class CrawlQueue:
+    """SQLite-backed work queue shared by all source crawlers"""
+
+    def __init__(self, db_path: Path = QUEUE_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def get_run(self, source: str) -> Optional[Dict]:
+        """Return the run this source's queue was built for, if any"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM crawl_runs WHERE source = ?", (source,)).fetchone()
+        return dict(row) if row else None
+
+    def reset(self, source: str, city: str, venue_list: List[Dict], max_venues: Optional[int] = None):
+        """Start a fresh run for a source, replacing any previous queue"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM crawl_tasks WHERE source = ?", (source,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_runs (source, city, max_venues, started_at) VALUES (?, ?, ?, ?)",
+                (source, city, max_venues, now)
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO crawl_tasks (source, url, name, position, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(source, venue['url'], venue.get('name'), position, now) for position, venue in enumerate(venue_list)]
+            )
+            self._conn.execute("COMMIT")
+        logger.info(f"Queued {len(venue_list)} venues for {source}")
+
+    def recover(self, source: str) -> int:
+        """Return tasks left in flight by a crashed run to the pending state"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE crawl_tasks SET state = ?, updated_at = ? WHERE source = ? AND state = ?",
+                (PENDING, time.time(), source, IN_FLIGHT)
+            )
+        return cursor.rowcount
+
+    def claim(self, source: str, limit: int) -> List[Dict]:
+        """Move up to `limit` ready tasks to in_flight and return them in listing order"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                """SELECT url, name, attempts FROM crawl_tasks
+                   WHERE source = ? AND state IN (?, ?) AND next_attempt_at <= ?
+                   ORDER BY position LIMIT ?""",
+                (source, PENDING, FAILED, now, limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE crawl_tasks SET state = ?, updated_at = ? WHERE source = ? AND url = ?",
+                [(IN_FLIGHT, now, source, row['url']) for row in rows]
+            )
+            self._conn.execute("COMMIT")
+        return [dict(row) for row in rows]
+
+    def mark_done(self, source: str, url: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_tasks SET state = ?, last_error = NULL, updated_at = ? WHERE source = ? AND url = ?",
+                (DONE, time.time(), source, url)
+            )
+
+    def mark_failed(self, source: str, url: str, error: str, retry: bool = True) -> str:
+        """
+        Record a failed attempt, scheduling a retry with exponential backoff
+        Returns the new state (failed, or dead once attempts run out / retry=False)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM crawl_tasks WHERE source = ? AND url = ?", (source, url)
+            ).fetchone()
+            attempts = (row['attempts'] if row else 0) + 1
+
+            if not retry or attempts >= QUEUE_MAX_ATTEMPTS:
+                state, next_attempt_at = DEAD, 0
+            else:
+                state, next_attempt_at = FAILED, now + QUEUE_BACKOFF_SECONDS * 2 ** (attempts - 1)
+
+            self._conn.execute(
+                """UPDATE crawl_tasks SET state = ?, attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ?
+                   WHERE source = ? AND url = ?""",
+                (state, attempts, next_attempt_at, error, now, source, url)
+            )
+        return state
+
+    def next_retry_at(self, source: str) -> Optional[float]:
+        """Earliest time a failed task becomes ready again, or None if nothing is waiting"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) AS next_at FROM crawl_tasks WHERE source = ? AND state IN (?, ?)",
+                (source, PENDING, FAILED)
+            ).fetchone()
+        return row['next_at']
+
+    def urls(self, source: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM crawl_tasks WHERE source = ? ORDER BY position", (source,)
+            ).fetchall()
+        return [row['url'] for row in rows]
+
+    def counts(self, source: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) AS n FROM crawl_tasks WHERE source = ? GROUP BY state", (source,)
+            ).fetchall()
+        return {row['state']: row['n'] for row in rows}
+
+    def dead_letters(self, source: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, name, attempts, last_error FROM crawl_tasks WHERE source = ? AND state = ? ORDER BY position",
+                (source, DEAD)
+            ).fetchall()
+        return [dict(row) for row in rows]
@@ -5,73 +5,179 @@ Run all crawlers, build search index, test optimization
 """
 
 import sys
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from loguru import logger
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent))
 
-from config import LOG_FILE, LOG_LEVEL, VENUES_DIR
+from config import (
+    LOG_FILE, LOG_LEVEL, VENUES_DIR, CRAWL_ENGINE, PARSER_BACKEND, SEARCH_SERVER_HOST, SEARCH_SERVER_PORT,
+    SEARCH_SERVER_WATCH
+)
 from crawlers.venuemonk_crawler import VenueMonkCrawler
 from crawlers.weddingvenues_crawler import WeddingVenuesCrawler
 from crawlers.venuelook_crawler import VenuelookCrawler
 from search.venue_search import VenueSearchEngine
+from search.server import run_server
 from integration.checklist_optimizer import ChecklistOptimizer
 
 
 def setup_logging(verbose: bool = False):
     """Configure logging"""
     logger.remove()
+    logger.configure(extra={"source": "main"})
 
     # Console logging
     log_level = "DEBUG" if verbose else "INFO"
-    logger.add(sys.stderr, level=log_level, format="<level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> | <level>{message}</level>")
+    logger.add(sys.stderr, level=log_level, format="<level>{level: <8}</level> | <magenta>{extra[source]}</magenta> | <cyan>{name}</cyan>:<cyan>{function}</cyan> | <level>{message}</level>")
 
     # File logging
-    logger.add(LOG_FILE, rotation="10 MB", level="DEBUG", format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function} | {message}")
+    logger.add(LOG_FILE, rotation="10 MB", level="DEBUG", format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {extra[source]} | {name}:{function} | {message}")
 
     logger.info("EventFoundry Venue Crawler initialized")
 
 
-def run_crawlers(sources: list, max_venues_per_source: int = None):
-    """Run specified crawlers"""
-    logger.info(f"Starting crawlers for sources: {sources}")
+CRAWLERS = {
+    'venuemonk': VenueMonkCrawler,
+    'weddingvenues': WeddingVenuesCrawler,
+    'venuelook': VenuelookCrawler
+}
 
-    crawlers = {
-        'venuemonk': VenueMonkCrawler,
-        'weddingvenues': WeddingVenuesCrawler,
-        'venuelook': VenuelookCrawler
-    }
 
-    total_venues = 0
-
-    for source in sources:
-        if source not in crawlers:
-            logger.warning(f"Unknown source: {source}")
-            continue
+def run_source_crawler(
+    source: str,
+    max_venues: int = None,
+    engine: str = CRAWL_ENGINE,
+    incremental: bool = False,
+    resume: bool = False,
+    parser_backend: str = PARSER_BACKEND
+) -> dict:
+    """Run a single source crawler, returning its summary instead of raising"""
+    start = time.monotonic()
 
+    with logger.contextualize(source=source):
         logger.info(f"\n{'='*60}")
         logger.info(f"Starting {source.upper()} crawler")
         logger.info(f"{'='*60}\n")
 
         try:
-            crawler = crawlers[source]()
-            venues = crawler.crawl_all(city="Kochi", max_venues=max_venues_per_source)
-            total_venues += len(venues)
-            logger.success(f"✓ {source}: Extracted {len(venues)} venues\n")
+            crawler = CRAWLERS[source]()
+            crawler.parser_backend = parser_backend
+            venues = crawler.crawl_all(
+                city="Kochi",
+                max_venues=max_venues,
+                engine=engine,
+                incremental=incremental,
+                resume=resume
+            )
+            elapsed = time.monotonic() - start
+            logger.success(f"✓ {source}: Extracted {len(venues)} venues in {elapsed:.1f}s\n")
+            return {
+                'source': source,
+                'status': 'ok',
+                'venues': len(venues),
+                'stats': crawler.last_crawl_stats,
+                'elapsed': elapsed,
+                'error': None
+            }
 
         except Exception as e:
+            elapsed = time.monotonic() - start
             logger.error(f"✗ {source} failed: {str(e)}")
             logger.exception(e)
+            return {'source': source, 'status': 'failed', 'venues': 0, 'stats': {}, 'elapsed': elapsed, 'error': str(e)}
+
+
+def run_crawlers(
+    sources: list,
+    max_venues_per_source: int = None,
+    engine: str = CRAWL_ENGINE,
+    parallel: bool = False,
+    incremental: bool = False,
+    resume: bool = False,
+    parser_backend: str = PARSER_BACKEND
+):
+    """Run specified crawlers, one after another or all sources at once"""
+    mode = "parallel" if parallel else "sequential"
+    crawl_type = "incremental" if incremental else "full"
+    logger.info(f"Starting {crawl_type} crawl for sources: {sources} ({engine} engine, {mode})")
+
+    known_sources = []
+    for source in sources:
+        if source not in CRAWLERS:
+            logger.warning(f"Unknown source: {source}")
+            continue
+        known_sources.append(source)
+
+    start = time.monotonic()
+    summaries = []
+
+    if parallel and len(known_sources) > 1:
+        # Each source hits a different host with its own rate budget, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(known_sources), thread_name_prefix="crawler") as executor:
+            futures = {
+                executor.submit(
+                    run_source_crawler, source, max_venues_per_source, engine, incremental, resume, parser_backend
+                ): source
+                for source in known_sources
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                summary = future.result()
+                summaries.append(summary)
+                logger.info(f"Progress: {done}/{len(known_sources)} sources finished ({summary['source']}: {summary['status']})")
+    else:
+        for source in known_sources:
+            summaries.append(
+                run_source_crawler(source, max_venues_per_source, engine, incremental, resume, parser_backend)
+            )
+
+    wall_time = time.monotonic() - start
+    total_venues = sum(summary['venues'] for summary in summaries)
 
     logger.success(f"\n{'='*60}")
-    logger.success(f"CRAWLING COMPLETE: {total_venues} total venues extracted")
+    logger.success(f"CRAWLING COMPLETE: {total_venues} total venues extracted in {wall_time:.1f}s")
+    for summary in sorted(summaries, key=lambda s: known_sources.index(s['source'])):
+        status = "✓" if summary['status'] == 'ok' else "✗"
+        detail = f"{summary['venues']} venues" if summary['status'] == 'ok' else summary['error']
+        logger.success(f"  {status} {summary['source']:<14} {summary['elapsed']:>6.1f}s  {detail}")
+        if summary['stats']:
+            logger.success("      " + "  ".join(f"{key}={value}" for key, value in summary['stats'].items()))
     logger.success(f"{'='*60}\n")
 
     return total_venues
 
 
+def run_reparse(sources: list):
+    """Re-run detail extraction for each source against the raw HTML archive (no network)"""
+    logger.info(f"Re-parsing archived pages for sources: {sources}")
+    total_venues = 0
+
+    for source in sources:
+        if source not in CRAWLERS:
+            logger.warning(f"Unknown source: {source}")
+            continue
+
+        with logger.contextualize(source=source):
+            start = time.monotonic()
+            try:
+                crawler = CRAWLERS[source]()
+                venues = crawler.reparse_archive()
+            except Exception as e:
+                logger.error(f"✗ {source} re-parse failed: {str(e)}")
+                logger.exception(e)
+                continue
+
+            total_venues += len(venues)
+            logger.success(f"✓ {source}: {len(venues)} venues re-parsed in {time.monotonic() - start:.1f}s\n")
+
+    logger.success(f"RE-PARSE COMPLETE: {total_venues} total venues")
+    return total_venues
+
+
 def test_search_engine():
     """Test the venue search engine"""
     logger.info("\n🔍 Testing Venue Search Engine\n")
@@ -249,6 +355,46 @@ def main():
         help='Maximum venues per source (for testing)'
     )
 
+    parser.add_argument(
+        '--engine',
+        choices=['sync', 'async', 'pipeline'],
+        default=CRAWL_ENGINE,
+        help='Engine for venue detail pages: async keeps CONCURRENT_REQUESTS in flight per source, '
+             'pipeline also parses/validates in a process pool and batches writes'
+    )
+
+    parser.add_argument(
+        '--parser',
+        choices=['soup', 'strainer', 'lxml'],
+        default=PARSER_BACKEND,
+        help='Listing-page parser backend: full BeautifulSoup tree, SoupStrainer partial tree, or lxml XPath'
+    )
+
+    parser.add_argument(
+        '--parallel',
+        action='store_true',
+        help='Run all selected sources at the same time (one worker per source)'
+    )
+
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Skip parsing, validation and writes for venues whose page/data fingerprints are unchanged'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue the previous crawl of each source from its checkpoint instead of starting over'
+    )
+
+    parser.add_argument(
+        '--reparse',
+        nargs='+',
+        choices=['venuemonk', 'weddingvenues', 'venuelook', 'all'],
+        help='Re-run extraction against the archived raw HTML (data/archive), without network access'
+    )
+
     parser.add_argument(
         '--search',
         action='store_true',
@@ -267,6 +413,37 @@ def main():
         help='Show database statistics'
     )
 
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run the resident search server (warm index, JSON API) until interrupted'
+    )
+
+    parser.add_argument(
+        '--host',
+        default=SEARCH_SERVER_HOST,
+        help='Search server bind address'
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=SEARCH_SERVER_PORT,
+        help='Search server port'
+    )
+
+    parser.add_argument(
+        '--socket',
+        help='Serve on this Unix socket path instead of host/port'
+    )
+
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        default=SEARCH_SERVER_WATCH,
+        help='Search server: apply venue file changes to the index as they happen'
+    )
+
     parser.add_argument(
         '--verbose',
         '-v',
@@ -286,7 +463,12 @@ def main():
     # Run crawlers
     if args.crawl:
         sources = ['venuemonk', 'weddingvenues', 'venuelook'] if 'all' in args.crawl else args.crawl
-        run_crawlers(sources, args.limit)
+        run_crawlers(sources, args.limit, args.engine, args.parallel, args.incremental, args.resume, args.parser)
+
+    # Re-parse archived pages
+    if args.reparse:
+        sources = ['venuemonk', 'weddingvenues', 'venuelook'] if 'all' in args.reparse else args.reparse
+        run_reparse(sources)
 
     # Run search tests
     if args.search:
@@ -300,14 +482,24 @@ def main():
     if args.stats:
         show_statistics()
 
+    # Serve searches (blocks until interrupted)
+    if args.serve:
+        run_server(args.host, args.port, args.socket, args.watch)
+
     # If no arguments, show help
-    if not any([args.crawl, args.search, args.optimize, args.stats]):
+    if not any([args.crawl, args.reparse, args.search, args.optimize, args.stats, args.serve]):
         parser.print_help()
         print("\n💡 Quick start examples:")
         print("  python main.py --crawl all --limit 5        # Crawl 5 venues from each source")
+        print("  python main.py --crawl all --engine async   # Fetch detail pages concurrently")
+        print("  python main.py --crawl all --parallel       # Crawl all sources at the same time")
+        print("  python main.py --crawl all --incremental    # Only re-process venues that changed")
+        print("  python main.py --crawl all --resume         # Continue an interrupted crawl")
+        print("  python main.py --reparse all                # Re-run extractors on archived HTML")
         print("  python main.py --search                      # Test search engine")
         print("  python main.py --optimize                    # Test checklist optimization")
         print("  python main.py --stats                       # Show database statistics")
+        print("  python main.py --serve --port 8765           # Serve searches from a warm index")
         print()
 
 
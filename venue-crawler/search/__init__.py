@@ -1,5 +1,8 @@
 """EventFoundry Venue Search"""
 
 from .venue_search import VenueSearchEngine
+from .batch_search import BatchSearchResult
+from .results import VenueHit
+from .autocomplete import Completion
 
-__all__ = ['VenueSearchEngine']
+__all__ = ['VenueSearchEngine', 'BatchSearchResult', 'VenueHit', 'Completion']
@@ -0,0 +1,235 @@
+"""
+Venue Name Autocomplete - Popularity-ranked prefix completion over official names and aliases
+Sorted word-start suffixes + bisect find the prefix range; fuzzy matching only runs when it is empty
+"""
+
+import math
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from rapidfuzz import fuzz as rapid_fuzz, process as rapid_process
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import FUZZY_MATCH_THRESHOLD
+from search.location_index import tokenize
+
+MID_NAME_FACTOR = 0.8       # weight of a match on a later word ("hyatt" in "Grand Hyatt") vs the name start
+HEAD_PREFIX_LENGTH = 2      # prefixes up to this length have their top completions memoized
+HEAD_SIZE = 32              # completions memoized per short prefix
+FUZZY_MIN_LENGTH = 3        # shorter prefixes that miss return nothing
+
+
+class Completion(NamedTuple):
+    venue_id: str
+    text: str           # the official name or alias that matched, as written
+    match_type: str     # prefix | fuzzy
+    score: float        # popularity weight (prefix) or similarity 0-100 (fuzzy)
+
+
+def normalize(text: Optional[str]) -> str:
+    return ' '.join(tokenize(text))
+
+
+def popularity(venue: Dict) -> float:
+    """google_rating weighted by log review count (0 without ratings)"""
+    basic_info = venue.get('basic_info') or {}
+    return float(basic_info.get('google_rating') or 0) * math.log1p(basic_info.get('total_reviews') or 0)
+
+
+class CompletionIndex:
+    """
+    Every official name / alias ("label") indexed under each of its word starts, so "hyatt"
+    completes "Grand Hyatt Kochi Bolgatty". Suffixes are sorted, making all completions of a
+    prefix one contiguous range; each suffix carries its venue's popularity weight.
+
+    Venues added after compile live in an overlay index; replaced / removed venues are
+    skipped through the live mask.
+    """
+
+    def __init__(self, suffixes: Sequence[str], suffix_labels: np.ndarray, suffix_weights: np.ndarray,
+                 labels: Sequence[str], label_keys: Sequence[str], label_venues: np.ndarray,
+                 overlay: Optional['CompletionIndex'] = None, live: Optional[np.ndarray] = None):
+        self.suffixes = suffixes
+        self.suffix_labels = np.asarray(suffix_labels)
+        self.suffix_weights = np.asarray(suffix_weights)
+        self.labels = labels
+        self.label_keys = label_keys
+        self.label_venues = np.asarray(label_venues)
+        self.overlay = overlay
+        self.live = live
+        self._heads: Dict[str, List[Tuple[float, int, str]]] = {}
+        self._heads_lock = threading.Lock()
+        self._label_key_list: Optional[List[str]] = None
+
+    @staticmethod
+    def build_arrays(venues: List[Dict]) -> Tuple[Dict[str, List[str]], Dict[str, np.ndarray]]:
+        """Returns: ({'suffixes', 'labels', 'label_keys'} strings, {'suffix_labels', 'suffix_weights', 'label_venues'})"""
+        labels, label_keys, label_venues, entries = [], [], [], []
+
+        for ordinal, venue in enumerate(venues):
+            basic_info = venue.get('basic_info') or {}
+            weight = popularity(venue)
+            for text in dict.fromkeys([basic_info.get('official_name')] + list(basic_info.get('aliases') or [])):
+                key = normalize(text)
+                if not key:
+                    continue
+                label = len(labels)
+                labels.append(text)
+                label_keys.append(key)
+                label_venues.append(ordinal)
+                words = key.split(' ')
+                for start in range(len(words)):
+                    entries.append((' '.join(words[start:]), label, weight if start == 0 else weight * MID_NAME_FACTOR))
+
+        entries.sort(key=lambda entry: entry[0])
+        strings = {'suffixes': [entry[0] for entry in entries], 'labels': labels, 'label_keys': label_keys}
+        arrays = {
+            'suffix_labels': np.array([entry[1] for entry in entries], dtype=np.int32),
+            'suffix_weights': np.array([entry[2] for entry in entries], dtype=np.float32),
+            'label_venues': np.array(label_venues, dtype=np.int32)
+        }
+        return strings, arrays
+
+    @classmethod
+    def from_venues(cls, venues: List[Dict], start: int = 0) -> 'CompletionIndex':
+        strings, arrays = cls.build_arrays(venues)
+        return cls(strings['suffixes'], arrays['suffix_labels'], arrays['suffix_weights'],
+                   strings['labels'], strings['label_keys'], arrays['label_venues'] + start)
+
+    def extended(self, venues: List[Dict], start: int, live: Optional[np.ndarray]) -> 'CompletionIndex':
+        """
+        Copy with venues, numbered from ordinal start (> every indexed ordinal), merged into the
+        overlay and restricted to live venues; only the new venues' labels are indexed
+        """
+        added = self.from_venues(venues, start)
+        overlay = self.overlay
+        if overlay is not None:
+            # Insert the new suffixes after equal existing ones, as one build over every venue would
+            positions = [bisect_right(overlay.suffixes, suffix) for suffix in added.suffixes]
+            order = np.insert(np.arange(len(overlay.suffixes)), positions,
+                              np.arange(len(added.suffixes)) + len(overlay.suffixes))
+            suffixes = list(overlay.suffixes) + list(added.suffixes)
+            added = CompletionIndex(
+                [suffixes[position] for position in order.tolist()],
+                np.concatenate([overlay.suffix_labels, added.suffix_labels + len(overlay.labels)])[order],
+                np.concatenate([overlay.suffix_weights, added.suffix_weights])[order],
+                list(overlay.labels) + list(added.labels),
+                list(overlay.label_keys) + list(added.label_keys),
+                np.concatenate([overlay.label_venues, added.label_venues])
+            )
+        return CompletionIndex(self.suffixes, self.suffix_labels, self.suffix_weights, self.labels,
+                               self.label_keys, self.label_venues, added, live)
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        low = bisect_left(self.suffixes, prefix)
+        high = bisect_left(self.suffixes, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo=low)
+        return low, high
+
+    def _ranked(self, prefix: str, k: int) -> List[Tuple[float, int, str]]:
+        """Best (weight, venue ordinal, label) per venue for a prefix, heaviest first"""
+        candidates = []
+        for index in (self, self.overlay):
+            if index is None:
+                continue
+            low, high = index._prefix_range(prefix)
+            if high == low:
+                continue
+            weights = index.suffix_weights[low:high]
+            # More suffixes than needed: only the heaviest few can place (several may share a venue)
+            take = min(high - low, 4 * k)
+            top = np.argpartition(-weights, take - 1)[:take] if take < high - low else np.arange(high - low)
+            while True:
+                ranked = self._dedupe(index, low + top[np.lexsort((top, -weights[top]))], k)
+                if len(ranked) >= k or len(top) == high - low:
+                    break
+                top = np.arange(high - low)
+            candidates.extend(ranked)
+
+        candidates.sort(key=lambda item: (-item[0], item[2]))
+        seen, ranked = set(), []
+        for weight, ordinal, label in candidates:
+            if ordinal not in seen:
+                seen.add(ordinal)
+                ranked.append((weight, ordinal, label))
+        return ranked[:k]
+
+    def _dedupe(self, index: 'CompletionIndex', positions: np.ndarray, k: int) -> List[Tuple[float, int, str]]:
+        seen, ranked = set(), []
+        labels = index.suffix_labels[positions]
+        for weight, label in zip(index.suffix_weights[positions].tolist(), labels.tolist()):
+            ordinal = int(index.label_venues[label])
+            if ordinal in seen or (self.live is not None and not self.live[ordinal]):
+                continue
+            seen.add(ordinal)
+            ranked.append((weight, ordinal, index.labels[label]))
+            if len(ranked) == k:
+                break
+        return ranked
+
+    def complete(self, prefix: str, k: int = 10,
+                 correct: Optional[Callable[[str], Optional[str]]] = None) -> List[Tuple[int, str, str, float]]:
+        """
+        Top-k completions of a typed prefix, one per venue
+
+        Args:
+            correct: Maps a misspelt word to its closest known word (or None); when the prefix
+                has no completions, the corrected prefix is tried before scanning every label
+
+        Returns: (venue ordinal, label, match_type, score) tuples
+        """
+        prefix = normalize(prefix) + (' ' if prefix[-1:].isspace() and prefix.strip() else '')
+        if not prefix.strip() or k <= 0:
+            return []
+
+        if len(prefix) <= HEAD_PREFIX_LENGTH and k <= HEAD_SIZE:
+            with self._heads_lock:
+                head = self._heads.get(prefix)
+            if head is None:
+                head = self._ranked(prefix, HEAD_SIZE)
+                with self._heads_lock:
+                    self._heads[prefix] = head
+            ranked = head[:k]
+        else:
+            ranked = self._ranked(prefix, k)
+
+        if ranked:
+            return [(ordinal, label, 'prefix', round(weight, 3)) for weight, ordinal, label in ranked]
+        if len(prefix.strip()) < FUZZY_MIN_LENGTH:
+            return []
+        completions = self._corrected(prefix, k, correct) if correct is not None else []
+        return completions or self._fuzzy(prefix.strip(), k)
+
+    def _corrected(self, prefix: str, k: int, correct: Callable[[str], Optional[str]]) -> List[Tuple[int, str, str, float]]:
+        """Prefix completions of the prefix with each misspelt word corrected (similarity as score)"""
+        words = prefix.split(' ')
+        corrected = ' '.join(correct(word) or word if word else word for word in words)
+        if corrected == prefix:
+            return []
+        similarity = round(rapid_fuzz.ratio(prefix.strip(), corrected.strip()), 1)
+        return [(ordinal, label, 'fuzzy', similarity) for _, ordinal, label in self._ranked(corrected, k)]
+
+    def _fuzzy(self, prefix: str, k: int) -> List[Tuple[int, str, str, float]]:
+        """Labels whose best-aligned substring is close to the prefix (typos), most similar first"""
+        matches = []
+        for index in (self, self.overlay):
+            if index is None or not len(index.label_keys):
+                continue
+            if index._label_key_list is None:
+                index._label_key_list = list(index.label_keys)
+            for _, score, label in rapid_process.extract(prefix, index._label_key_list, scorer=rapid_fuzz.partial_ratio,
+                                                          score_cutoff=FUZZY_MATCH_THRESHOLD, limit=None):
+                ordinal = int(index.label_venues[label])
+                if self.live is None or self.live[ordinal]:
+                    matches.append((round(score, 1), ordinal, index.labels[label]))
+
+        matches.sort(key=lambda item: (-item[0], item[1]))
+        seen, completions = set(), []
+        for score, ordinal, label in matches:
+            if ordinal not in seen:
+                seen.add(ordinal)
+                completions.append((ordinal, label, 'fuzzy', score))
+        return completions[:k]
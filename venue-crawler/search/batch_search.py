@@ -0,0 +1,70 @@
+"""
+Batch Search - Vectorized many-query scoring with rapidfuzz cdist
+Scores every query against every keyword in one multi-threaded matrix call
+"""
+
+from typing import List, NamedTuple, Optional, Tuple
+import numpy as np
+from rapidfuzz import fuzz as rapid_fuzz, process as rapid_process
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import FUZZY_MATCH_THRESHOLD
+from search.fuzzy_index import sort_key
+
+# Queries scored per cdist call (bounds the float64 score matrix held at once)
+QUERY_CHUNK_SIZE = 256
+
+
+class BatchSearchResult(NamedTuple):
+    """Score matrices for a batch of queries (rows follow `queries`)"""
+    queries: List[str]
+    venue_ids: List[str]
+    venue_scores: np.ndarray                # (queries, venues) uint8, best keyword score per venue
+    keywords: Optional[List[str]] = None
+    keyword_scores: Optional[np.ndarray] = None  # (queries, keywords) uint8, if requested
+
+    def top(self, query_index: int, max_results: int = 10,
+            threshold: int = FUZZY_MATCH_THRESHOLD) -> List[Tuple[str, int]]:
+        """Best (venue_id, score) pairs for one query, highest first"""
+        scores = self.venue_scores[query_index]
+        order = np.argsort(-scores.astype(np.int16), kind='stable')[:max_results]
+        return [(self.venue_ids[i], int(scores[i])) for i in order if scores[i] >= threshold]
+
+
+def score_matrix(queries: List[str], keys: List[str], workers: int = -1) -> np.ndarray:
+    """
+    token_sort_ratio of every query against every precomputed sort key, as uint8
+
+    Uses the same preprocessing as fuzzywuzzy's token_sort_ratio and rounds half-to-even
+    like it does, so scores agree with VenueSearchEngine.search
+    """
+    query_keys = [sort_key(query) for query in queries]
+    scores = np.zeros((len(query_keys), len(keys)), dtype=np.uint8)
+    if not keys:
+        return scores
+
+    empty_keys = [i for i, key in enumerate(keys) if not key]
+
+    for start in range(0, len(query_keys), QUERY_CHUNK_SIZE):
+        chunk = query_keys[start:start + QUERY_CHUNK_SIZE]
+        raw = rapid_process.cdist(chunk, keys, scorer=rapid_fuzz.ratio, dtype=np.float64, workers=workers)
+        # fuzzywuzzy scores an empty processed string as 0, unless both sides are empty (100)
+        empty_queries = [i for i, key in enumerate(chunk) if not key]
+        raw[empty_queries] = 0
+        raw[:, empty_keys] = 0
+        raw[np.ix_(empty_queries, empty_keys)] = 100
+        scores[start:start + len(chunk)] = np.rint(raw)
+
+    return scores
+
+
+def venue_max(keyword_scores: np.ndarray, keyword_ordinals: np.ndarray, venue_ordinals: np.ndarray,
+              venue_count: int) -> np.ndarray:
+    """Fold keyword scores into per-venue maxima over each venue's keywords"""
+    venue_scores = np.zeros((keyword_scores.shape[0], venue_count), dtype=np.uint8)
+    if len(keyword_ordinals):
+        np.maximum.at(venue_scores.T, venue_ordinals, keyword_scores[:, keyword_ordinals].T)
+    return venue_scores
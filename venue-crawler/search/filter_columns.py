@@ -0,0 +1,119 @@
+"""
+Filter Columns - Columnar (NumPy) venue attributes for vectorized filtering
+Filterable fields are extracted once at index build time; filters evaluate as boolean masks
+"""
+
+from typing import Dict, List
+import numpy as np
+
+
+class FilterColumns:
+    """
+    One column per filterable field, indexed by venue ordinal
+
+    Event spaces are flattened (space_max_guests / space_venue) so capacity filters
+    test every space at once and scatter the hits back onto venues.
+    """
+
+    COLUMNS = ('space_max_guests', 'space_venue', 'in_house_catering', 'parking_capacity',
+               'accommodation_available', 'venue_type', 'per_plate_cost_max')
+
+    def __init__(self, venues: List[Dict]):
+        self.size = len(venues)
+
+        space_max_guests, space_venue = [], []
+        in_house_catering = np.zeros(self.size, dtype=bool)
+        parking_capacity = np.zeros(self.size, dtype=np.int64)
+        accommodation_available = np.zeros(self.size, dtype=bool)
+        venue_type = np.zeros(self.size, dtype=np.int32)
+        per_plate_cost_max = np.full(self.size, np.nan)
+        self.venue_type_codes: Dict[str, int] = {}
+
+        for ordinal, venue in enumerate(venues):
+            for space in venue.get('capacity', {}).get('event_spaces', []) or []:
+                space_max_guests.append(space.get('max_guests', 0) or 0)
+                space_venue.append(ordinal)
+
+            in_house_catering[ordinal] = bool(venue.get('catering', {}).get('in_house_catering'))
+            parking_capacity[ordinal] = venue.get('capacity', {}).get('parking_capacity') or 0
+            accommodation_available[ordinal] = bool(venue.get('facilities', {}).get('accommodation_available'))
+
+            type_name = venue.get('basic_info', {}).get('venue_type')
+            venue_type[ordinal] = self.venue_type_codes.setdefault(type_name, len(self.venue_type_codes))
+
+            price = venue.get('pricing', {}).get('per_plate_cost_max')
+            if price:
+                per_plate_cost_max[ordinal] = price
+
+        self.space_max_guests = np.array(space_max_guests, dtype=np.int64)
+        self.space_venue = np.array(space_venue, dtype=np.int32)
+        self.in_house_catering = in_house_catering
+        self.parking_capacity = parking_capacity
+        self.accommodation_available = accommodation_available
+        self.venue_type = venue_type
+        self.per_plate_cost_max = per_plate_cost_max
+
+    @classmethod
+    def from_arrays(cls, size: int, columns: Dict[str, np.ndarray], venue_type_codes: Dict[str, int]) -> 'FilterColumns':
+        """Columns loaded back from to_arrays() output (e.g. memory-mapped .npy files)"""
+        filter_columns = cls.__new__(cls)
+        filter_columns.size = size
+        filter_columns.venue_type_codes = dict(venue_type_codes)
+        for name in cls.COLUMNS:
+            setattr(filter_columns, name, columns[name])
+        return filter_columns
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.COLUMNS}
+
+    def extended(self, venues: List[Dict]) -> 'FilterColumns':
+        """Copy with venues appended after the existing ordinals"""
+        added = FilterColumns(venues)
+        venue_type_codes = dict(self.venue_type_codes)
+        recode = np.array([venue_type_codes.setdefault(name, len(venue_type_codes))
+                           for name in sorted(added.venue_type_codes, key=added.venue_type_codes.get)], dtype=np.int32)
+
+        columns = {name: np.concatenate([getattr(self, name), getattr(added, name)]) for name in self.COLUMNS}
+        columns['space_venue'] = np.concatenate([self.space_venue, added.space_venue + self.size]).astype(np.int32)
+        columns['venue_type'] = np.concatenate([self.venue_type, recode[added.venue_type] if len(recode) else added.venue_type])
+        return FilterColumns.from_arrays(self.size + added.size, columns, venue_type_codes)
+
+    def capacity_mask(self, min_capacity: float = 0, max_capacity: float = float('inf')) -> np.ndarray:
+        """Venues with at least one space whose max_guests lies in [min_capacity, max_capacity]"""
+        mask = np.zeros(self.size, dtype=bool)
+        fits = (self.space_max_guests >= min_capacity) & (self.space_max_guests <= max_capacity)
+        mask[self.space_venue[fits]] = True
+        return mask
+
+    def mask(self, filters: Dict) -> np.ndarray:
+        """
+        Boolean mask of venues passing all filters (same semantics as the original per-venue checks:
+        presence of has_kitchen / has_parking is enough to require them, has_accommodation must be
+        truthy, and venues without a per-plate price pass price_max)
+        """
+        mask = np.ones(self.size, dtype=bool)
+
+        # Capacity filter
+        if 'min_capacity' in filters or 'max_capacity' in filters:
+            mask &= self.capacity_mask(filters.get('min_capacity', 0), filters.get('max_capacity', float('inf')))
+
+        # Facility filters
+        if 'has_kitchen' in filters:
+            mask &= self.in_house_catering
+
+        if 'has_parking' in filters:
+            mask &= self.parking_capacity >= 1
+
+        if 'has_accommodation' in filters and filters['has_accommodation']:
+            mask &= self.accommodation_available
+
+        # Venue type filter
+        if 'venue_type' in filters:
+            code = self.venue_type_codes.get(filters['venue_type'])
+            mask &= (self.venue_type == code) if code is not None else False
+
+        # Price filter (NaN = no price listed, which never excludes)
+        if 'price_max' in filters:
+            mask &= ~(self.per_plate_cost_max > filters['price_max'])
+
+        return mask
@@ -0,0 +1,177 @@
+"""
+Fuzzy Keyword Index - Trigram candidate pruning for token_sort_ratio matching
+Only keywords whose trigram overlap could still reach the score threshold are scored
+"""
+
+import math
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from fuzzywuzzy import utils
+
+try:
+    from Levenshtein import ratio as levenshtein_ratio
+except ImportError:  # optional: candidates are then only pruned by the trigram bound
+    levenshtein_ratio = None
+
+Q = 3
+PAD = ' ' * (Q - 1)
+
+
+def sort_key(text: str) -> str:
+    """The string token_sort_ratio actually compares (as processed by process.extract)"""
+    processed = utils.full_process(utils.full_process(text), force_ascii=True)
+    return ' '.join(sorted(processed.split()))
+
+
+def take(strings: Sequence[str], ordinals: List[int]) -> List[str]:
+    """strings[i] for each ordinal (batched when strings is a memory-mapped string table)"""
+    if hasattr(strings, 'take'):
+        return strings.take(ordinals)
+    return [strings[ordinal] for ordinal in ordinals]
+
+
+def qgrams(key: str) -> Counter:
+    """Padded trigram multiset of a sort key"""
+    padded = f"{PAD}{key}{PAD}"
+    return Counter(padded[i:i + Q] for i in range(len(padded) - Q + 1))
+
+
+class TrigramIndex:
+    """
+    Trigram postings over keyword sort keys
+
+    Bound: token_sort_ratio is (rounded) 2*LCS / (len_a + len_b) of the sort keys. Every
+    insertion/deletion between the two keys breaks at most Q-1 padded trigrams of their LCS,
+    so shared trigrams T >= LCS + (Q-1) - (Q-1)*(len_a + len_b - 2*LCS). Inverting that gives
+    an upper bound on the score from T, and keywords whose bound is below the threshold can
+    never be returned, which keeps results identical to scoring every keyword.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = keywords
+        keys = [sort_key(keyword) for keyword in keywords]
+        self.keys = keys
+        self.lengths = np.array([len(key) for key in keys], dtype=np.int32)
+        self._length_order = np.argsort(self.lengths, kind='stable').astype(np.int32)
+        self._sorted_lengths = self.lengths[self._length_order]
+
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for ordinal, key in enumerate(keys):
+            if not key:
+                continue
+            for gram, count in qgrams(key).items():
+                ordinals, counts = postings.setdefault(gram, ([], []))
+                ordinals.append(ordinal)
+                counts.append(count)
+
+        self.postings = {
+            gram: (np.array(ordinals, dtype=np.int32), np.array(counts, dtype=np.int32))
+            for gram, (ordinals, counts) in postings.items()
+        }
+
+    @classmethod
+    def from_arrays(cls, keywords: Sequence[str], keys: Sequence[str], lengths: np.ndarray,
+                    length_order: np.ndarray, sorted_lengths: np.ndarray, grams: Sequence[str],
+                    gram_offsets: np.ndarray, posting_ordinals: np.ndarray,
+                    posting_counts: np.ndarray) -> 'TrigramIndex':
+        """Rebuild an index from its flattened (CSR) postings, e.g. memory-mapped from search/index_store.py"""
+        index = cls.__new__(cls)
+        index.keywords = keywords
+        index.keys = keys
+        index.lengths = lengths
+        index._length_order = length_order
+        index._sorted_lengths = sorted_lengths
+        index.postings = {
+            gram: (posting_ordinals[start:end], posting_counts[start:end])
+            for gram, start, end in zip(grams, gram_offsets[:-1].tolist(), gram_offsets[1:].tolist())
+        }
+        return index
+
+    def extended(self, keywords: Sequence[str], keys: Sequence[str]) -> 'TrigramIndex':
+        """
+        Copy of the index over keywords / keys that extend this index's ones (new ordinals at the end);
+        only postings of the new keys' trigrams are copied, the rest are shared
+        """
+        start = len(self.keywords)
+        new_keys = [keys[ordinal] for ordinal in range(start, len(keys))]
+
+        index = TrigramIndex.__new__(TrigramIndex)
+        index.keywords = keywords
+        index.keys = keys
+        index.lengths = np.concatenate([self.lengths, np.array([len(key) for key in new_keys], dtype=np.int32)])
+        index._length_order = np.argsort(index.lengths, kind='stable').astype(np.int32)
+        index._sorted_lengths = index.lengths[index._length_order]
+
+        added: Dict[str, Tuple[List[int], List[int]]] = {}
+        for ordinal, key in enumerate(new_keys, start):
+            if not key:
+                continue
+            for gram, count in qgrams(key).items():
+                ordinals, counts = added.setdefault(gram, ([], []))
+                ordinals.append(ordinal)
+                counts.append(count)
+
+        index.postings = dict(self.postings)
+        for gram, (ordinals, counts) in added.items():
+            old_ordinals, old_counts = self.postings.get(gram, (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)))
+            index.postings[gram] = (np.concatenate([old_ordinals, np.array(ordinals, dtype=np.int32)]),
+                                    np.concatenate([old_counts, np.array(counts, dtype=np.int32)]))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    @staticmethod
+    def _score_bound(shared: np.ndarray, query_length: int, key_lengths: np.ndarray) -> np.ndarray:
+        """Upper bound on token_sort_ratio (0-100) given shared trigram counts"""
+        total = query_length + key_lengths
+        lcs_bound = (shared - (Q - 1) + (Q - 1) * total) / (2 * Q - 1)
+        lcs_bound = np.minimum(lcs_bound, np.minimum(query_length, key_lengths))
+        return 200.0 * lcs_bound / np.maximum(total, 1)
+
+    def _unshared_candidates(self, query_length: int, min_score: float) -> np.ndarray:
+        """Keywords long enough to reach min_score without sharing a single trigram"""
+        # With T = 0 the bound is cap * (S - 1) / S, S = combined length
+        cap = 200.0 * (Q - 1) / (2 * Q - 1)
+        if min_score >= cap:
+            return self._length_order[:0]
+        min_length = math.ceil(cap / (cap - min_score)) - query_length
+        start = np.searchsorted(self._sorted_lengths, min_length, side='left')
+        return self._length_order[start:]
+
+    def candidates(self, query: str, threshold: int) -> List[str]:
+        """Keywords that may score >= threshold against the query, in index order"""
+        return take(self.keywords, self.candidate_ordinals(query, threshold))
+
+    def candidate_ordinals(self, query: str, threshold: int) -> List[int]:
+        """Ordinals of the keywords candidates() would return"""
+        query_key = sort_key(query)
+        if not query_key:
+            return []
+
+        # Rounded scores of >= threshold need a raw score of at least threshold - 0.5
+        min_score = threshold - 0.5 - 1e-9
+
+        keep = self._unshared_candidates(len(query_key), min_score)
+
+        # Multiset trigram overlap with every keyword sharing at least one trigram
+        shared = np.zeros(len(self.keywords), dtype=np.int32)
+        for gram, query_count in qgrams(query_key).items():
+            posting = self.postings.get(gram)
+            if posting is not None:
+                shared[posting[0]] += np.minimum(posting[1], query_count)
+
+        touched = np.flatnonzero(shared)
+        if len(touched):
+            bounds = self._score_bound(shared[touched], len(query_key), self.lengths[touched])
+            keep = np.union1d(touched[bounds >= min_score], keep)
+
+        keep = np.sort(keep).tolist()
+        if levenshtein_ratio is not None:
+            # Exact indel ratio of the sort keys: what fuzz.ratio scores with python-Levenshtein
+            # installed, and an upper bound on difflib's ratio without it
+            keep = [ordinal for ordinal, key in zip(keep, take(self.keys, keep))
+                    if 100.0 * levenshtein_ratio(query_key, key) >= min_score]
+
+        return keep
@@ -0,0 +1,159 @@
+"""
+Geo Index - Grid-bucketed venue coordinates for radius and nearest-venue queries
+Candidates come from the grid cells overlapping the search circle; distances are vectorized haversine
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import GEO_GRID_CELL_DEG
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+GRID_COLUMNS = int(round(360.0 / GEO_GRID_CELL_DEG)) + 1
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to many, in km"""
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _cell_row(latitude):
+    return np.floor((np.asarray(latitude) + 90.0) / GEO_GRID_CELL_DEG).astype(np.int64)
+
+
+def _cell_column(longitude):
+    return np.floor((np.asarray(longitude) + 180.0) / GEO_GRID_CELL_DEG).astype(np.int64)
+
+
+class GeoIndex:
+    """
+    Uniform lat/long grid (GEO_GRID_CELL_DEG cells) stored as venue ordinals sorted by cell key
+
+    A radius query turns the circle's bounding box into one contiguous cell-key range per grid
+    row, finds each with searchsorted, and computes exact haversine distances only for the
+    venues in those cells. Venues without coordinates are never returned.
+    """
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray, order: np.ndarray, cells: np.ndarray):
+        self.latitudes = np.asarray(latitudes)
+        self.longitudes = np.asarray(longitudes)
+        self.order = np.asarray(order)      # ordinals of located venues, by cell key
+        self.cells = np.asarray(cells)      # their cell keys, ascending
+
+    @staticmethod
+    def build_arrays(venues: List[Dict]) -> Dict[str, np.ndarray]:
+        latitudes = np.full(len(venues), np.nan)
+        longitudes = np.full(len(venues), np.nan)
+        for ordinal, venue in enumerate(venues):
+            coordinates = (venue.get('location') or {}).get('coordinates') or {}
+            if coordinates.get('latitude') is not None and coordinates.get('longitude') is not None:
+                latitudes[ordinal] = coordinates['latitude']
+                longitudes[ordinal] = coordinates['longitude']
+
+        located = np.flatnonzero(~np.isnan(latitudes))
+        keys = _cell_row(latitudes[located]) * GRID_COLUMNS + _cell_column(longitudes[located])
+        order = np.argsort(keys, kind='stable')
+        return {
+            'latitudes': latitudes,
+            'longitudes': longitudes,
+            'order': located[order].astype(np.int32),
+            'cells': keys[order]
+        }
+
+    def extended(self, venues: List[Dict]) -> 'GeoIndex':
+        """Copy with venues appended after the existing ordinals (merged into the cell order)"""
+        arrays = self.build_arrays(venues)
+        positions = np.searchsorted(self.cells, arrays['cells'], side='right')
+        return GeoIndex(
+            np.concatenate([self.latitudes, arrays['latitudes']]),
+            np.concatenate([self.longitudes, arrays['longitudes']]),
+            np.insert(self.order, positions, arrays['order'] + len(self.latitudes)).astype(np.int32),
+            np.insert(self.cells, positions, arrays['cells'])
+        )
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def distances(self, latitude: float, longitude: float) -> np.ndarray:
+        """Distance from the point to every venue (NaN where coordinates are missing)"""
+        return haversine_km(latitude, longitude, self.latitudes, self.longitudes)
+
+    def _grid_candidates(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        lat_delta = radius_km / KM_PER_DEGREE
+        lowest, highest = latitude - lat_delta, latitude + lat_delta
+        if lowest <= -90.0 or highest >= 90.0:
+            return self.order  # circle reaches a pole: every longitude qualifies
+
+        # Widest longitude span of the circle is at the latitude closest to a pole
+        lon_delta = lat_delta / max(math.cos(math.radians(max(abs(lowest), abs(highest)))), 1e-12)
+        if lon_delta >= 180.0:
+            return self.order
+
+        rows = range(int(_cell_row(lowest)), int(_cell_row(highest)) + 1)
+        west, east = longitude - lon_delta, longitude + lon_delta
+        # Longitude ranges, split where the box crosses the antimeridian
+        spans = [(west, east)]
+        if west < -180.0:
+            spans = [(-180.0, east), (west + 360.0, 180.0)]
+        elif east > 180.0:
+            spans = [(west, 180.0), (-180.0, east - 360.0)]
+
+        column_spans = [(int(_cell_column(low)), int(_cell_column(high))) for low, high in spans]
+        starts, ends = [], []
+        for row in rows:
+            for first, last in column_spans:
+                starts.append(row * GRID_COLUMNS + first)
+                ends.append(row * GRID_COLUMNS + last)
+
+        lefts = np.searchsorted(self.cells, starts, side='left')
+        rights = np.searchsorted(self.cells, ends, side='right')
+        slices = [self.order[left:right] for left, right in zip(lefts.tolist(), rights.tolist()) if right > left]
+        return np.concatenate(slices) if slices else self.order[:0]
+
+    def within(self, latitude: float, longitude: float, radius_km: float,
+               mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Venues within radius_km of the point (and passing mask), nearest first
+        Returns: (venue ordinals, distances in km)
+        """
+        candidates = self._grid_candidates(latitude, longitude, radius_km)
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+
+        distances = haversine_km(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+
+        order = np.lexsort((candidates, distances))
+        return candidates[order], distances[order]
+
+    def nearest(self, latitude: float, longitude: float, k: int,
+                mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k nearest venues (passing mask), nearest first; grows the search radius from one grid
+        cell until k venues fall inside it, then falls back to a full vectorized scan
+        Returns: (venue ordinals, distances in km)
+        """
+        available = len(self.order) if mask is None else int(mask[self.order].sum())
+        k = min(k, available)
+        if k <= 0:
+            return self.order[:0], np.zeros(0)
+
+        radius_km = GEO_GRID_CELL_DEG * KM_PER_DEGREE
+        while radius_km < EARTH_RADIUS_KM:
+            ordinals, distances = self.within(latitude, longitude, radius_km, mask)
+            if len(ordinals) >= k:
+                return ordinals[:k], distances[:k]
+            radius_km *= 4
+
+        ordinals, distances = self.within(latitude, longitude, math.pi * EARTH_RADIUS_KM, mask)
+        return ordinals[:k], distances[:k]
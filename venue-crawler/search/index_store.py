@@ -0,0 +1,480 @@
+"""
+Compiled Search Index - Memory-mapped on-disk snapshot of the venue search index
+Built once from data/venues/*.json and reopened via mmap until a source file changes
+"""
+
+import os
+import json
+import mmap
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from loguru import logger
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import DOCUMENT_CACHE_SIZE
+from search.fuzzy_index import TrigramIndex
+from search.filter_columns import FilterColumns
+from search.location_index import LocationIndex
+from search.geo_index import GeoIndex
+from search.postings import KeywordPostings
+from search.text_index import TextIndex
+from search.autocomplete import CompletionIndex
+
+# Bump whenever the on-disk layout or the way keywords/keys are derived changes
+INDEX_FORMAT_VERSION = 7
+
+MANIFEST_FILE = "manifest.json"
+
+
+def scan_sources(venues_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """Venue file name -> (size, mtime_ns)"""
+    if not venues_dir.exists():
+        return {}
+    return {
+        entry.name: (stat.st_size, stat.st_mtime_ns)
+        for entry in os.scandir(venues_dir) if entry.name.endswith('.json') and entry.is_file()
+        for stat in (entry.stat(),)
+    }
+
+
+def source_signature(venues_dir: Path, sources: Optional[Dict[str, Tuple[int, int]]] = None) -> str:
+    """Hash of the venue files' names, sizes and mtimes (any edit, add or delete changes it)"""
+    digest = hashlib.sha1(f"v{INDEX_FORMAT_VERSION}\0{venues_dir.resolve()}\n".encode('utf-8'))
+    sources = scan_sources(venues_dir) if sources is None else sources
+    digest.update(''.join(
+        f"{name}\0{size}\0{mtime_ns}\n" for name, (size, mtime_ns) in sorted(sources.items())
+    ).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _map_file(path: Path):
+    """Read-only mmap of a file (empty files can't be mapped)"""
+    if path.stat().st_size == 0:
+        return b''
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _load_array(path: Path) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode='r')
+    except ValueError:  # older NumPy refuses to map zero-length arrays
+        return np.load(path)
+
+
+class StringTable(Sequence):
+    """
+    UTF-8 strings packed into one buffer and addressed by an offsets array
+
+    Strings are decoded on access; with a sorted order array, index() finds a string by
+    binary search without building a dict over the whole table.
+    """
+
+    def __init__(self, buffer, offsets: np.ndarray, sorted_order: Optional[np.ndarray] = None):
+        self.buffer = buffer
+        # Plain ndarray views: np.memmap indexing is several times slower per element
+        self.offsets = np.asarray(offsets)
+        self.sorted_order = np.asarray(sorted_order) if sorted_order is not None else None
+
+    @staticmethod
+    def pack(strings: List[str]):
+        """Returns: (buffer bytes, int64 offsets, int32 ordinals in byte order)"""
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        sorted_order = np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.int32)
+        return b''.join(encoded), offsets, sorted_order
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _bytes(self, ordinal: int) -> bytes:
+        return self.buffer[int(self.offsets[ordinal]):int(self.offsets[ordinal + 1])]
+
+    def __getitem__(self, ordinal):
+        if isinstance(ordinal, slice):
+            return [self[i] for i in range(*ordinal.indices(len(self)))]
+        if ordinal < 0:
+            ordinal += len(self)
+        if not 0 <= ordinal < len(self):
+            raise IndexError(ordinal)
+        return self._bytes(ordinal).decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.take(range(len(self))))
+
+    def take(self, ordinals) -> List[str]:
+        """Decode many strings at once (one vectorized offset gather instead of per-item lookups)"""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        buffer = self.buffer
+        return [buffer[start:end].decode('utf-8') for start, end in
+                zip(self.offsets[ordinals].tolist(), self.offsets[ordinals + 1].tolist())]
+
+    def index(self, value: str) -> int:
+        """Ordinal of value, or -1 (needs sorted_order)"""
+        target = value.encode('utf-8')
+        low, high = 0, len(self.sorted_order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._bytes(self.sorted_order[middle]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.sorted_order) and self._bytes(self.sorted_order[low]) == target:
+            return int(self.sorted_order[low])
+        return -1
+
+    def __contains__(self, value) -> bool:
+        return isinstance(value, str) and self.index(value) >= 0
+
+
+class ExtendedTable(Sequence):
+    """A string table plus strings appended in memory by incremental updates (copy-on-write)"""
+
+    def __init__(self, base: Sequence[str], extra: Tuple[str, ...] = ()):
+        self.base = base
+        self.extra = extra
+        self._base_length = len(base)
+        self._extra_ordinals = {string: self._base_length + i for i, string in enumerate(extra)}
+
+    def extended(self, strings: List[str]) -> 'ExtendedTable':
+        return ExtendedTable(self.base, self.extra + tuple(strings))
+
+    def __len__(self) -> int:
+        return self._base_length + len(self.extra)
+
+    def __getitem__(self, ordinal):
+        if isinstance(ordinal, slice):
+            return [self[i] for i in range(*ordinal.indices(len(self)))]
+        if ordinal < 0:
+            ordinal += len(self)
+        return self.base[ordinal] if ordinal < self._base_length else self.extra[ordinal - self._base_length]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.base
+        yield from self.extra
+
+    def take(self, ordinals) -> List[str]:
+        ordinals = list(ordinals)
+        if not self.extra:
+            return self.base.take(ordinals)
+        base_strings = iter(self.base.take([o for o in ordinals if o < self._base_length]))
+        return [next(base_strings) if o < self._base_length else self.extra[o - self._base_length] for o in ordinals]
+
+    def index(self, value: str) -> int:
+        """Ordinal of value (appended strings first), or -1"""
+        ordinal = self._extra_ordinals.get(value)
+        return ordinal if ordinal is not None else self.base.index(value)
+
+
+class _DocumentCache:
+    """LRU of decoded documents, shared by every snapshot built on the same venue blob"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+
+class DocumentStore(Sequence):
+    """
+    Full venue documents, JSON-decoded on demand from the packed venue blob
+
+    Recently used documents stay in a small LRU cache; iterating the whole store bypasses
+    the cache so catalogue scans don't evict the hot set. Documents added by incremental
+    updates are appended after the blob's ordinals and kept decoded.
+    """
+
+    def __init__(self, blob: StringTable, cache_size: int = DOCUMENT_CACHE_SIZE,
+                 cache: Optional[_DocumentCache] = None, appended: Tuple[Dict, ...] = ()):
+        self.blob = blob
+        self.cache_size = cache_size
+        self._cache = cache or _DocumentCache(cache_size)
+        self._blob_length = len(blob)
+        self.appended = appended
+
+    def extended(self, documents: List[Dict]) -> 'DocumentStore':
+        """New store with documents appended (blob ordinals and their cache are shared)"""
+        return DocumentStore(self.blob, self.cache_size, self._cache, self.appended + tuple(documents))
+
+    def __len__(self) -> int:
+        return self._blob_length + len(self.appended)
+
+    def __getitem__(self, ordinal):
+        if isinstance(ordinal, slice):
+            return [self[i] for i in range(*ordinal.indices(len(self)))]
+
+        ordinal = int(ordinal)
+        if ordinal >= self._blob_length:
+            return self.appended[ordinal - self._blob_length]
+
+        cache = self._cache
+        with cache.lock:
+            document = cache.entries.get(ordinal)
+            if document is not None:
+                cache.entries.move_to_end(ordinal)
+                cache.hits += 1
+                return document
+            cache.misses += 1
+
+        document = json.loads(self.blob[ordinal])
+        if cache.capacity > 0:
+            with cache.lock:
+                cache.entries[ordinal] = document
+                if len(cache.entries) > cache.capacity:
+                    cache.entries.popitem(last=False)
+        return document
+
+    def __iter__(self) -> Iterator[Dict]:
+        for document in self.blob:
+            yield json.loads(document)
+        yield from self.appended
+
+    def stats(self) -> Dict:
+        cache = self._cache
+        with cache.lock:
+            return {'cached': len(cache.entries), 'capacity': cache.capacity, 'hits': cache.hits, 'misses': cache.misses}
+
+
+class CompiledIndex:
+    """
+    One index snapshot: data/index/<signature>/ holding .npy arrays (opened with mmap_mode='r')
+    and packed string tables (keywords, sort keys, trigrams, venue ids, venue JSON)
+
+    Layout:
+        keywords / keys / grams / venue_ids / venues  .bin + _offsets.npy (+ _sorted.npy)
+        pair_keywords, pair_venues, keyword_pair_offsets  keyword -> venue postings
+        lengths, length_order, sorted_lengths, gram_offsets, posting_ordinals, posting_counts
+        location_tokens + location_offsets/venues/weights  location token -> venue postings
+        geo_latitudes/longitudes, geo_order/cells  venue coordinates + grid cell order
+        text_tokens + text_offsets/venues/frequencies/lengths  BM25 token -> venue postings
+        text_grams, text_token_lengths ... text_posting_counts  trigram index over text_tokens
+        completion_*  sorted name / alias word-start suffixes -> labels -> venues, for autocomplete
+        column_*  FilterColumns arrays
+    """
+
+    STRING_TABLES = ('keywords', 'keys', 'grams', 'venue_ids', 'venues', 'location_tokens', 'text_tokens', 'text_grams',
+                     'completion_suffixes', 'completion_labels', 'completion_label_keys')
+    SORTED_TABLES = ('keywords', 'venue_ids')
+    ARRAYS = ('pair_keywords', 'pair_venues', 'keyword_pair_offsets', 'lengths', 'length_order', 'sorted_lengths',
+              'gram_offsets', 'posting_ordinals', 'posting_counts',
+              'location_offsets', 'location_venues', 'location_weights',
+              'geo_latitudes', 'geo_longitudes', 'geo_order', 'geo_cells',
+              'text_offsets', 'text_venues', 'text_frequencies', 'text_lengths',
+              'text_token_lengths', 'text_length_order', 'text_sorted_lengths',
+              'text_gram_offsets', 'text_posting_ordinals', 'text_posting_counts',
+              'completion_suffix_labels', 'completion_suffix_weights', 'completion_label_venues')
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        with open(directory / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        self.strings: Dict[str, StringTable] = {}
+        for name in self.STRING_TABLES:
+            sorted_order = _load_array(directory / f"{name}_sorted.npy") if name in self.SORTED_TABLES else None
+            self.strings[name] = StringTable(
+                _map_file(directory / f"{name}.bin"), _load_array(directory / f"{name}_offsets.npy"), sorted_order
+            )
+
+        self.arrays = {name: _load_array(directory / f"{name}.npy") for name in self.ARRAYS}
+        self.arrays.update({
+            f"column_{name}": _load_array(directory / f"column_{name}.npy") for name in FilterColumns.COLUMNS
+        })
+
+        self.keywords = self.strings['keywords']
+        self.venue_ids = self.strings['venue_ids']
+        self.documents = DocumentStore(self.strings['venues'])
+
+    @property
+    def signature(self) -> str:
+        return self.manifest['signature']
+
+    def fuzzy_index(self) -> TrigramIndex:
+        arrays = self.arrays
+        return TrigramIndex.from_arrays(
+            self.keywords, self.strings['keys'], arrays['lengths'], arrays['length_order'], arrays['sorted_lengths'],
+            self.strings['grams'], arrays['gram_offsets'], arrays['posting_ordinals'], arrays['posting_counts']
+        )
+
+    def text_vocabulary(self) -> TrigramIndex:
+        # Text tokens are lowercase ASCII alphanumerics, so each is its own sort key
+        arrays = self.arrays
+        return TrigramIndex.from_arrays(
+            self.strings['text_tokens'], self.strings['text_tokens'], arrays['text_token_lengths'],
+            arrays['text_length_order'], arrays['text_sorted_lengths'], self.strings['text_grams'],
+            arrays['text_gram_offsets'], arrays['text_posting_ordinals'], arrays['text_posting_counts']
+        )
+
+    def location_index(self) -> LocationIndex:
+        arrays = self.arrays
+        return LocationIndex(self.strings['location_tokens'], arrays['location_offsets'],
+                             arrays['location_venues'], arrays['location_weights'])
+
+    def geo_index(self) -> GeoIndex:
+        arrays = self.arrays
+        return GeoIndex(arrays['geo_latitudes'], arrays['geo_longitudes'], arrays['geo_order'], arrays['geo_cells'])
+
+    def text_index(self) -> TextIndex:
+        arrays = self.arrays
+        return TextIndex(self.strings['text_tokens'], arrays['text_offsets'], arrays['text_venues'],
+                         arrays['text_frequencies'], arrays['text_lengths'], vocabulary=self.text_vocabulary())
+
+    def completion_index(self) -> CompletionIndex:
+        arrays, strings = self.arrays, self.strings
+        return CompletionIndex(strings['completion_suffixes'], arrays['completion_suffix_labels'],
+                               arrays['completion_suffix_weights'], strings['completion_labels'],
+                               strings['completion_label_keys'], arrays['completion_label_venues'])
+
+    def filter_columns(self) -> FilterColumns:
+        columns = {name[len('column_'):]: array for name, array in self.arrays.items() if name.startswith('column_')}
+        return FilterColumns.from_arrays(self.manifest['venue_count'], columns, self.manifest['venue_type_codes'])
+
+    @classmethod
+    def open(cls, index_dir: Path, signature: str) -> Optional['CompiledIndex']:
+        """Open the snapshot for this signature, or None if it hasn't been built (or is unreadable)"""
+        directory = index_dir / signature
+        if not (directory / MANIFEST_FILE).exists():
+            return None
+        try:
+            index = cls(directory)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable search index {directory}: {str(e)}")
+            shutil.rmtree(directory, ignore_errors=True)
+            return None
+        if index.manifest.get('format_version') != INDEX_FORMAT_VERSION:
+            return None
+        return index
+
+    @classmethod
+    def build(cls, index_dir: Path, signature: str, venues: List[Dict], keyword_postings: KeywordPostings,
+              source_venue_ids: Optional[Dict[str, str]] = None,
+              venues_dir: Optional[Path] = None, prune: bool = True) -> 'CompiledIndex':
+        """
+        Compile venues + their keyword postings into a new snapshot and open it
+        (source_venue_ids: venue file name -> venue_id, kept for incremental directory syncs;
+        venues_dir: the directory the venues were read from, whose older snapshots are pruned
+        unless prune is False)
+        """
+        start = time.perf_counter()
+        index_dir.mkdir(exist_ok=True, parents=True)
+        tmp_dir = index_dir / f"{signature}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir()
+
+        keywords = keyword_postings.keywords
+        fuzzy_index = TrigramIndex(keywords)
+        columns = FilterColumns(venues)
+
+        def save_strings(name: str, strings: List[str]):
+            buffer, offsets, sorted_order = StringTable.pack(strings)
+            (tmp_dir / f"{name}.bin").write_bytes(buffer)
+            np.save(tmp_dir / f"{name}_offsets.npy", offsets)
+            if name in cls.SORTED_TABLES:
+                np.save(tmp_dir / f"{name}_sorted.npy", sorted_order)
+
+        save_strings('keywords', keywords)
+        save_strings('keys', fuzzy_index.keys)
+        save_strings('venue_ids', [venue['venue_id'] for venue in venues])
+        save_strings('venues', [json.dumps(venue, ensure_ascii=False) for venue in venues])
+
+        # keyword -> venue postings, grouped by keyword ordinal
+        np.save(tmp_dir / "pair_keywords.npy", keyword_postings.pair_keywords())
+        np.save(tmp_dir / "pair_venues.npy", keyword_postings.venues)
+        np.save(tmp_dir / "keyword_pair_offsets.npy", keyword_postings.offsets)
+
+        def save_trigram_index(prefix: str, index: TrigramIndex, lengths_name: str):
+            """Trigram postings flattened into CSR form"""
+            grams = list(index.postings.keys())
+            save_strings(f"{prefix}grams", grams)
+            gram_offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+            np.cumsum([len(index.postings[gram][0]) for gram in grams], out=gram_offsets[1:])
+            np.save(tmp_dir / f"{prefix}gram_offsets.npy", gram_offsets)
+            np.save(tmp_dir / f"{prefix}posting_ordinals.npy", np.concatenate(
+                [index.postings[gram][0] for gram in grams] or [np.zeros(0, dtype=np.int32)]))
+            np.save(tmp_dir / f"{prefix}posting_counts.npy", np.concatenate(
+                [index.postings[gram][1] for gram in grams] or [np.zeros(0, dtype=np.int32)]))
+            np.save(tmp_dir / f"{lengths_name}.npy", index.lengths)
+            np.save(tmp_dir / f"{prefix}length_order.npy", index._length_order)
+            np.save(tmp_dir / f"{prefix}sorted_lengths.npy", index._sorted_lengths)
+
+        save_trigram_index('', fuzzy_index, 'lengths')
+
+        # Location tokens (sorted vocabulary) -> venue postings
+        location_tokens, location_arrays = LocationIndex.build_arrays(venues)
+        save_strings('location_tokens', location_tokens)
+        for name, array in location_arrays.items():
+            np.save(tmp_dir / f"location_{name}.npy", array)
+
+        # Name / alias / keyword / location tokens -> venue postings with term frequencies
+        text_tokens, text_arrays = TextIndex.build_arrays(venues)
+        save_strings('text_tokens', text_tokens)
+        for name, array in text_arrays.items():
+            np.save(tmp_dir / f"text_{name}.npy", array)
+        save_trigram_index('text_', TrigramIndex(text_tokens), 'text_token_lengths')
+
+        # Name / alias completions ranked by popularity
+        completion_strings, completion_arrays = CompletionIndex.build_arrays(venues)
+        for name, strings in completion_strings.items():
+            save_strings(f"completion_{name}", strings)
+        for name, array in completion_arrays.items():
+            np.save(tmp_dir / f"completion_{name}.npy", array)
+
+        # Venue coordinates bucketed into grid cells
+        for name, array in GeoIndex.build_arrays(venues).items():
+            np.save(tmp_dir / f"geo_{name}.npy", array)
+
+        for name, array in columns.to_arrays().items():
+            np.save(tmp_dir / f"column_{name}.npy", array)
+
+        manifest = {
+            'format_version': INDEX_FORMAT_VERSION,
+            'signature': signature,
+            'built_at': time.time(),
+            'venue_count': len(venues),
+            'keyword_count': len(keywords),
+            'venue_type_codes': columns.venue_type_codes,
+            'source_venue_ids': source_venue_ids or {},
+            'venues_dir': str(venues_dir.resolve()) if venues_dir is not None else None
+        }
+        with open(tmp_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        # Publish atomically; if another process published the same snapshot first, keep theirs
+        directory = index_dir / signature
+        try:
+            os.rename(tmp_dir, directory)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        # Drop snapshots this one supersedes (processes still mapping them keep their open files).
+        # Engines over other venue directories share index_dir, so their snapshots are kept.
+        for stale in index_dir.iterdir() if prune else ():
+            if stale.is_dir() and stale.name != signature and '.tmp-' not in stale.name \
+                    and cls._superseded(stale, manifest['venues_dir']):
+                shutil.rmtree(stale, ignore_errors=True)
+
+        logger.info(f"Compiled search index {signature[:12]} in {time.perf_counter() - start:.2f}s")
+        return cls(directory)
+
+    @staticmethod
+    def _superseded(directory: Path, venues_dir: Optional[str]) -> bool:
+        """Whether a snapshot was built from venues_dir, or in a format no engine can open any more"""
+        try:
+            with open(directory / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if manifest.get('format_version') != INDEX_FORMAT_VERSION:
+            return True
+        return venues_dir is not None and manifest.get('venues_dir') == venues_dir
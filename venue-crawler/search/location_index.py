@@ -0,0 +1,156 @@
+"""
+Location Index - Tokenized inverted index over venue location text
+Area lookups walk the postings of matching (prefix) tokens instead of scanning every address
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import KOCHI_CONFIG
+from search.postings import merge_token_postings
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Posting weights: where in the venue's location the token appears
+PRIMARY = 2   # address, landmark, pin code
+NEARBY = 1    # accessibility.landmarks_nearby only
+
+LOCATION_SCORES = {PRIMARY: 90, NEARBY: 80}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def _phrases(tokens: List[str], areas: List[str]) -> List[str]:
+    """Known multi-word areas (KOCHI_CONFIG major_areas) occurring as consecutive tokens"""
+    text = f" {' '.join(tokens)} "
+    return [area for area in areas if f" {area} " in text]
+
+
+class LocationIndex:
+    """
+    Sorted token vocabulary with CSR postings (venue ordinals + PRIMARY/NEARBY weights)
+
+    Tokens are lowercase alphanumeric runs; multi-word major areas ("fort kochi", "marine drive")
+    are also indexed as single phrase tokens so they match as a unit. Since the vocabulary is
+    sorted, all tokens sharing a prefix are adjacent and so are their postings.
+
+    Venues added after the index was compiled live in a small overlay index whose ordinals
+    all follow the base ones, so merged postings stay ascending.
+    """
+
+    def __init__(self, tokens: Sequence[str], offsets: np.ndarray, venues: np.ndarray, weights: np.ndarray,
+                 overlay: Optional['LocationIndex'] = None):
+        self.tokens = tokens
+        self.offsets = np.asarray(offsets)
+        self.venues = np.asarray(venues)
+        self.weights = np.asarray(weights)
+        self.overlay = overlay
+
+    @staticmethod
+    def area_phrases() -> List[str]:
+        return [' '.join(tokenize(area)) for area in KOCHI_CONFIG.get('major_areas', [])]
+
+    @classmethod
+    def build_arrays(cls, venues: List[Dict]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """Returns: (sorted vocabulary, {'offsets', 'venues', 'weights'} arrays)"""
+        areas = [area for area in cls.area_phrases() if ' ' in area]
+        postings: Dict[str, Dict[int, int]] = {}
+
+        for ordinal, venue in enumerate(venues):
+            location = venue.get('location') or {}
+            accessibility = location.get('accessibility') or {}
+
+            primary = [tokenize(location.get('address')), tokenize(location.get('landmark')),
+                       tokenize(str(location.get('pin_code') or ''))]
+            nearby = [tokenize(landmark) for landmark in accessibility.get('landmarks_nearby') or []]
+
+            for weight, fields in ((NEARBY, nearby), (PRIMARY, primary)):
+                for tokens in fields:
+                    for token in tokens + _phrases(tokens, areas):
+                        venue_weights = postings.setdefault(token, {})
+                        venue_weights[ordinal] = max(venue_weights.get(ordinal, 0), weight)
+
+        vocabulary = sorted(postings)
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum([len(postings[token]) for token in vocabulary], out=offsets[1:])
+        venue_ordinals = np.array([o for token in vocabulary for o in postings[token]], dtype=np.int32)
+        weights = np.array([w for token in vocabulary for w in postings[token].values()], dtype=np.uint8)
+        return vocabulary, {'offsets': offsets, 'venues': venue_ordinals, 'weights': weights}
+
+    def extended(self, venues: List[Dict], start: int) -> 'LocationIndex':
+        """
+        Copy with venues, numbered from ordinal start (> every indexed ordinal), merged into the
+        overlay; only the new venues are tokenized, the base arrays are shared
+        """
+        vocabulary, arrays = self.build_arrays(venues)
+        arrays['venues'] = arrays['venues'] + start
+        if self.overlay is not None:
+            overlay = self.overlay
+            vocabulary, arrays['offsets'], (arrays['venues'], arrays['weights']) = merge_token_postings(
+                overlay.tokens, overlay.offsets, (overlay.venues, overlay.weights),
+                vocabulary, arrays['offsets'], (arrays['venues'], arrays['weights'])
+            )
+        overlay = LocationIndex(vocabulary, arrays['offsets'], arrays['venues'], arrays['weights'])
+        return LocationIndex(self.tokens, self.offsets, self.venues, self.weights, overlay)
+
+    def _prefix_postings(self, prefix: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(venue ordinals ascending, best weight) over every token starting with prefix"""
+        venues, weights = self._own_prefix_postings(prefix)
+        if self.overlay is not None:
+            overlay_venues, overlay_weights = self.overlay._prefix_postings(prefix)
+            venues, weights = np.concatenate([venues, overlay_venues]), np.concatenate([weights, overlay_weights])
+        return venues, weights
+
+    def _own_prefix_postings(self, prefix: str) -> Tuple[np.ndarray, np.ndarray]:
+        low = bisect_left(self.tokens, prefix)
+        high = bisect_left(self.tokens, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo=low)
+        start, end = int(self.offsets[low]), int(self.offsets[high])
+        venues, weights = self.venues[start:end], self.weights[start:end]
+        if high - low > 1:
+            # Several tokens share the prefix: keep each venue once, with its best weight
+            order = np.lexsort((-weights.astype(np.int16), venues))
+            venues, weights = venues[order], weights[order]
+            first = np.ones(len(venues), dtype=bool)
+            first[1:] = venues[1:] != venues[:-1]
+            venues, weights = venues[first], weights[first]
+        return venues, weights
+
+    def lookup(self, area: str, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Venues matching an area query: every query token must prefix-match one of the venue's
+        location tokens (a multi-word query that prefixes a major area matches that phrase)
+        Only venues passing mask (if given) are considered.
+        Returns: (venue ordinals ascending, scores)
+        """
+        tokens = tokenize(area)
+        if not tokens:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+
+        def postings(prefix: str) -> Tuple[np.ndarray, np.ndarray]:
+            venues, weights = self._prefix_postings(prefix)
+            if mask is not None:
+                keep = mask[venues]
+                venues, weights = venues[keep], weights[keep]
+            return venues, weights
+
+        venues, weights = postings(' '.join(tokens)) if len(tokens) > 1 else ([], [])
+
+        if not len(venues):
+            venues, weights = postings(tokens[0])
+            for token in tokens[1:]:
+                if not len(venues):
+                    break
+                other_venues, other_weights = postings(token)
+                venues, left, right = np.intersect1d(venues, other_venues, assume_unique=True, return_indices=True)
+                weights = np.minimum(weights[left], other_weights[right])
+
+        scores = np.where(weights >= PRIMARY, LOCATION_SCORES[PRIMARY], LOCATION_SCORES[NEARBY]).astype(np.int32)
+        return venues, scores
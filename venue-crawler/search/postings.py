@@ -0,0 +1,113 @@
+"""
+Keyword Postings - Sorted venue-ordinal postings per keyword, stored as flat NumPy arrays
+Built in one pass plus a sort (no per-venue list membership checks); supports AND / OR of keywords
+"""
+
+from array import array
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+
+EMPTY = np.zeros(0, dtype=np.int32)
+
+
+def intersect(postings: Sequence[np.ndarray]) -> np.ndarray:
+    """Venue ordinals present in every posting list (shortest lists first, stops once empty)"""
+    if not postings:
+        return EMPTY
+    ordered = sorted(postings, key=len)
+    result = ordered[0]
+    for posting in ordered[1:]:
+        if not len(result):
+            break
+        result = np.intersect1d(result, posting, assume_unique=True)
+    return result
+
+
+def union(postings: Sequence[np.ndarray]) -> np.ndarray:
+    """Venue ordinals present in any posting list, ascending"""
+    postings = [posting for posting in postings if len(posting)]
+    if not postings:
+        return EMPTY
+    if len(postings) == 1:
+        return postings[0]
+    return np.unique(np.concatenate(postings))
+
+
+def merge_token_postings(
+    tokens: Sequence[str], offsets: np.ndarray, columns: Sequence[np.ndarray],
+    added_tokens: Sequence[str], added_offsets: np.ndarray, added_columns: Sequence[np.ndarray]
+) -> Tuple[List[str], np.ndarray, List[np.ndarray]]:
+    """
+    Union of two CSR posting indexes over sorted token vocabularies (location / text overlays);
+    each token's added postings follow its existing ones, so ascending ordinals stay ascending
+    when every added ordinal is larger
+
+    Returns: (sorted vocabulary, offsets, merged columns)
+    """
+    vocabulary = sorted(set(tokens).union(added_tokens))
+    positions = {token: position for position, token in enumerate(tokens)}
+    added_positions = {token: position for position, token in enumerate(added_tokens)}
+    size = int(offsets[-1]) if len(offsets) else 0
+
+    merged_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    gather = []
+    for position, token in enumerate(vocabulary):
+        count = 0
+        for table, table_offsets, shift in ((positions, offsets, 0), (added_positions, added_offsets, size)):
+            ordinal = table.get(token)
+            if ordinal is not None:
+                start, end = int(table_offsets[ordinal]), int(table_offsets[ordinal + 1])
+                gather.append(np.arange(start + shift, end + shift))
+                count += end - start
+        merged_offsets[position + 1] = merged_offsets[position] + count
+
+    order = np.concatenate(gather) if gather else np.zeros(0, dtype=np.int64)
+    merged = [np.concatenate([column, added])[order] for column, added in zip(columns, added_columns)]
+    return vocabulary, merged_offsets, merged
+
+
+class KeywordPostings:
+    """
+    Keywords (first-seen order) with CSR postings: venues[offsets[k]:offsets[k + 1]] holds the
+    ascending, duplicate-free venue ordinals carrying keyword k
+    """
+
+    def __init__(self, keywords: List[str], offsets: np.ndarray, venues: np.ndarray):
+        self.keywords = keywords
+        self.offsets = offsets
+        self.venues = venues
+
+    @classmethod
+    def build(cls, venues: List[Dict], venue_keywords: Callable[[Dict], Iterable[str]]) -> 'KeywordPostings':
+        """
+        Postings for venues (ordinal = list position) from each venue's keywords
+
+        (keyword ordinal, venue ordinal) pairs are collected into flat arrays and sorted once,
+        so shared keywords carried by every venue cost O(n log n) instead of O(n^2).
+        """
+        keyword_ordinals: Dict[str, int] = {}
+        pair_keywords, pair_venues = array('I'), array('I')
+
+        for ordinal, venue in enumerate(venues):
+            for keyword in venue_keywords(venue):
+                pair_keywords.append(keyword_ordinals.setdefault(keyword, len(keyword_ordinals)))
+                pair_venues.append(ordinal)
+
+        # Sort by (keyword, venue) and drop repeats in one vectorized pass
+        pairs = np.unique(
+            np.frombuffer(pair_keywords, dtype=np.uint32).astype(np.int64) * max(len(venues), 1)
+            + np.frombuffer(pair_venues, dtype=np.uint32)
+        )
+        keywords_column = pairs // max(len(venues), 1)
+        offsets = np.searchsorted(keywords_column, np.arange(len(keyword_ordinals) + 1), side='left').astype(np.int64)
+        return cls(list(keyword_ordinals), offsets, (pairs % max(len(venues), 1)).astype(np.int32))
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def pair_keywords(self) -> np.ndarray:
+        """Keyword ordinal of every posting entry (parallel to venues)"""
+        return np.repeat(np.arange(len(self.keywords), dtype=np.int32), np.diff(self.offsets))
+
+    def posting(self, keyword_ordinal: int) -> np.ndarray:
+        return self.venues[self.offsets[keyword_ordinal]:self.offsets[keyword_ordinal + 1]]
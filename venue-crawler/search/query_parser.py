@@ -0,0 +1,60 @@
+"""
+Query Parser - Tokenizes free-text venue queries and extracts numeric intents
+"wedding venue for 300 guests under 1500 per plate" -> tokens + {min_capacity: 300, price_max: 1500}
+"""
+
+import re
+from typing import Dict, List, NamedTuple
+
+from search.location_index import tokenize
+
+STOPWORDS = frozenset([
+    'a', 'an', 'the', 'for', 'with', 'and', 'or', 'of', 'in', 'at', 'to', 'on', 'by', 'from',
+    'near', 'around', 'my', 'our', 'me', 'us', 'some', 'any', 'best', 'good', 'looking'
+])
+
+_GUESTS = r'(?:guests?|people|persons?|pax|attendees|heads|members|seats?|crowd)'
+_CURRENCY = r'(?:rs\.?|inr|₹)?\s*'
+_PER_PLATE = r'(?:/-)?\s*(?:per|a|/)\s*(?:plate|head|person)'
+
+# (pattern, filters built from its groups); the first matching capacity pattern wins
+CAPACITY_PATTERNS = [
+    (re.compile(rf'(?:between\s+)?(\d{{2,5}})\s*(?:-|to|and)\s*(\d{{2,5}})\s*{_GUESTS}'),
+     lambda low, high: {'min_capacity': min(int(low), int(high)), 'max_capacity': max(int(low), int(high))}),
+    (re.compile(rf'(?:up\s*to|upto|under|below|max(?:imum)?|at\s+most|less\s+than)\s+(\d{{2,5}})\s*{_GUESTS}'),
+     lambda high: {'max_capacity': int(high)}),
+    (re.compile(rf'(\d{{2,5}})\s*\+?\s*{_GUESTS}'),
+     lambda low: {'min_capacity': int(low)}),
+    (re.compile(r'capacity\s+(?:of\s+)?(\d{2,5})'),
+     lambda low: {'min_capacity': int(low)}),
+]
+
+PRICE_PATTERNS = [
+    (re.compile(rf'(?:up\s*to|upto|under|below|within|max(?:imum)?|less\s+than)\s+{_CURRENCY}(\d{{2,6}})\s*{_PER_PLATE}'),
+     lambda high: {'price_max': int(high)}),
+    (re.compile(rf'{_CURRENCY}(\d{{2,6}})\s*{_PER_PLATE}'),
+     lambda high: {'price_max': int(high)}),
+]
+
+
+class ParsedQuery(NamedTuple):
+    text: str               # query with the intent phrases removed
+    tokens: List[str]       # normalized search tokens (stopwords dropped)
+    filters: Dict           # filters implied by the query (same keys as search() filters)
+
+
+def parse_query(query: str) -> ParsedQuery:
+    """Split a free-text query into search tokens and capacity / price filters"""
+    text = query.lower()
+    filters: Dict = {}
+
+    for patterns in (CAPACITY_PATTERNS, PRICE_PATTERNS):
+        for pattern, build in patterns:
+            match = pattern.search(text)
+            if match:
+                filters.update(build(*match.groups()))
+                text = f"{text[:match.start()]} {text[match.end():]}"
+                break
+
+    tokens = [token for token in tokenize(text) if token not in STOPWORDS]
+    return ParsedQuery(' '.join(text.split()), tokens, filters)
@@ -0,0 +1,164 @@
+"""
+Query Planner - Chooses between fuzzy-first and filter-first execution
+Estimates filter selectivity from column statistics and compares rough plan costs
+"""
+
+from typing import Dict, NamedTuple
+import numpy as np
+
+from search.filter_columns import FilterColumns
+from search.fuzzy_index import TrigramIndex, qgrams, sort_key
+
+FUZZY_FIRST = 'fuzzy_first'    # trigram candidates -> score -> drop filtered venues
+FILTER_FIRST = 'filter_first'  # filter mask -> score only the surviving venues' keywords
+
+# Rough per-unit costs in microseconds (from benchmarks/fuzzy_index_benchmark.py)
+POSTING_COST = 0.01       # one trigram posting entry counted
+VERIFY_COST = 1.5         # one candidate keyword verified against the threshold
+SCORE_COST = 15.0         # one keyword scored by fuzzywuzzy's token_sort_ratio
+MASK_COST = 0.005         # one venue evaluated by the vectorized filter mask
+CANDIDATE_RATIO = 0.1     # share of touched keywords expected to survive the trigram bound
+
+
+class QueryPlan(NamedTuple):
+    name: str
+    estimates: Dict
+
+
+class QueryPlanner:
+    """Cost-based choice of execution order using index statistics"""
+
+    def __init__(self, filter_columns: FilterColumns, fuzzy_index: TrigramIndex, pair_count: int):
+        self._set_sources(filter_columns, fuzzy_index, pair_count)
+
+        # Statistics: sorted values for range estimates, counts for equality/boolean filters
+        self.sorted_space_guests = np.sort(filter_columns.space_max_guests)
+        priced = filter_columns.per_plate_cost_max[~np.isnan(filter_columns.per_plate_cost_max)]
+        self.sorted_prices = np.sort(priced)
+        self._counts = self._column_counts(filter_columns, 0)
+        self._set_shares()
+
+    def _set_sources(self, filter_columns: FilterColumns, fuzzy_index: TrigramIndex, pair_count: int):
+        self.columns = filter_columns
+        self.fuzzy_index = fuzzy_index
+        self.venue_count = filter_columns.size
+        self.keyword_count = len(fuzzy_index)
+        self.keywords_per_venue = pair_count / max(self.venue_count, 1)
+
+    @staticmethod
+    def _column_counts(filter_columns: FilterColumns, start: int) -> Dict:
+        """Boolean / venue type counts over the venues from ordinal start on"""
+        venue_types = np.bincount(filter_columns.venue_type[start:], minlength=len(filter_columns.venue_type_codes))
+        return {
+            'catering': int(filter_columns.in_house_catering[start:].sum()),
+            'parking': int((filter_columns.parking_capacity[start:] >= 1).sum()),
+            'accommodation': int(filter_columns.accommodation_available[start:].sum()),
+            'venue_types': venue_types
+        }
+
+    def _set_shares(self):
+        venue_count = max(self.venue_count, 1)
+        self.spaces_per_venue = len(self.sorted_space_guests) / venue_count
+        self.unpriced_share = 1.0 - len(self.sorted_prices) / venue_count
+        self.catering_share = self._counts['catering'] / venue_count
+        self.parking_share = self._counts['parking'] / venue_count
+        self.accommodation_share = self._counts['accommodation'] / venue_count
+        self.venue_type_share = {
+            name: float(self._counts['venue_types'][code]) / venue_count
+            for name, code in self.columns.venue_type_codes.items()
+        }
+
+    def extended(self, filter_columns: FilterColumns, fuzzy_index: TrigramIndex, pair_count: int) -> 'QueryPlanner':
+        """
+        Planner for columns that extend this planner's columns with appended venues: only the
+        appended venues' values are merged into the statistics (counts include tombstoned
+        venues, as they do for the columns themselves)
+        """
+        start, space_start = self.venue_count, len(self.columns.space_max_guests)
+        planner = QueryPlanner.__new__(QueryPlanner)
+        planner._set_sources(filter_columns, fuzzy_index, pair_count)
+
+        guests = np.sort(filter_columns.space_max_guests[space_start:])
+        planner.sorted_space_guests = np.insert(
+            self.sorted_space_guests, np.searchsorted(self.sorted_space_guests, guests, side='right'), guests
+        )
+        prices = filter_columns.per_plate_cost_max[start:]
+        prices = np.sort(prices[~np.isnan(prices)])
+        planner.sorted_prices = np.insert(
+            self.sorted_prices, np.searchsorted(self.sorted_prices, prices, side='right'), prices
+        )
+
+        added = self._column_counts(filter_columns, start)
+        venue_types = added['venue_types']
+        venue_types[:len(self._counts['venue_types'])] += self._counts['venue_types']
+        planner._counts = {
+            'catering': self._counts['catering'] + added['catering'],
+            'parking': self._counts['parking'] + added['parking'],
+            'accommodation': self._counts['accommodation'] + added['accommodation'],
+            'venue_types': venue_types
+        }
+        planner._set_shares()
+        return planner
+
+    def _range_share(self, sorted_values: np.ndarray, low: float, high: float) -> float:
+        if not len(sorted_values):
+            return 0.0
+        inside = np.searchsorted(sorted_values, high, side='right') - np.searchsorted(sorted_values, low, side='left')
+        return inside / len(sorted_values)
+
+    def estimate_selectivity(self, filters: Dict) -> float:
+        """Estimated share of venues passing the filters (independence assumption)"""
+        selectivity = 1.0
+
+        if 'min_capacity' in filters or 'max_capacity' in filters:
+            space_share = self._range_share(
+                self.sorted_space_guests, filters.get('min_capacity', 0), filters.get('max_capacity', float('inf'))
+            )
+            # P(at least one of the venue's spaces fits)
+            selectivity *= (1.0 - (1.0 - space_share) ** max(self.spaces_per_venue, 1.0)) if space_share else 0.0
+
+        if 'has_kitchen' in filters:
+            selectivity *= self.catering_share
+
+        if 'has_parking' in filters:
+            selectivity *= self.parking_share
+
+        if 'has_accommodation' in filters and filters['has_accommodation']:
+            selectivity *= self.accommodation_share
+
+        if 'venue_type' in filters:
+            selectivity *= self.venue_type_share.get(filters['venue_type'], 0.0)
+
+        if 'price_max' in filters:
+            priced_share = self._range_share(self.sorted_prices, -np.inf, filters['price_max'])
+            selectivity *= self.unpriced_share + (1.0 - self.unpriced_share) * priced_share
+
+        return selectivity
+
+    def posting_volume(self, query: str) -> int:
+        """Trigram posting entries the fuzzy-first plan would touch"""
+        postings = self.fuzzy_index.postings
+        return sum(len(postings[gram][0]) for gram in qgrams(sort_key(query)) if gram in postings)
+
+    def choose(self, query: str, filters: Dict) -> QueryPlan:
+        """Pick the cheaper plan for a query and its filters"""
+        if not filters:
+            return QueryPlan(FUZZY_FIRST, {'reason': 'no filters'})
+
+        selectivity = self.estimate_selectivity(filters)
+        surviving_keywords = min(self.keyword_count, selectivity * self.venue_count * self.keywords_per_venue)
+        volume = self.posting_volume(query)
+
+        fuzzy_first_cost = volume * POSTING_COST + min(volume, self.keyword_count) * CANDIDATE_RATIO * VERIFY_COST
+        filter_first_cost = self.venue_count * MASK_COST + surviving_keywords * SCORE_COST
+
+        estimates = {
+            'selectivity': round(selectivity, 4),
+            'estimated_venues': round(selectivity * self.venue_count, 1),
+            'estimated_keywords': round(surviving_keywords, 1),
+            'posting_volume': volume,
+            'cost_fuzzy_first_us': round(fuzzy_first_cost, 1),
+            'cost_filter_first_us': round(filter_first_cost, 1)
+        }
+        name = FILTER_FIRST if filter_first_cost < fuzzy_first_cost else FUZZY_FIRST
+        return QueryPlan(name, estimates)
@@ -0,0 +1,222 @@
+"""
+Search Result Cache - Bounded LRU/TTL cache of ranked hits, keyed per index version
+In-process by default; the SQLite backend lets several worker processes share one cache
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    RESULT_CACHE_BACKEND, RESULT_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS, RESULT_CACHE_DB
+)
+from search.results import VenueHit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_cache (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_result_cache_accessed ON result_cache (accessed_at);
+"""
+
+
+class CacheBackend:
+    """
+    Storage behind ResultCache. Values are JSON-serializable; backends enforce the entry bound
+    and TTL and count their own evictions (capacity) and expirations (TTL).
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, version: str):
+        raise NotImplementedError
+
+    def drop_other_versions(self, version: str):
+        """Forget entries written for any other index version"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process OrderedDict LRU with expiry timestamps"""
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS):
+        super().__init__(max_entries, ttl_seconds)
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, version, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key: str, value: Any, version: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def drop_other_versions(self, version: str):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[1] != version]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache table in a SQLite file (WAL) that every worker on the host can open"""
+
+    def __init__(self, db_path: Path = RESULT_CACHE_DB, max_entries: int = RESULT_CACHE_SIZE,
+                 ttl_seconds: float = RESULT_CACHE_TTL_SECONDS):
+        super().__init__(max_entries, ttl_seconds)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM result_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+                self.expirations += 1
+                return None
+            self._conn.execute("UPDATE result_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, version: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, version, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, version, json.dumps(value), now + self.ttl_seconds, now)
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM result_cache WHERE key IN (SELECT key FROM result_cache ORDER BY accessed_at LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+
+    def drop_other_versions(self, version: str):
+        # Other workers may still serve the previous version during a reload, so rows of other
+        # versions are left to age out (they can never be hit under this version's keys);
+        # only already-expired rows are purged here
+        with self._lock:
+            purged = self._conn.execute(
+                "DELETE FROM result_cache WHERE version != ? AND expires_at < ?", (version, time.time())
+            ).rowcount
+            self.expirations += purged
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0]
+
+
+def create_backend(name: str = RESULT_CACHE_BACKEND) -> Optional[CacheBackend]:
+    """Backend for RESULT_CACHE_BACKEND: memory | sqlite | none"""
+    if name == 'memory':
+        return MemoryCacheBackend()
+    if name == 'sqlite':
+        return SQLiteCacheBackend()
+    if name == 'none':
+        return None
+    raise ValueError(f"Unknown result cache backend: {name}")
+
+
+class ResultCache:
+    """
+    Ranked (ordinal, VenueHit) lists keyed on index version + normalized query, filters and
+    max_results. Only the ranking is cached; documents still come from the document store.
+
+    Every key embeds the index version, so a rebuilt or patched index can never be served
+    stale hits; when the version changes, entries for older versions are dropped as well.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(version: str, kind: str, query: str, filters: Optional[Dict], max_results: int) -> str:
+        # Case and runs of whitespace don't change results (queries are normalized before running)
+        query = ' '.join(query.lower().split())
+        payload = json.dumps([version, kind, query, filters or {}, max_results], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _check_version(self, version: str):
+        with self._lock:
+            if version == self._version:
+                return
+            self._version = version
+        self.backend.drop_other_versions(version)
+
+    def get(self, version: str, key: str) -> Optional[List[Tuple[int, VenueHit]]]:
+        self._check_version(version)
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return [(ordinal, VenueHit(*fields)) for ordinal, *fields in value]
+
+    def set(self, version: str, key: str, hits: Sequence[Tuple[int, VenueHit]]):
+        self._check_version(version)
+        self.backend.set(key, [[ordinal, *hit] for ordinal, hit in hits], version)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'entries': len(self.backend),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.backend.evictions,
+            'expirations': self.backend.expirations
+        }
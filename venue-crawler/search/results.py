@@ -0,0 +1,57 @@
+"""
+Search Results - Lightweight hit objects and field projection
+Ranking works on hits (id + score); full documents are only touched for the returned top-k
+"""
+
+import heapq
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class VenueHit(NamedTuple):
+    """One ranked match, without the venue document"""
+    venue_id: str
+    match_score: int
+    match_type: str                         # exact | fuzzy | location | nearby | text
+    matched_keyword: Optional[str] = None   # fuzzy matches only
+    distance_km: Optional[float] = None     # nearby matches only
+
+    def match_info(self) -> Dict:
+        """The match keys search() adds to each result dict"""
+        info = {'match_score': self.match_score, 'match_type': self.match_type}
+        if self.matched_keyword is not None:
+            info['matched_keyword'] = self.matched_keyword
+        if self.distance_km is not None:
+            info['distance_km'] = self.distance_km
+        return info
+
+
+def top_hits(hits: Iterable[Tuple[int, VenueHit]], max_results: int) -> List[Tuple[int, VenueHit]]:
+    """
+    Highest-scoring (ordinal, hit) pairs, best first, via a bounded heap
+
+    heapq.nlargest is stable, so ties keep their match order exactly like a full sort + slice.
+    """
+    return heapq.nlargest(max_results, hits, key=lambda item: item[1].match_score)
+
+
+def project(document: Dict, fields: Sequence[str]) -> Dict:
+    """
+    Copy only the requested fields of a venue document
+
+    Fields are dotted paths ('basic_info.official_name', 'location.address'); nesting is kept,
+    so projected results read the same way as full ones. Missing paths are skipped.
+    """
+    projected: Dict = {}
+    for field in fields:
+        parts = field.split('.')
+        value = document
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return projected
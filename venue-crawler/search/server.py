@@ -0,0 +1,345 @@
+"""
+Venue Search Server - Resident aiohttp service that keeps one VenueSearchEngine and its index warm
+JSON endpoints for search, by-id, by-location, batch, autocomplete, hot reload and health checks
+"""
+
+import json
+import math
+import time
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from aiohttp import web
+from loguru import logger
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    VENUES_DIR, SEARCH_INDEX_DIR, SEARCH_SERVER_HOST, SEARCH_SERVER_PORT, SEARCH_SERVER_WORKERS,
+    SEARCH_SERVER_WATCH, INDEX_WATCH_INTERVAL_SECONDS, FUZZY_MATCH_THRESHOLD
+)
+from search.venue_search import VenueSearchEngine
+
+MAX_RESULTS_LIMIT = 100     # per request, whatever max_results asks for
+MAX_BATCH_QUERIES = 1000    # queries per /batch request
+
+# Filter keys of the Next.js app (VenueSearchFilters in src/lib/venue-search.ts) by value type;
+# the engine's near / radius_km geo filter is accepted as well
+NUMBER_FILTERS = ('min_capacity', 'max_capacity', 'price_max')
+BOOLEAN_FILTERS = ('has_kitchen', 'has_parking', 'has_accommodation')
+STRING_FILTERS = ('venue_type',)
+
+
+def _dumps(data) -> str:
+    # Index columns are NumPy arrays; scalars taken from them may reach a response
+    return json.dumps(data, default=lambda value: value.item() if hasattr(value, 'item') else str(value))
+
+
+def _json(data, status: int = 200) -> web.Response:
+    return web.json_response(data, status=status, dumps=_dumps)
+
+
+def _error(message: str, status: int) -> web.Response:
+    return _json({'success': False, 'error': message}, status=status)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _limit(value, default: int = 10) -> int:
+    """max_results from a request, clamped to 1..MAX_RESULTS_LIMIT (400 if not a number)"""
+    try:
+        return max(1, min(int(value if value is not None else default), MAX_RESULTS_LIMIT))
+    except (ValueError, TypeError):
+        raise _bad_request('max_results must be a number')
+
+
+class SearchService:
+    """
+    Owns the warm engine and the thread pool searches run in
+
+    Searches are CPU-bound and release the GIL in NumPy / rapidfuzz, so handlers hand them to
+    the pool and the event loop keeps accepting requests. A reload either syncs changed venue
+    files into the live engine (copy-on-write snapshot) or compiles a fresh engine and swaps it
+    in; requests already running finish on the engine they started with.
+    """
+
+    def __init__(self, venues_directory: Path = VENUES_DIR, index_directory: Path = SEARCH_INDEX_DIR,
+                 workers: int = SEARCH_SERVER_WORKERS, engine: Optional[VenueSearchEngine] = None):
+        self.venues_dir = venues_directory
+        self.index_dir = index_directory
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='venue-search')
+        self.engine: Optional[VenueSearchEngine] = engine
+        self.load_seconds = 0.0
+        self.loaded_at: Optional[float] = time.time() if engine is not None else None
+        self.started_at = time.time()
+        self._reload_lock = asyncio.Lock()
+        self._watch_stop = None
+
+    def _load(self, rebuild: bool = False) -> VenueSearchEngine:
+        start = time.perf_counter()
+        engine = VenueSearchEngine(self.venues_dir, self.index_dir, rebuild_index=rebuild)
+        self.load_seconds = time.perf_counter() - start
+        self.loaded_at = time.time()
+        logger.success(f"✓ Search engine loaded in {self.load_seconds:.2f}s ({engine.get_venue_count()} venues)")
+        return engine
+
+    async def run(self, function: Callable, *args, **kwargs):
+        """Call function(*args, **kwargs) in the search thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    async def start(self, watch: bool = False):
+        if self.engine is None:
+            self.engine = await self.run(self._load)
+        if watch:
+            self._watch_stop = self.engine.watch(INDEX_WATCH_INTERVAL_SECONDS)
+
+    async def reload(self, rebuild: bool = False) -> Dict:
+        """Sync changed venue files into the engine, or (rebuild) compile and swap in a fresh one"""
+        async with self._reload_lock:
+            if not rebuild:
+                synced = await self.run(self.engine.sync_directory)
+                return {'mode': 'sync', 'synced_files': synced}
+
+            engine = await self.run(self._load, True)
+            previous, self.engine = self.engine, engine
+            if self._watch_stop is not None:
+                self._watch_stop.set()
+                self._watch_stop = engine.watch(INDEX_WATCH_INTERVAL_SECONDS)
+            logger.info(f"Swapped index {previous.index_version} -> {engine.index_version}")
+            return {'mode': 'rebuild', 'load_seconds': round(self.load_seconds, 3)}
+
+    def health(self) -> Dict:
+        engine = self.engine
+        index_files = [path for path in engine.index.directory.iterdir() if path.is_file()]
+        return {
+            'status': 'ok',
+            'venue_count': engine.get_venue_count(),
+            'keyword_count': len(engine.keywords),
+            'index_version': engine.index_version,
+            'index_bytes': sum(path.stat().st_size for path in index_files),
+            'load_seconds': round(self.load_seconds, 3),
+            'loaded_at': self.loaded_at,
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'cache': engine.cache_stats()
+        }
+
+    def close(self):
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+        self.executor.shutdown(wait=False)
+
+
+# ============================================
+# HANDLERS
+# ============================================
+
+def _bad_request(message: str) -> web.HTTPBadRequest:
+    return web.HTTPBadRequest(text=_dumps({'success': False, 'error': message}), content_type='application/json')
+
+
+async def _body(request: web.Request) -> Dict:
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise _bad_request('Body must be JSON')
+    if not isinstance(body, dict):
+        raise _bad_request('Body must be a JSON object')
+    return body
+
+
+def _is_point(value) -> bool:
+    """An area name, a [latitude, longitude] pair or a {'latitude', 'longitude'} object"""
+    if isinstance(value, dict):
+        value = [value.get('latitude'), value.get('longitude')]
+    return isinstance(value, str) or (isinstance(value, list) and len(value) == 2 and all(map(_is_number, value)))
+
+
+def _filters(body: Dict) -> Optional[Dict]:
+    """
+    Type-checked filters of a request body. Unset Next.js filters (null / false / 0 / "") are
+    dropped, as its in-process search ignores them; the engine would require a kitchen for
+    has_kitchen: false
+    """
+    filters = body.get('filters')
+    if filters is None:
+        return None
+    if not isinstance(filters, dict):
+        raise _bad_request('filters must be an object')
+
+    for key, value in filters.items():
+        if key in NUMBER_FILTERS or key == 'radius_km':
+            valid, kind = _is_number(value), 'a number'
+        elif key in BOOLEAN_FILTERS:
+            valid, kind = isinstance(value, bool), 'a boolean'
+        elif key in STRING_FILTERS:
+            valid, kind = isinstance(value, str), 'a string'
+        elif key == 'near':
+            valid, kind = _is_point(value), 'an area or a [latitude, longitude] point'
+        else:
+            raise _bad_request(f"Unknown filter: {key}")
+        if value is not None and not valid:
+            raise _bad_request(f"filters.{key} must be {kind}")
+
+    nextjs_filters = NUMBER_FILTERS + BOOLEAN_FILTERS + STRING_FILTERS
+    return {key: value for key, value in filters.items()
+            if value is not None and (value or key not in nextjs_filters)}
+
+
+async def _resolve_near(service: 'SearchService', filters: Optional[Dict]) -> Optional[Dict]:
+    """filters with an area name in near replaced by its point (400 for an unknown area)"""
+    if not filters or not isinstance(filters.get('near'), str):
+        return filters
+    try:
+        point = await service.run(service.engine.resolve_point, filters['near'])
+    except ValueError as e:
+        raise _bad_request(str(e))
+    return {**filters, 'near': list(point)}
+
+
+def _fields(body: Dict) -> Optional[List[str]]:
+    fields = body.get('fields')
+    if fields is not None and not (isinstance(fields, list) and all(isinstance(field, str) for field in fields)):
+        raise _bad_request('fields must be a list of strings')
+    return fields
+
+
+async def handle_search(request: web.Request) -> web.Response:
+    """POST /search {query, filters?, max_results?, fields?, mode?: keyword | text}"""
+    body = await _body(request)
+    query = body.get('query')
+    if not query or not isinstance(query, str):
+        return _error('Query is required and must be a string', 400)
+    filters, fields = _filters(body), _fields(body)
+
+    service: SearchService = request.app['service']
+    search = service.engine.search_text if body.get('mode') == 'text' else service.engine.search
+    max_results = _limit(body.get('max_results'))
+    results = await service.run(search, query, await _resolve_near(service, filters), max_results, fields)
+    return _json({'success': True, 'query': query, 'filters': filters, 'count': len(results), 'results': results})
+
+
+async def handle_venue(request: web.Request) -> web.Response:
+    """GET /venues/{venue_id}"""
+    service: SearchService = request.app['service']
+    venue = await service.run(service.engine.get_venue_by_id, request.match_info['venue_id'])
+    if venue is None:
+        return _error(f"Venue not found: {request.match_info['venue_id']}", 404)
+    return _json({'success': True, 'venue': venue})
+
+
+async def handle_location(request: web.Request) -> web.Response:
+    """GET /location?area=...&max_results=..."""
+    area = request.query.get('area')
+    if not area:
+        return _error('area is required', 400)
+
+    service: SearchService = request.app['service']
+    results = await service.run(service.engine.search_by_location, area, _limit(request.query.get('max_results')))
+    return _json({'success': True, 'area': area, 'count': len(results), 'results': results})
+
+
+async def handle_autocomplete(request: web.Request) -> web.Response:
+    """GET /autocomplete?q=...&max_results=..."""
+    prefix = request.query.get('q', '')
+    service: SearchService = request.app['service']
+    completions = await service.run(service.engine.autocomplete, prefix, _limit(request.query.get('max_results')))
+    return _json({'success': True, 'prefix': prefix, 'completions': completions})
+
+
+async def handle_batch(request: web.Request) -> web.Response:
+    """POST /batch {queries, filters?, max_results?, threshold?} -> top (venue_id, score) per query"""
+    body = await _body(request)
+    queries = body.get('queries')
+    if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+        return _error('queries must be a list of strings', 400)
+    if len(queries) > MAX_BATCH_QUERIES:
+        return _error(f"At most {MAX_BATCH_QUERIES} queries per batch", 400)
+    filters = _filters(body)
+    max_results = _limit(body.get('max_results'))
+    threshold = body.get('threshold', FUZZY_MATCH_THRESHOLD)
+    if not _is_number(threshold):
+        raise _bad_request('threshold must be a number')
+
+    service: SearchService = request.app['service']
+    batch = await service.run(service.engine.search_many, queries, await _resolve_near(service, filters))
+    results = [
+        {'query': query,
+         'matches': [{'venue_id': venue_id, 'match_score': score}
+                     for venue_id, score in batch.top(i, max_results, int(threshold))]}
+        for i, query in enumerate(batch.queries)
+    ]
+    return _json({'success': True, 'count': len(results), 'results': results})
+
+
+async def handle_reload(request: web.Request) -> web.Response:
+    """POST /reload {rebuild?: bool}"""
+    body = await _body(request) if request.can_read_body else {}
+    service: SearchService = request.app['service']
+    result = await service.reload(rebuild=bool(body.get('rebuild')))
+    return _json({'success': True, **result, 'index_version': service.engine.index_version})
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    """GET /health"""
+    service: SearchService = request.app['service']
+    return _json(await service.run(service.health))
+
+
+@web.middleware
+async def error_middleware(request: web.Request, handler):
+    try:
+        return await handler(request)
+    except web.HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"{request.method} {request.path} failed: {str(e)}")
+        return _error('Internal server error', 500)
+
+
+def create_app(service: Optional[SearchService] = None, watch: bool = False) -> web.Application:
+    """aiohttp application serving a SearchService (loaded on startup if it has no engine yet)"""
+    app = web.Application(middlewares=[error_middleware])
+    app['service'] = service if service is not None else SearchService()
+
+    async def on_startup(app: web.Application):
+        await app['service'].start(watch=watch)
+
+    async def on_cleanup(app: web.Application):
+        app['service'].close()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post('/search', handle_search)
+    app.router.add_get('/venues/{venue_id}', handle_venue)
+    app.router.add_get('/location', handle_location)
+    app.router.add_get('/autocomplete', handle_autocomplete)
+    app.router.add_post('/batch', handle_batch)
+    app.router.add_post('/reload', handle_reload)
+    app.router.add_get('/health', handle_health)
+    return app
+
+
+def run_server(host: str = SEARCH_SERVER_HOST, port: int = SEARCH_SERVER_PORT, socket_path: Optional[str] = None,
+               watch: bool = SEARCH_SERVER_WATCH):
+    """Serve until interrupted, over TCP or (socket_path) a Unix socket"""
+    app = create_app(watch=watch)
+    if socket_path:
+        logger.info(f"Venue search server listening on unix:{socket_path}")
+        web.run_app(app, path=socket_path, print=None)
+    else:
+        logger.info(f"Venue search server listening on http://{host}:{port}")
+        web.run_app(app, host=host, port=port, print=None)
+
+
+# ============================================
+# EXAMPLE USAGE & TESTING
+# ============================================
+
+if __name__ == "__main__":
+    run_server()
@@ -0,0 +1,201 @@
+"""
+Index Snapshot - Immutable view of the search index plus incremental venue changes
+Adds, updates and removals produce a new snapshot (copy-on-write) instead of a full rebuild
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+from search.fuzzy_index import TrigramIndex, sort_key
+from search.filter_columns import FilterColumns
+from search.location_index import LocationIndex
+from search.geo_index import GeoIndex
+from search.text_index import TextIndex
+from search.autocomplete import CompletionIndex
+from search.query_planner import QueryPlanner
+from search.index_store import CompiledIndex, DocumentStore, ExtendedTable
+from search.postings import EMPTY, KeywordPostings
+
+
+def _extend(table: Sequence[str], strings: List[str]) -> ExtendedTable:
+    return table.extended(strings) if isinstance(table, ExtendedTable) else ExtendedTable(table, tuple(strings))
+
+
+class LiveDocuments(Sequence):
+    """The documents of the live venue ordinals, decoded as they are read"""
+
+    def __init__(self, documents: Sequence[Dict], ordinals: np.ndarray):
+        self.documents = documents
+        self.ordinals = ordinals
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.documents[ordinal] for ordinal in self.ordinals[position].tolist()]
+        return self.documents[int(self.ordinals[position])]
+
+
+class IndexSnapshot:
+    """
+    Everything one query reads, frozen together
+
+    An update never modifies a snapshot: changed and added venues are appended as new
+    ordinals (their keywords, columns, location tokens and coordinates merged into copies of
+    the touched structures, untouched arrays shared), replaced or removed ordinals are
+    tombstoned in the live mask, and the engine swaps in the result. Queries running against
+    the previous snapshot finish on it unaffected.
+    """
+
+    def __init__(self, **fields):
+        self.version: str = fields['version']
+        self.generation: int = fields['generation']
+        self.documents: DocumentStore = fields['documents']
+        self.venue_ids: Sequence[str] = fields['venue_ids']
+        self.keywords: Sequence[str] = fields['keywords']
+        self.fuzzy_index: TrigramIndex = fields['fuzzy_index']
+        self.filter_columns: FilterColumns = fields['filter_columns']
+        self.location_index: LocationIndex = fields['location_index']
+        self.geo_index: GeoIndex = fields['geo_index']
+        self.text_index: TextIndex = fields['text_index']
+        self.completion_index: CompletionIndex = fields['completion_index']
+
+        # (keyword ordinal, venue ordinal) pairs; the compiled ones are grouped by keyword
+        # (keyword_pair_offsets), pairs added since are also kept per keyword in extra_keyword_venues
+        self.pair_keywords: np.ndarray = fields['pair_keywords']
+        self.pair_venues: np.ndarray = fields['pair_venues']
+        self.keyword_pair_offsets: np.ndarray = fields['keyword_pair_offsets']
+        self.extra_keyword_venues: Dict[int, np.ndarray] = fields['extra_keyword_venues']
+
+        self.live: Optional[np.ndarray] = fields['live']            # None = every ordinal is live
+        self.id_ordinals: Dict[str, int] = fields['id_ordinals']    # venue_id -> ordinal (-1 = removed) since compile
+
+        # Column / posting statistics for choosing fuzzy-first vs filter-first execution
+        self.planner: QueryPlanner = fields.get('planner') or QueryPlanner(
+            self.filter_columns, self.fuzzy_index, len(self.pair_keywords)
+        )
+
+    @classmethod
+    def from_index(cls, index: CompiledIndex, generation: int = 0) -> 'IndexSnapshot':
+        arrays = index.arrays
+        return cls(
+            version=index.signature,
+            generation=generation,
+            documents=index.documents,
+            venue_ids=index.venue_ids,
+            keywords=index.keywords,
+            fuzzy_index=index.fuzzy_index(),
+            filter_columns=index.filter_columns(),
+            location_index=index.location_index(),
+            geo_index=index.geo_index(),
+            text_index=index.text_index(),
+            completion_index=index.completion_index(),
+            pair_keywords=arrays['pair_keywords'],
+            pair_venues=arrays['pair_venues'],
+            keyword_pair_offsets=arrays['keyword_pair_offsets'],
+            extra_keyword_venues={},
+            live=None,
+            id_ordinals={}
+        )
+
+    def ordinal(self, venue_id: str) -> int:
+        """Live ordinal of a venue, or -1"""
+        ordinal = self.id_ordinals.get(venue_id)
+        return ordinal if ordinal is not None else self.venue_ids.index(venue_id)
+
+    def keyword_venues(self, keyword_ordinal: int) -> np.ndarray:
+        """Venue ordinals carrying a keyword, ascending (replaced / removed ones included)"""
+        offsets = self.keyword_pair_offsets
+        venues = EMPTY
+        if keyword_ordinal < len(offsets) - 1:
+            venues = self.pair_venues[offsets[keyword_ordinal]:offsets[keyword_ordinal + 1]]
+        extra = self.extra_keyword_venues.get(keyword_ordinal)
+        # Added venues' ordinals all follow the compiled ones, so this stays sorted
+        return venues if extra is None else np.concatenate([venues, extra])
+
+    def live_ordinals(self) -> np.ndarray:
+        return np.arange(len(self.documents)) if self.live is None else np.flatnonzero(self.live)
+
+    def live_documents(self) -> Sequence[Dict]:
+        return self.documents if self.live is None else LiveDocuments(self.documents, self.live_ordinals())
+
+    def live_count(self) -> int:
+        return len(self.documents) if self.live is None else int(self.live.sum())
+
+    def patch_count(self) -> int:
+        """Venues appended plus ordinals tombstoned since compile (what compaction would reclaim)"""
+        tombstoned = 0 if self.live is None else int((~self.live).sum())
+        return len(self.documents.appended) + tombstoned
+
+    def patched(self, upserts: List[Dict], removals: Iterable[str],
+                keyword_postings: Callable[[List[Dict]], KeywordPostings]) -> 'IndexSnapshot':
+        """
+        New snapshot with upserts (added or replaced venues, by venue_id) and removals applied
+
+        Args:
+            keyword_postings: Builds keyword postings for a list of venues
+                (VenueSearchEngine._build_keyword_postings), so added venues are indexed the same way
+        """
+        start = len(self.documents)
+        id_ordinals = dict(self.id_ordinals)
+        live = np.ones(start, dtype=bool) if self.live is None else self.live.copy()
+
+        # One document per venue_id (the last upsert wins), after tombstoning the ordinal it replaces
+        upserts = list({venue['venue_id']: venue for venue in upserts}.values())
+        for venue_id in [venue['venue_id'] for venue in upserts] + list(removals):
+            ordinal = self.ordinal(venue_id)
+            if ordinal >= 0:
+                live[ordinal] = False
+            id_ordinals[venue_id] = -1
+
+        new_ordinals = {venue['venue_id']: ordinal for ordinal, venue in enumerate(upserts, start)}
+        id_ordinals.update(new_ordinals)
+        live = np.concatenate([live, np.ones(len(upserts), dtype=bool)])
+
+        # Keywords: existing ones gain postings, unseen ones get new keyword ordinals
+        keywords_added: List[str] = []
+        extra_keyword_venues = dict(self.extra_keyword_venues)
+        pair_keywords, pair_venues = [], []
+        added = keyword_postings(upserts)
+        for position, keyword in enumerate(added.keywords):
+            keyword_ordinal = self.keywords.index(keyword)
+            if keyword_ordinal < 0:
+                keyword_ordinal = len(self.keywords) + len(keywords_added)
+                keywords_added.append(keyword)
+
+            venue_ordinals = added.posting(position) + start
+            previous = extra_keyword_venues.get(keyword_ordinal)
+            extra_keyword_venues[keyword_ordinal] = (
+                venue_ordinals if previous is None else np.concatenate([previous, venue_ordinals])
+            )
+            pair_keywords.extend([keyword_ordinal] * len(venue_ordinals))
+            pair_venues.extend(venue_ordinals.tolist())
+
+        keywords = _extend(self.keywords, keywords_added)
+        keys = _extend(self.fuzzy_index.keys, [sort_key(keyword) for keyword in keywords_added])
+        fuzzy_index = self.fuzzy_index.extended(keywords, keys)
+        filter_columns = self.filter_columns.extended(upserts)
+        pair_keywords = np.concatenate([self.pair_keywords, np.array(pair_keywords, dtype=self.pair_keywords.dtype)])
+
+        # Only the upserted venues are indexed: the overlays and statistics merge them in
+        return IndexSnapshot(
+            version=f"{self.version.split('+')[0]}+{self.generation + 1}",
+            generation=self.generation + 1,
+            documents=self.documents.extended(upserts),
+            venue_ids=_extend(self.venue_ids, [venue['venue_id'] for venue in upserts]),
+            keywords=keywords,
+            fuzzy_index=fuzzy_index,
+            filter_columns=filter_columns,
+            location_index=self.location_index.extended(upserts, start),
+            text_index=self.text_index.extended(upserts, start),
+            completion_index=self.completion_index.extended(upserts, start, live),
+            geo_index=self.geo_index.extended(upserts),
+            planner=self.planner.extended(filter_columns, fuzzy_index, len(pair_keywords)),
+            pair_keywords=pair_keywords,
+            pair_venues=np.concatenate([self.pair_venues, np.array(pair_venues, dtype=self.pair_venues.dtype)]),
+            keyword_pair_offsets=self.keyword_pair_offsets,
+            extra_keyword_venues=extra_keyword_venues,
+            live=live,
+            id_ordinals=id_ordinals
+        )
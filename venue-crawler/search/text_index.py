@@ -0,0 +1,192 @@
+"""
+Text Index - Per-token inverted index with BM25 scoring over venue names, aliases, keywords and location
+Query tokens missing from the vocabulary (typos) are expanded to similar tokens via trigram candidates
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from fuzzywuzzy import fuzz
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import TEXT_FUZZY_THRESHOLD
+from search.fuzzy_index import TrigramIndex
+from search.location_index import tokenize
+from search.postings import merge_token_postings
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Per-field term weights (BM25F-style: a name hit counts three times a location hit)
+FIELD_WEIGHTS = {'name': 3.0, 'alias': 2.0, 'primary_keyword': 2.0, 'secondary_keyword': 1.0,
+                 'venue_type': 1.0, 'location': 1.0}
+
+FUZZY_MIN_TOKEN_LENGTH = 4   # shorter tokens are only matched exactly
+FUZZY_EXPANSIONS = 5         # similar vocabulary tokens tried per unknown query token
+
+
+def venue_fields(venue: Dict) -> List[Tuple[str, List[str]]]:
+    """(field, tokens) pairs of the text a venue is searchable by"""
+    basic_info = venue.get('basic_info') or {}
+    keywords = venue.get('search_keywords') or {}
+    location = venue.get('location') or {}
+    return (
+        [('name', tokenize(basic_info.get('official_name'))), ('name', tokenize(basic_info.get('brand_name')))]
+        + [('alias', tokenize(alias)) for alias in basic_info.get('aliases') or []]
+        + [('primary_keyword', tokenize(keyword)) for keyword in keywords.get('primary_keywords') or []]
+        + [('secondary_keyword', tokenize(keyword)) for keyword in keywords.get('secondary_keywords') or []]
+        + [('venue_type', tokenize((basic_info.get('venue_type') or '').replace('_', ' ')))]
+        + [('location', tokenize(location.get('address'))), ('location', tokenize(location.get('landmark')))]
+    )
+
+
+class TextIndex:
+    """
+    Sorted token vocabulary with CSR postings of (venue ordinal, field-weighted term frequency)
+    plus each venue's weighted length
+
+    Corpus statistics (venue count, document frequencies, average length) are computed at
+    query time over the live venues, so replaced / removed venues never skew scores. Venues
+    added after compile live in an overlay index whose ordinals follow the base ones.
+    """
+
+    def __init__(self, tokens: Sequence[str], offsets: np.ndarray, venues: np.ndarray, frequencies: np.ndarray,
+                 lengths: np.ndarray, overlay: Optional['TextIndex'] = None, vocabulary: Optional[TrigramIndex] = None):
+        self.tokens = tokens
+        self.offsets = np.asarray(offsets)
+        self.venues = np.asarray(venues)
+        self.frequencies = np.asarray(frequencies)
+        self.overlay = overlay
+        self._own_lengths = np.asarray(lengths)
+        # Weighted length of every venue, overlay ones included
+        self.lengths = self._own_lengths if overlay is None else np.concatenate([self._own_lengths, overlay.lengths])
+        # Trigram index over the vocabulary for fuzzy expansion (compiled with the index, or
+        # built on first use)
+        self._vocabulary = vocabulary
+        self._vocabulary_lock = threading.Lock()
+
+    @staticmethod
+    def build_arrays(venues: List[Dict]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """Returns: (sorted vocabulary, {'offsets', 'venues', 'frequencies', 'lengths'} arrays)"""
+        postings: Dict[str, Dict[int, float]] = {}
+        lengths = np.zeros(len(venues), dtype=np.float32)
+
+        for ordinal, venue in enumerate(venues):
+            for field, tokens in venue_fields(venue):
+                weight = FIELD_WEIGHTS[field]
+                for token in tokens:
+                    venue_frequencies = postings.setdefault(token, {})
+                    venue_frequencies[ordinal] = venue_frequencies.get(ordinal, 0.0) + weight
+                lengths[ordinal] += weight * len(tokens)
+
+        vocabulary = sorted(postings)
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum([len(postings[token]) for token in vocabulary], out=offsets[1:])
+        venue_ordinals = np.array([o for token in vocabulary for o in postings[token]], dtype=np.int32)
+        frequencies = np.array([f for token in vocabulary for f in postings[token].values()], dtype=np.float32)
+        return vocabulary, {'offsets': offsets, 'venues': venue_ordinals, 'frequencies': frequencies, 'lengths': lengths}
+
+    def extended(self, venues: List[Dict], start: int) -> 'TextIndex':
+        """
+        Copy with venues, numbered from ordinal start (> every indexed ordinal), merged into the
+        overlay; only the new venues are tokenized, the base arrays are shared
+        """
+        vocabulary, arrays = self.build_arrays(venues)
+        arrays['venues'] = arrays['venues'] + start
+        if self.overlay is not None:
+            overlay = self.overlay
+            vocabulary, arrays['offsets'], (arrays['venues'], arrays['frequencies']) = merge_token_postings(
+                overlay.tokens, overlay.offsets, (overlay.venues, overlay.frequencies),
+                vocabulary, arrays['offsets'], (arrays['venues'], arrays['frequencies'])
+            )
+            arrays['lengths'] = np.concatenate([overlay.lengths, arrays['lengths']])
+        overlay = TextIndex(vocabulary, arrays['offsets'], arrays['venues'], arrays['frequencies'], arrays['lengths'])
+        return TextIndex(self.tokens, self.offsets, self.venues, self.frequencies, self._own_lengths,
+                         overlay, self.vocabulary())
+
+    def _own_postings(self, token: str) -> Tuple[np.ndarray, np.ndarray]:
+        position = bisect_left(self.tokens, token)
+        if position == len(self.tokens) or self.tokens[position] != token:
+            return self.venues[:0], self.frequencies[:0]
+        start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+        return self.venues[start:end], self.frequencies[start:end]
+
+    def postings(self, token: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(venue ordinals ascending, weighted term frequencies) for one token"""
+        venues, frequencies = self._own_postings(token)
+        if self.overlay is not None:
+            overlay_venues, overlay_frequencies = self.overlay._own_postings(token)
+            venues, frequencies = np.concatenate([venues, overlay_venues]), np.concatenate([frequencies, overlay_frequencies])
+        return venues, frequencies
+
+    def vocabulary(self) -> TrigramIndex:
+        with self._vocabulary_lock:
+            if self._vocabulary is None:
+                self._vocabulary = TrigramIndex(list(self.tokens))
+            return self._vocabulary
+
+    def expansions(self, token: str) -> List[Tuple[str, float]]:
+        """
+        (vocabulary token, similarity 0-1) to score a query token with: itself when indexed,
+        else its closest vocabulary tokens scoring >= TEXT_FUZZY_THRESHOLD
+        """
+        if len(self.postings(token)[0]) or len(token) < FUZZY_MIN_TOKEN_LENGTH:
+            return [(token, 1.0)]
+
+        vocabulary = self.vocabulary()
+        candidates = [vocabulary.keywords[ordinal]
+                      for ordinal in vocabulary.candidate_ordinals(token, TEXT_FUZZY_THRESHOLD)]
+        if self.overlay is not None:
+            candidates += list(self.overlay.tokens)
+
+        scored = [(candidate, fuzz.ratio(token, candidate)) for candidate in candidates]
+        scored = [(candidate, score) for candidate, score in scored if score >= TEXT_FUZZY_THRESHOLD]
+        scored.sort(key=lambda item: -item[1])
+        return [(candidate, score / 100.0) for candidate, score in scored[:FUZZY_EXPANSIONS]]
+
+    def score(self, tokens: List[str], live: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict[str, List[str]]]:
+        """
+        BM25 score of every venue for the query tokens (0 = no token matched)
+
+        Each query token contributes its best-scoring expansion per venue, scaled by the
+        expansion's similarity, so a typo never counts twice.
+
+        Returns:
+            (scores indexed by venue ordinal, {query token: vocabulary tokens used})
+        """
+        size = len(self.lengths)
+        scores = np.zeros(size, dtype=np.float64)
+        if live is not None:
+            venue_count = int(live.sum())
+            average_length = float(self.lengths[live].mean()) if venue_count else 0.0
+        else:
+            venue_count = size
+            average_length = float(self.lengths.mean()) if size else 0.0
+        average_length = max(average_length, 1e-9)
+
+        matched: Dict[str, List[str]] = {}
+        for token in dict.fromkeys(tokens):
+            token_scores = np.zeros(size, dtype=np.float64)
+            for expansion, similarity in self.expansions(token):
+                venues, frequencies = self.postings(expansion)
+                if live is not None:
+                    keep = live[venues]
+                    venues, frequencies = venues[keep], frequencies[keep]
+                if not len(venues):
+                    continue
+
+                idf = math.log(1.0 + (venue_count - len(venues) + 0.5) / (len(venues) + 0.5))
+                norm = K1 * (1.0 - B + B * self.lengths[venues] / average_length)
+                term_scores = similarity * idf * frequencies * (K1 + 1.0) / (frequencies + norm)
+                # Venues are unique within one posting list, so a gather / scatter suffices
+                token_scores[venues] = np.maximum(token_scores[venues], term_scores)
+                matched.setdefault(token, []).append(expansion)
+            scores += token_scores
+
+        return scores, matched
@@ -4,90 +4,167 @@ Fuzzy keyword matching with filters for capacity, facilities, location
 """
 
 import json
+import time
+import shutil
+import functools
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Sequence, Tuple
+import numpy as np
 from fuzzywuzzy import fuzz, process
 from loguru import logger
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import VENUES_DIR, FUZZY_MATCH_THRESHOLD
+from config import (
+    VENUES_DIR, SEARCH_INDEX_DIR, FUZZY_MATCH_THRESHOLD, INDEX_WATCH_INTERVAL_SECONDS, INDEX_COMPACT_THRESHOLD
+)
+from search.fuzzy_index import take
+from search.batch_search import BatchSearchResult, score_matrix, venue_max
+from search.query_planner import FUZZY_FIRST, FILTER_FIRST
+from search.index_store import CompiledIndex, scan_sources, source_signature
+from search.snapshot import IndexSnapshot
+from search.postings import KeywordPostings, intersect, union
+from search.query_parser import parse_query
+from search.location_index import tokenize
+from search.autocomplete import Completion
+from search.results import VenueHit, project, top_hits
+from search.result_cache import CacheBackend, ResultCache, create_backend
+
+
+def _snapshot_attribute(name: str) -> property:
+    """Engine attribute read from the snapshot the current query is pinned to"""
+    return property(lambda self: getattr(self._view(), name), doc=f"IndexSnapshot.{name} of the current snapshot")
+
+
+def _pinned(method):
+    """Run a public query method against one snapshot, even if an update is swapped in meanwhile"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self._local, 'snapshot', None) is not None:
+            return method(self, *args, **kwargs)
+        self._local.snapshot = self._snapshot
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._local.snapshot = None
+    return wrapper
 
 
 class VenueSearchEngine:
     """Intelligent venue search with fuzzy matching and filters"""
 
-    def __init__(self, venues_directory: Path = VENUES_DIR):
+    index_version = _snapshot_attribute('version')
+    venues = _snapshot_attribute('documents')
+    venue_ids = _snapshot_attribute('venue_ids')
+    keywords = _snapshot_attribute('keywords')
+    fuzzy_index = _snapshot_attribute('fuzzy_index')
+    filter_columns = _snapshot_attribute('filter_columns')
+    location_index = _snapshot_attribute('location_index')
+    geo_index = _snapshot_attribute('geo_index')
+    text_index = _snapshot_attribute('text_index')
+    completion_index = _snapshot_attribute('completion_index')
+    planner = _snapshot_attribute('planner')
+    _pair_keywords = _snapshot_attribute('pair_keywords')
+    _pair_venues = _snapshot_attribute('pair_venues')
+    _live = _snapshot_attribute('live')
+
+    def __init__(self, venues_directory: Path = VENUES_DIR, index_directory: Path = SEARCH_INDEX_DIR,
+                 rebuild_index: bool = False, cache_backend: Optional[CacheBackend] = None):
         self.venues_dir = venues_directory
-        self.venues: List[Dict] = []
-        self.venue_index: Dict[str, Dict] = {}
-        self.keyword_map: Dict[str, List[str]] = {}  # keyword -> [venue_ids]
+        self.index_dir = index_directory
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
 
-        self._load_venues()
-        self._build_search_index()
+        # Ranked hits per (index version, query, filters, max_results)
+        backend = cache_backend if cache_backend is not None else create_backend()
+        self.result_cache = ResultCache(backend) if backend is not None else None
 
-    def _load_venues(self):
-        """Load all venue JSON files from directory"""
+        self._build_search_index(rebuild=rebuild_index)
+
+    def _load_venues(self) -> List[Dict]:
+        """Load all venue JSON files from directory (recording which file holds which venue_id)"""
         logger.info(f"Loading venues from: {self.venues_dir}")
 
         if not self.venues_dir.exists():
             logger.warning(f"Venues directory not found: {self.venues_dir}")
-            return
+            return []
 
         venue_files = list(self.venues_dir.glob("*.json"))
         logger.info(f"Found {len(venue_files)} venue files")
 
+        venues = []
+        self._file_venue_ids = {}
         for venue_file in venue_files:
             try:
                 with open(venue_file, 'r', encoding='utf-8') as f:
-                    venue_data = json.load(f)
-                    self.venues.append(venue_data)
-                    self.venue_index[venue_data['venue_id']] = venue_data
+                    venues.append(json.load(f))
+                self._file_venue_ids[venue_file.name] = venues[-1]['venue_id']
 
             except Exception as e:
                 logger.error(f"Error loading {venue_file}: {str(e)}")
 
-        logger.success(f"✓ Loaded {len(self.venues)} venues")
-
-    def _build_search_index(self):
-        """Build keyword index for fast searching"""
-        logger.info("Building search index...")
-
-        for venue in self.venues:
-            venue_id = venue['venue_id']
-            keywords = venue.get('search_keywords', {})
-
-            # Index primary keywords
-            for keyword in keywords.get('primary_keywords', []):
-                keyword_lower = keyword.lower()
-                if keyword_lower not in self.keyword_map:
-                    self.keyword_map[keyword_lower] = []
-                self.keyword_map[keyword_lower].append(venue_id)
-
-            # Index secondary keywords
-            for keyword in keywords.get('secondary_keywords', []):
-                keyword_lower = keyword.lower()
-                if keyword_lower not in self.keyword_map:
-                    self.keyword_map[keyword_lower] = []
-                if venue_id not in self.keyword_map[keyword_lower]:
-                    self.keyword_map[keyword_lower].append(venue_id)
-
-            # Index aliases
-            for alias in venue.get('basic_info', {}).get('aliases', []):
-                alias_lower = alias.lower()
-                if alias_lower not in self.keyword_map:
-                    self.keyword_map[alias_lower] = []
-                if venue_id not in self.keyword_map[alias_lower]:
-                    self.keyword_map[alias_lower].append(venue_id)
-
-        logger.success(f"✓ Indexed {len(self.keyword_map)} unique keywords")
+        logger.success(f"✓ Loaded {len(venues)} venues")
+        return venues
+
+    @staticmethod
+    def _venue_keywords(venue: Dict) -> Iterable[str]:
+        """A venue's primary / secondary keywords and aliases, lowercased"""
+        keywords = venue.get('search_keywords', {})
+        yield from (keyword.lower() for keyword in keywords.get('primary_keywords', []))
+        yield from (keyword.lower() for keyword in keywords.get('secondary_keywords', []))
+        yield from (alias.lower() for alias in venue.get('basic_info', {}).get('aliases', []))
+
+    def _build_keyword_postings(self, venues: List[Dict]) -> KeywordPostings:
+        """Map every keyword / alias to the (sorted, unique) ordinals of the venues carrying it"""
+        return KeywordPostings.build(venues, self._venue_keywords)
 
+    def _build_search_index(self, rebuild: bool = False):
+        """
+        Open the compiled (memory-mapped) search index, compiling it first if the venue files
+        changed since it was built
+        """
+        sources = scan_sources(self.venues_dir)
+        signature = source_signature(self.venues_dir, sources)
+        index = None if rebuild else CompiledIndex.open(self.index_dir, signature)
+
+        if index is None:
+            logger.info("Building search index...")
+            venues = self._load_venues()
+            # One document per venue_id (the last file read wins, as in the old venue_id lookup)
+            unique_venues = list({venue['venue_id']: venue for venue in venues}.values())
+            index = CompiledIndex.build(self.index_dir, signature, unique_venues,
+                                        self._build_keyword_postings(unique_venues), self._file_venue_ids,
+                                        self.venues_dir)
+
+        self._attach_index(index)
+        # Venue files (and the venue_id each holds) as of this snapshot, for sync_directory()
+        self._sources = sources
+        self._file_venue_ids: Dict[str, str] = dict(index.manifest.get('source_venue_ids', {}))
+        logger.success(f"✓ Indexed {len(self.keywords)} unique keywords ({len(self.venues)} venues)")
+
+    def _attach_index(self, index: CompiledIndex):
+        """Point the engine at a compiled index snapshot"""
+        self.index = index
+        self._snapshot = IndexSnapshot.from_index(index)
+
+    def _view(self) -> IndexSnapshot:
+        """The snapshot pinned by the running query, else the current one"""
+        return getattr(self._local, 'snapshot', None) or self._snapshot
+
+    def _keyword_venues(self, keyword_ordinal: int) -> np.ndarray:
+        """Venue ordinals carrying a keyword"""
+        return self._view().keyword_venues(keyword_ordinal)
+
+    @_pinned
     def search(
         self,
         query: str,
         filters: Optional[Dict] = None,
-        max_results: int = 10
+        max_results: int = 10,
+        fields: Optional[Sequence[str]] = None
     ) -> List[Dict]:
         """
         Search venues with fuzzy matching and optional filters
@@ -102,7 +179,11 @@ class VenueSearchEngine:
                 - has_accommodation: bool
                 - venue_type: str
                 - price_max: int (per plate)
+                - near + radius_km: only venues within radius_km of a point
+                  ((lat, long) or an area name, see resolve_point)
             max_results: Maximum number of results to return
+            fields: Optional dotted paths to return instead of the full document
+                (e.g. ["basic_info.official_name", "location.address"])
 
         Returns:
             List of venue dictionaries with match scores
@@ -112,147 +193,633 @@ class VenueSearchEngine:
         if not query.strip():
             return []
 
-        # Step 1: Fuzzy match against all keywords
-        matched_venues = self._fuzzy_match(query)
+        results = self._materialize(self._ranked(query, filters, max_results), fields)
 
-        # Step 2: Apply filters
-        if filters:
-            matched_venues = self._apply_filters(matched_venues, filters)
+        logger.success(f"✓ Found {len(results)} matching venues")
+        return results
+
+    @_pinned
+    def search_hits(
+        self,
+        query: str,
+        filters: Optional[Dict] = None,
+        max_results: int = 10
+    ) -> List[VenueHit]:
+        """Like search(), but returns VenueHit objects (venue_id + match info) without loading documents"""
+        if not query.strip():
+            return []
+        return [hit for _, hit in self._ranked(query, filters, max_results)]
+
+    def _ranked(self, query: str, filters: Optional[Dict], max_results: int,
+                kind: str = 'search') -> List[Tuple[int, VenueHit]]:
+        """
+        _execute() (or _execute_text() for kind 'text') through the result cache
+
+        Runs of whitespace are collapsed first, the way cache keys normalize queries, so
+        "casino  hotel " is answered (and cached) exactly like "casino hotel".
+        """
+        execute = self._execute_text if kind == 'text' else self._execute
+        query = ' '.join(query.split())
+        if self.result_cache is None:
+            return execute(query, filters, max_results)
+
+        key = ResultCache.make_key(self.index_version, kind, query, filters, max_results)
+        hits = self.result_cache.get(self.index_version, key)
+        if hits is None:
+            hits = execute(query, filters, max_results)
+            self.result_cache.set(self.index_version, key, hits)
+        return hits
+
+    @_pinned
+    def search_text(
+        self,
+        query: str,
+        filters: Optional[Dict] = None,
+        max_results: int = 10,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """
+        Tokenized search for free-text queries ("wedding venue for 300 guests near kakkanad")
+
+        Capacity / price phrases become filters (explicit filters take precedence); the
+        remaining tokens are BM25-scored against venue names, aliases, keywords and location,
+        with misspelled tokens expanded to similar indexed tokens. match_score is relative to
+        the best hit (100); a query of only filter phrases returns the venues passing them.
+
+        Returns:
+            List of venue dictionaries with match scores (match_type 'text')
+        """
+        logger.info(f"Text search for: '{query}' with filters: {filters}")
 
-        # Step 3: Sort by match score and limit
-        matched_venues.sort(key=lambda x: x['match_score'], reverse=True)
-        results = matched_venues[:max_results]
+        if not query.strip():
+            return []
+
+        results = self._materialize(self._ranked(query, filters, max_results, kind='text'), fields)
 
         logger.success(f"✓ Found {len(results)} matching venues")
         return results
 
-    def _fuzzy_match(self, query: str) -> List[Dict]:
-        """Fuzzy match query against venue keywords"""
+    def _execute_text(self, query: str, filters: Optional[Dict], max_results: int) -> List[Tuple[int, VenueHit]]:
+        """Parse, filter and BM25-rank one free-text query; returns top (venue ordinal, hit) pairs"""
+        parsed = parse_query(query)
+        filters = {**parsed.filters, **(filters or {})}
+        mask = self._venue_mask(filters) if filters else self._live
+
+        if not parsed.tokens:
+            ordinals = np.flatnonzero(mask) if mask is not None else np.arange(len(self.venues))
+            return [(ordinal, VenueHit(self.venue_ids[ordinal], 100, 'text'))
+                    for ordinal in ordinals[:max_results].tolist()]
+
+        scores, matched = self.text_index.score(parsed.tokens, self._live)
+        if mask is not None:
+            scores[~mask] = 0
+        logger.debug(f"Text tokens {parsed.tokens} -> {matched}, filters {filters}")
+
+        ordinals = np.flatnonzero(scores)
+        if len(ordinals) > max_results > 0:
+            # Keep everything scoring at least the k-th best, so ties at the cut stay deterministic
+            cut = len(ordinals) - max_results
+            ordinals = ordinals[scores[ordinals] >= np.partition(scores[ordinals], cut)[cut]]
+        # Best first, ties in catalogue order
+        ordinals = ordinals[np.lexsort((ordinals, -scores[ordinals]))][:max_results]
+
+        best = scores[ordinals[0]] if len(ordinals) else 1.0
+        return [
+            (ordinal, VenueHit(self.venue_ids[ordinal], int(round(100 * score / best)), 'text'))
+            for ordinal, score in zip(ordinals.tolist(), scores[ordinals].tolist())
+        ]
+
+    def cache_stats(self) -> Dict:
+        """Result cache hit/miss/eviction counters plus document store stats"""
+        return {
+            'results': self.result_cache.stats() if self.result_cache is not None else None,
+            'documents': self.venues.stats() if hasattr(self.venues, 'stats') else None
+        }
+
+    def _materialize(self, hits: List[Tuple[int, VenueHit]], fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Result dicts for ranked hits: the full document (or a projection of it) plus match info"""
+        results = []
+        for ordinal, hit in hits:
+            venue = self.venues[ordinal]
+            if fields is not None:
+                venue = {'venue_id': hit.venue_id, **project(venue, fields)}
+            results.append({**venue, **hit.match_info()})
+        return results
+
+    @_pinned
+    def explain(
+        self,
+        query: str,
+        filters: Optional[Dict] = None,
+        max_results: int = 10,
+        plan: Optional[str] = None
+    ) -> Dict:
+        """
+        Run a search and report the chosen plan, its estimates and the actual work done
+
+        Args:
+            plan: Force 'fuzzy_first' or 'filter_first' instead of the planner's choice
+
+        Returns:
+            Dict with plan, estimates, actual counts, per-stage timings_ms and result venue_ids
+        """
+        if plan not in (None, FUZZY_FIRST, FILTER_FIRST):
+            raise ValueError(f"Unknown plan: {plan}")
+
+        trace = {'forced_plan': plan}
+        results = self._execute(query, filters, max_results, trace) if query.strip() else []
+
+        return {
+            'query': query,
+            'filters': filters or {},
+            'plan': trace.get('plan'),
+            'estimates': trace.get('estimates', {}),
+            'actual': {
+                'surviving_venues': trace.get('surviving_venues', self._view().live_count()),
+                'keywords_scored': trace.get('keywords_scored', 0),
+                'matched_venues': trace.get('matched_venues', 0),
+                'results': len(results)
+            },
+            'timings_ms': {stage: round(seconds * 1000, 3) for stage, seconds in trace.get('timings', {}).items()},
+            'venue_ids': [hit.venue_id for _, hit in results]
+        }
+
+    def _execute(self, query: str, filters: Optional[Dict], max_results: int,
+                 trace: Optional[Dict] = None) -> List[Tuple[int, VenueHit]]:
+        """
+        Plan, filter, match and rank one query (trace, if given, collects explain() details)
+        Returns: top (venue ordinal, hit) pairs, best first
+        """
+        timings = {}
+        started = time.perf_counter()
+        query_lower = query.lower()
+
+        # Step 1: Pick the execution order from filter selectivity and posting volume
+        query_plan = self.planner.choose(query_lower, filters)
+        plan = (trace or {}).get('forced_plan') or query_plan.name
+        timings['plan'] = time.perf_counter() - started
+
+        # Step 2: Evaluate filters once as a venue mask
+        step = time.perf_counter()
+        venue_mask = self._venue_mask(filters) if filters else self._live
+        timings['filter'] = time.perf_counter() - step
+
+        # Step 3: Exact + fuzzy keyword matching restricted to venues passing the filters
+        matched_venues = self._fuzzy_match(query, venue_mask, plan, timings, trace)
+
+        # Step 4: Bounded-heap top-k by match score
+        step = time.perf_counter()
+        results = top_hits(matched_venues, max_results)
+        timings['rank'] = time.perf_counter() - step
+        timings['total'] = time.perf_counter() - started
+
+        if trace is not None:
+            trace.update({
+                'plan': plan,
+                'estimates': query_plan.estimates,
+                'surviving_venues': int(venue_mask.sum()) if venue_mask is not None else len(self.venues),
+                'matched_venues': len(matched_venues),
+                'timings': timings
+            })
+        logger.debug(f"Plan {plan}: {query_plan.estimates}")
+
+        return results
+
+    @_pinned
+    def search_many(
+        self,
+        queries: List[str],
+        filters: Optional[Dict] = None,
+        keyword_scores: bool = False,
+        workers: int = -1
+    ) -> BatchSearchResult:
+        """
+        Score a batch of queries in one vectorized, multi-threaded rapidfuzz cdist call
+
+        Args:
+            queries: Search queries
+            filters: Optional filters (same as search()); excluded venues score 0
+            keyword_scores: Also return the full (queries x keywords) score matrix
+            workers: cdist threads (-1 = all cores)
+
+        Returns:
+            BatchSearchResult with a (queries x venues) uint8 matrix holding each venue's best
+            token_sort_ratio keyword score; .top(i) gives ranked matches for query i
+        """
+        logger.info(f"Batch scoring {len(queries)} queries against {len(self.keywords)} keywords")
+
+        matrix = score_matrix(queries, list(self.fuzzy_index.keys), workers=workers)
+        venue_scores = venue_max(matrix, self._pair_keywords, self._pair_venues, len(self.venues))
+
+        if filters:
+            venue_scores[:, ~self._venue_mask(filters)] = 0
+
+        venue_ids = self.venue_ids
+        if self._live is not None:
+            # Drop the columns of replaced / removed venues
+            live = self._view().live_ordinals()
+            venue_scores, venue_ids = venue_scores[:, live], take(venue_ids, live.tolist())
+
+        return BatchSearchResult(
+            queries=list(queries),
+            venue_ids=list(venue_ids),
+            venue_scores=venue_scores,
+            keywords=list(self.keywords) if keyword_scores else None,
+            keyword_scores=matrix if keyword_scores else None
+        )
+
+    def _fuzzy_match(
+        self,
+        query: str,
+        venue_mask: Optional[np.ndarray] = None,
+        plan: str = FUZZY_FIRST,
+        timings: Optional[Dict] = None,
+        trace: Optional[Dict] = None
+    ) -> List[Tuple[int, VenueHit]]:
+        """
+        Fuzzy match query against venue keywords
+        Returns: (venue ordinal, hit) pairs in match order
+
+        With a venue mask only keywords of allowed venues compete for the top 20, either by
+        pruning trigram candidates (fuzzy_first) or by scoring just the surviving venues'
+        keywords (filter_first); both plans return the same venues.
+        """
+        timings = timings if timings is not None else {}
         query_lower = query.lower()
         matched_venues = {}
 
+        def allowed(ordinal: int) -> bool:
+            return venue_mask is None or bool(venue_mask[ordinal])
+
         # Exact match first
-        if query_lower in self.keyword_map:
-            for venue_id in self.keyword_map[query_lower]:
-                venue = self.venue_index[venue_id]
-                matched_venues[venue_id] = {
-                    **venue,
-                    'match_score': 100,
-                    'match_type': 'exact'
-                }
+        step = time.perf_counter()
+        exact_ordinal = self.keywords.index(query_lower)
+        if exact_ordinal >= 0:
+            for ordinal in self._keyword_venues(exact_ordinal).tolist():
+                if not allowed(ordinal):
+                    continue
+                matched_venues[ordinal] = VenueHit(self.venue_ids[ordinal], 100, 'exact')
             logger.debug(f"Exact match found: {len(matched_venues)} venues")
+        timings['exact'] = time.perf_counter() - step
+
+        step = time.perf_counter()
+        if venue_mask is None:
+            # Fuzzy match against the keywords that can still reach the threshold
+            ordinals = self.fuzzy_index.candidate_ordinals(query_lower, FUZZY_MATCH_THRESHOLD)
+        else:
+            # Keywords attached to at least one venue passing the filters
+            keyword_allowed = np.zeros(len(self.fuzzy_index), dtype=bool)
+            keyword_allowed[self._pair_keywords[venue_mask[self._pair_venues]]] = True
+
+            if plan == FILTER_FIRST:
+                ordinals = np.flatnonzero(keyword_allowed).tolist()
+            else:
+                ordinals = [ordinal for ordinal in self.fuzzy_index.candidate_ordinals(query_lower, FUZZY_MATCH_THRESHOLD)
+                            if keyword_allowed[ordinal]]
+        candidate_keywords = dict(zip(ordinals, take(self.keywords, ordinals)))
 
-        # Fuzzy match against all keywords
-        all_keywords = list(self.keyword_map.keys())
         fuzzy_matches = process.extract(
             query_lower,
-            all_keywords,
+            candidate_keywords,
             scorer=fuzz.token_sort_ratio,
             limit=20
         )
 
-        for matched_keyword, score in fuzzy_matches:
+        for matched_keyword, score, keyword_ordinal in fuzzy_matches:
             if score >= FUZZY_MATCH_THRESHOLD:
-                for venue_id in self.keyword_map[matched_keyword]:
+                for ordinal in self._keyword_venues(keyword_ordinal).tolist():
                     # Don't overwrite exact matches
-                    if venue_id not in matched_venues:
-                        venue = self.venue_index[venue_id]
-                        matched_venues[venue_id] = {
-                            **venue,
-                            'match_score': score,
-                            'match_type': 'fuzzy',
-                            'matched_keyword': matched_keyword
-                        }
+                    if ordinal not in matched_venues and allowed(ordinal):
+                        matched_venues[ordinal] = VenueHit(self.venue_ids[ordinal], score, 'fuzzy', matched_keyword)
+        timings['fuzzy'] = time.perf_counter() - step
+
+        if trace is not None:
+            trace['keywords_scored'] = len(candidate_keywords)
 
         logger.debug(f"Fuzzy matching found {len(matched_venues)} total venues")
-        return list(matched_venues.values())
+        return list(matched_venues.items())
+
+    def _venue_mask(self, filters: Dict) -> np.ndarray:
+        """Filter columns mask over live venues, narrowed to the near / radius_km circle when given"""
+        mask = self.filter_columns.mask(filters)
+        if self._live is not None:
+            mask &= self._live
+        if filters.get('near') is not None and filters.get('radius_km') is not None:
+            latitude, longitude = self.resolve_point(filters['near'])
+            ordinals, _ = self.geo_index.within(latitude, longitude, float(filters['radius_km']), mask)
+            mask = np.zeros(len(self.venues), dtype=bool)
+            mask[ordinals] = True
+        return mask
+
+    @_pinned
+    def resolve_point(self, near) -> Tuple[float, float]:
+        """
+        (latitude, longitude) for a point given as a pair, a {'latitude', 'longitude'} dict, or an
+        area name (centroid of the venues the location index ranks best for it)
+        """
+        if isinstance(near, dict):
+            return float(near['latitude']), float(near['longitude'])
+        if not isinstance(near, str):
+            latitude, longitude = near
+            return float(latitude), float(longitude)
+
+        ordinals, scores = self.location_index.lookup(near, self._live)
+        if len(ordinals):
+            best = ordinals[scores == scores.max()]
+            latitudes, longitudes = self.geo_index.latitudes[best], self.geo_index.longitudes[best]
+            located = ~np.isnan(latitudes)
+            if located.any():
+                return float(latitudes[located].mean()), float(longitudes[located].mean())
+
+        raise ValueError(f"Unknown location: {near}")
+
+    @_pinned
+    def search_nearby(
+        self,
+        near,
+        radius_km: Optional[float] = None,
+        filters: Optional[Dict] = None,
+        max_results: int = 10,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """
+        Venues sorted by distance from a point, combined with the usual filters
 
-    def _apply_filters(self, venues: List[Dict], filters: Dict) -> List[Dict]:
-        """Apply capacity, facility, and price filters"""
-        filtered = []
+        Args:
+            near: (lat, long), {'latitude', 'longitude'} or an area name ("Marine Drive")
+            radius_km: Only venues within this distance; without it, the max_results nearest
+            filters: Same as search()
 
-        for venue in venues:
-            # Capacity filter
-            if 'min_capacity' in filters or 'max_capacity' in filters:
-                if not self._check_capacity(venue, filters):
-                    continue
+        Returns:
+            Venue dictionaries, nearest first, with distance_km
+        """
+        latitude, longitude = self.resolve_point(near)
+        mask = self._venue_mask(filters) if filters else self._live
 
-            # Facility filters
-            if 'has_kitchen' in filters:
-                if not venue.get('catering', {}).get('in_house_catering'):
-                    continue
+        if radius_km is not None:
+            ordinals, distances = self.geo_index.within(latitude, longitude, radius_km, mask)
+        else:
+            ordinals, distances = self.geo_index.nearest(latitude, longitude, max_results, mask)
 
-            if 'has_parking' in filters:
-                parking_capacity = venue.get('capacity', {}).get('parking_capacity')
-                if not parking_capacity or parking_capacity < 1:
-                    continue
+        hits = [
+            (ordinal, VenueHit(self.venue_ids[ordinal], 90, 'nearby', distance_km=round(distance, 2)))
+            for ordinal, distance in zip(ordinals[:max_results].tolist(), distances[:max_results].tolist())
+        ]
+        return self._materialize(hits, fields)
 
-            if 'has_accommodation' in filters and filters['has_accommodation']:
-                if not venue.get('facilities', {}).get('accommodation_available'):
-                    continue
+    @_pinned
+    def filter_venues(self, filters: Dict, max_results: Optional[int] = None) -> List[Dict]:
+        """Filter-only query over the entire catalogue (no text query)"""
+        ordinals = np.flatnonzero(self._venue_mask(filters))[:max_results]
+        return [self.venues[ordinal] for ordinal in ordinals]
 
-            # Venue type filter
-            if 'venue_type' in filters:
-                if venue.get('basic_info', {}).get('venue_type') != filters['venue_type']:
-                    continue
+    @_pinned
+    def get_venue_by_id(self, venue_id: str) -> Optional[Dict]:
+        """Get venue by exact ID"""
+        ordinal = self._view().ordinal(venue_id)
+        return self.venues[ordinal] if ordinal >= 0 else None
 
-            # Price filter
-            if 'price_max' in filters:
-                price_max_venue = venue.get('pricing', {}).get('per_plate_cost_max')
-                if price_max_venue and price_max_venue > filters['price_max']:
-                    continue
+    @_pinned
+    def get_all_venues(self) -> Sequence[Dict]:
+        """Get all venues (documents are decoded as they are read)"""
+        return self._view().live_documents()
 
-            filtered.append(venue)
+    @_pinned
+    def get_venue_count(self) -> int:
+        """Get total number of venues"""
+        return self._view().live_count()
 
-        logger.debug(f"After filtering: {len(filtered)} venues")
-        return filtered
+    @_pinned
+    def search_by_location(self, area: str, max_results: int = 10,
+                           fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        Search venues by location/area via the location token index (prefix matching, so
+        "willing" finds Willingdon Island); hits in address / landmark / pin code score 90,
+        hits only among nearby landmarks score 80
 
-    def _check_capacity(self, venue: Dict, filters: Dict) -> bool:
-        """Check if venue meets capacity requirements"""
-        event_spaces = venue.get('capacity', {}).get('event_spaces', [])
-        if not event_spaces:
-            return False
+        An area with no location tokens (empty, whitespace, punctuation) keeps the original
+        address / landmark substring match, so an empty area still lists every venue.
+        """
+        if not tokenize(area):
+            return self._materialize(self._substring_location_hits(area, max_results), fields)
+
+        ordinals, scores = self.location_index.lookup(area, self._live)
+        hits = [
+            (ordinal, VenueHit(self.venue_ids[ordinal], score, 'location'))
+            for ordinal, score in zip(ordinals.tolist(), scores.tolist())
+        ]
+        return self._materialize(top_hits(hits, max_results), fields)
+
+    def _substring_location_hits(self, area: str, max_results: int) -> List[Tuple[int, VenueHit]]:
+        """Live venues whose address or landmark contains area, in catalogue order (score 90)"""
+        area = area.lower()
+        ordinals = np.flatnonzero(self._live) if self._live is not None else np.arange(len(self.venues))
+        hits = []
+        for ordinal in ordinals.tolist():
+            if len(hits) >= max_results:
+                break
+            location = self.venues[ordinal].get('location') or {}
+            if area in (location.get('address') or '').lower() or area in (location.get('landmark') or '').lower():
+                hits.append((ordinal, VenueHit(self.venue_ids[ordinal], 90, 'location')))
+        return hits
+
+    @_pinned
+    def autocomplete(self, prefix: str, max_results: int = 10) -> List[Dict]:
+        """
+        Venue name completions for a typed prefix (official names and aliases, matched at any
+        word start), most popular first by google_rating / total_reviews; falls back to fuzzy
+        matching only when no name starts with the prefix
 
-        min_required = filters.get('min_capacity', 0)
-        max_required = filters.get('max_capacity', float('inf'))
+        Returns:
+            Completion dicts: venue_id, text (the matched name or alias), match_type, score
+        """
+        text_index = self.text_index
 
-        for space in event_spaces:
-            max_guests = space.get('max_guests', 0)
-            if min_required <= max_guests <= max_required:
-                return True
+        def correct(word: str) -> Optional[str]:
+            expansions = text_index.expansions(word)
+            return expansions[0][0] if expansions else None
 
-        return False
+        return [
+            Completion(self.venue_ids[ordinal], text, match_type, score)._asdict()
+            for ordinal, text, match_type, score in self.completion_index.complete(prefix, max_results, correct)
+        ]
 
-    def get_venue_by_id(self, venue_id: str) -> Optional[Dict]:
-        """Get venue by exact ID"""
-        return self.venue_index.get(venue_id)
+    @_pinned
+    def search_keywords(
+        self,
+        keywords: List[str],
+        match_all: bool = True,
+        filters: Optional[Dict] = None,
+        max_results: int = 10,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """
+        Venues carrying all (match_all) or any of the given exact keywords / aliases, by
+        intersecting or merging their postings; results are in catalogue order with score 100
+        """
+        postings = []
+        for keyword in keywords:
+            keyword_ordinal = self.keywords.index(keyword.lower())
+            if keyword_ordinal < 0 and match_all:
+                return []
+            if keyword_ordinal >= 0:
+                postings.append(self._keyword_venues(keyword_ordinal))
+
+        ordinals = intersect(postings) if match_all else union(postings)
+        mask = self._venue_mask(filters) if filters else self._live
+        if mask is not None:
+            ordinals = ordinals[mask[ordinals]]
+
+        hits = [(ordinal, VenueHit(self.venue_ids[ordinal], 100, 'exact')) for ordinal in ordinals[:max_results].tolist()]
+        return self._materialize(hits, fields)
+
+    # ============================================
+    # INCREMENTAL UPDATES
+    # ============================================
+
+    def apply_changes(self, upserts: Iterable[Dict] = (), removals: Iterable[str] = ()) -> str:
+        """
+        Add / replace (by venue_id) and remove venues without recompiling the index
 
-    def get_all_venues(self) -> List[Dict]:
-        """Get all venues"""
-        return self.venues
+        Queries already running keep the snapshot they started on; later ones see every change
+        at once. Changes live in memory only: the next start compiles the venue files again.
 
-    def get_venue_count(self) -> int:
-        """Get total number of venues"""
-        return len(self.venues)
+        Returns:
+            The new index version (result cache entries of older versions no longer match)
+        """
+        with self._write_lock:
+            return self._apply_changes_locked(list(upserts), list(removals))
+
+    def _apply_changes_locked(self, upserts: List[Dict], removals: List[str]) -> str:
+        """apply_changes() with _write_lock already held, so callers can check and patch atomically"""
+        for venue in upserts:
+            if not venue.get('venue_id'):
+                raise ValueError("Venue has no venue_id")
+        if not upserts and not removals:
+            return self._snapshot.version
+
+        snapshot = self._snapshot.patched(upserts, removals, self._build_keyword_postings)
+        logger.info(f"Index {snapshot.version}: {len(upserts)} upserted, {len(removals)} removed")
+        if snapshot.patch_count() >= INDEX_COMPACT_THRESHOLD:
+            snapshot = self._compact(snapshot)
+        self._snapshot = snapshot
+        return snapshot.version
+
+    def _compact(self, snapshot: IndexSnapshot) -> IndexSnapshot:
+        """
+        Compile a patched snapshot's live venues (in ordinal order) into a new index, so
+        appended venues and tombstones stop piling up in the overlays
 
-    def search_by_location(self, area: str, max_results: int = 10) -> List[Dict]:
-        """Search venues by location/area"""
-        results = []
+        The compiled index keeps the snapshot's version and generation: it answers every query
+        the same way, so cached results stay valid and later patches keep counting up.
+        """
+        start = time.perf_counter()
+        venues = list(snapshot.live_documents())
+        # The source-signature index stays for the next start; an earlier compaction is dropped
+        index = CompiledIndex.build(self.index_dir, snapshot.version, venues, self._build_keyword_postings(venues),
+                                    venues_dir=self.venues_dir, prune=False)
+        previous, self.index = self.index, index
+        if '+' in previous.signature:
+            shutil.rmtree(previous.directory, ignore_errors=True)
+
+        logger.info(f"Compacted index {snapshot.version} ({snapshot.patch_count()} patched venues) "
+                    f"in {time.perf_counter() - start:.2f}s")
+        return IndexSnapshot.from_index(index, snapshot.generation)
+
+    def add_venue(self, venue: Dict) -> str:
+        """Index a new venue (ValueError if its venue_id is already indexed)"""
+        with self._write_lock:
+            if self._snapshot.ordinal(venue.get('venue_id')) >= 0:
+                raise ValueError(f"Venue already indexed: {venue['venue_id']}")
+            return self._apply_changes_locked([venue], [])
+
+    def update_venue(self, venue: Dict) -> str:
+        """Replace an indexed venue's document (KeyError if it isn't indexed)"""
+        with self._write_lock:
+            if self._snapshot.ordinal(venue.get('venue_id')) < 0:
+                raise KeyError(venue.get('venue_id'))
+            return self._apply_changes_locked([venue], [])
+
+    def remove_venue(self, venue_id: str) -> bool:
+        """Drop a venue from the index; False if it wasn't indexed"""
+        with self._write_lock:
+            if self._snapshot.ordinal(venue_id) < 0:
+                return False
+            self._apply_changes_locked([], [venue_id])
+            return True
+
+    def sync_directory(self) -> int:
+        """
+        Apply venue files added, changed or deleted since the index (or the last sync) was built
 
-        for venue in self.venues:
-            location = venue.get('location', {})
-            address = location.get('address', '').lower()
-            landmark = location.get('landmark', '').lower()
+        Deleted or changed files are matched to the venue_id they held when indexed (falling back
+        to the file name, as crawlers save each venue as <venue_id>.json). A file that can't be
+        read yet (e.g. mid-write) is retried on the next sync.
 
-            if area.lower() in address or area.lower() in landmark:
-                results.append({
-                    **venue,
-                    'match_score': 90,
-                    'match_type': 'location'
-                })
+        Returns:
+            Number of venue files applied
+        """
+        with self._sync_lock:
+            return self._sync_directory()
 
-        results.sort(key=lambda x: x['match_score'], reverse=True)
-        return results[:max_results]
+    def _sync_directory(self) -> int:
+        sources = scan_sources(self.venues_dir)
+        upserts, removals, applied = [], [], {}
+
+        for name, stat in sources.items():
+            if self._sources.get(name) == stat:
+                continue
+            try:
+                with open(self.venues_dir / name, 'r', encoding='utf-8') as f:
+                    venue = json.load(f)
+            except Exception as e:
+                logger.warning(f"Skipping {name} until next sync: {str(e)}")
+                continue
+            if not venue.get('venue_id'):
+                logger.warning(f"Skipping {name} until next sync: no venue_id")
+                continue
+
+            previous_id = self._file_venue_ids.get(name, Path(name).stem) if name in self._sources else None
+            if previous_id is not None and previous_id != venue.get('venue_id'):
+                removals.append(previous_id)
+            upserts.append(venue)
+            applied[name] = stat
+
+        deleted = [name for name in self._sources if name not in sources]
+        removals.extend(self._file_venue_ids.get(name, Path(name).stem) for name in deleted)
+
+        if not upserts and not removals:
+            return 0
+
+        self.apply_changes(upserts, removals)
+        self._sources = {name: stat for name, stat in self._sources.items() if name not in deleted}
+        self._sources.update(applied)
+        for name in deleted:
+            self._file_venue_ids.pop(name, None)
+        self._file_venue_ids.update({name: venue['venue_id'] for name, venue in zip(applied, upserts)})
+
+        logger.success(f"✓ Synced {len(applied) + len(deleted)} venue files")
+        return len(applied) + len(deleted)
+
+    def watch(self, interval: float = INDEX_WATCH_INTERVAL_SECONDS) -> threading.Event:
+        """
+        Poll the venues directory every interval seconds and sync changes in a daemon thread
+
+        Returns:
+            Event that stops the watcher when set
+        """
+        stop = threading.Event()
+
+        def poll():
+            while not stop.wait(interval):
+                try:
+                    self.sync_directory()
+                except Exception as e:
+                    logger.error(f"Venue directory sync failed: {str(e)}")
+
+        threading.Thread(target=poll, name='venue-index-watcher', daemon=True).start()
+        logger.info(f"Watching {self.venues_dir} every {interval}s")
+        return stop
 
 
 # ============================================
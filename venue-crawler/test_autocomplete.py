@@ -0,0 +1,113 @@
+"""Autocomplete - prefix completions match a ranked scan of every name and alias"""
+
+import random
+
+import numpy as np
+import pytest
+
+from config import VENUES_DIR
+from search.autocomplete import MID_NAME_FACTOR, CompletionIndex, normalize, popularity
+from search.venue_search import VenueSearchEngine
+
+WORDS = ['grand', 'hyatt', 'bolgatty', 'casino', 'hotel', 'crowne', 'plaza', 'taj', 'malabar', 'le', 'meridien',
+         'ramada', 'resort', 'croft', 'casa', 'palace', 'marine', 'gardens', 'grove', 'great']
+
+
+def make_venues(count, rng):
+    def name():
+        return ' '.join(rng.sample(WORDS, rng.randint(1, 3))).title() + f" {i}"
+
+    venues = []
+    for i in range(count):
+        venues.append({'venue_id': f"complete_{i}", 'basic_info': {
+            'official_name': name(), 'aliases': [name() for _ in range(rng.randint(0, 2))],
+            'google_rating': round(rng.uniform(3, 5), 2), 'total_reviews': rng.randint(0, 5000)}})
+    return venues
+
+
+def scan(venues, prefix, live=None):
+    """venue ordinal -> best weight over every word start of every label starting with the prefix"""
+    best = {}
+    for ordinal, venue in enumerate(venues):
+        if live is not None and not live[ordinal]:
+            continue
+        basic_info = venue['basic_info']
+        weight = float(np.float32(popularity(venue)))
+        mid_weight = float(np.float32(popularity(venue) * MID_NAME_FACTOR))
+        for text in [basic_info['official_name']] + basic_info['aliases']:
+            words = normalize(text).split(' ')
+            for start in range(len(words)):
+                if ' '.join(words[start:]).startswith(prefix):
+                    best[ordinal] = max(best.get(ordinal, 0.0), weight if start == 0 else mid_weight)
+    return best
+
+
+def check(index, venues, prefixes, live=None):
+    for prefix in prefixes:
+        expected = sorted(scan(venues, normalize(prefix), live).items(), key=lambda item: -item[1])
+        for k in (1, 5, 40):
+            completions = index.complete(prefix, k)
+            assert [(ordinal, score) for ordinal, _, _, score in completions] == \
+                [(ordinal, round(weight, 3)) for ordinal, weight in expected[:k]], (prefix, k)
+            for ordinal, label, match_type, _ in completions:
+                assert match_type == 'prefix'
+                assert label in [venues[ordinal]['basic_info']['official_name']] + venues[ordinal]['basic_info']['aliases']
+
+
+PREFIXES = ['g', 'gr', 'gra', 'grand', 'grand h', 'hy', 'h', 'c', 'cas', 'casa', 'le m', 'pal', 'p', 'grove', 'r']
+
+
+def test_prefixes_match_scan():
+    rng = random.Random(24)
+    venues = make_venues(300, rng)
+    check(CompletionIndex.from_venues(venues), venues, PREFIXES)
+
+
+def test_extended_matches_scan():
+    """Overlay venues (added over several patches) are completed, dead ones never are"""
+    rng = random.Random(25)
+    venues = make_venues(300, rng)
+    live = np.array([rng.random() < 0.8 for _ in venues])
+    index = CompletionIndex.from_venues(venues[:200])
+    for start, end in [(200, 230), (230, 231), (231, 231), (231, 300)]:
+        index = index.extended(venues[start:end], start, live[:end])
+    check(index, venues, PREFIXES, live)
+
+    # The merged overlay is the one a single build over the added venues makes
+    built = CompletionIndex.from_venues(venues[200:], 200)
+    assert list(index.overlay.suffixes) == list(built.suffixes)
+    assert list(index.overlay.labels) == list(built.labels)
+    for name in ('suffix_labels', 'suffix_weights', 'label_venues'):
+        assert np.array_equal(getattr(index.overlay, name), getattr(built, name)), name
+
+
+def test_misses_fall_back_to_fuzzy():
+    venues = make_venues(50, random.Random(26))
+    index = CompletionIndex.from_venues(venues)
+    assert index.complete('zq', 5) == [] and index.complete('   ', 5) == [] and index.complete('grand', 0) == []
+
+    fuzzy = index.complete('bolgaty', 5)
+    assert fuzzy and all(match_type == 'fuzzy' for _, _, match_type, _ in fuzzy)
+    assert all('bolgatty' in normalize(label) for _, label, _, _ in fuzzy)
+
+    corrected = index.complete('bolgaty', 5, correct=lambda word: 'bolgatty' if word == 'bolgaty' else None)
+    assert [ordinal for ordinal, _, _, _ in corrected] == [ordinal for ordinal, _, _, _ in index.complete('bolgatty', 5)]
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    return VenueSearchEngine(VENUES_DIR, tmp_path_factory.mktemp("index"))
+
+
+def test_engine_completes_every_name(engine):
+    """Each venue the name search finds is completed from the start of its name, and from a typo"""
+    for venue in engine.venues:
+        name = venue['basic_info']['official_name']
+        assert engine.search(name)[0]['venue_id'] == venue['venue_id']
+        for prefix in (name[:4], name, name.split(' ')[-1][:3]):
+            completions = engine.autocomplete(prefix, max_results=20)
+            assert venue['venue_id'] in [completion['venue_id'] for completion in completions], prefix
+            assert len({completion['venue_id'] for completion in completions}) == len(completions)
+
+        typo = name[:3] + name[4:8]
+        assert venue['venue_id'] in [completion['venue_id'] for completion in engine.autocomplete(typo, 20)], typo
@@ -0,0 +1,70 @@
+"""Batch search - search_many scores agree with fuzzywuzzy and with per-query search()"""
+
+import random
+
+import numpy as np
+import pytest
+from fuzzywuzzy import fuzz
+
+from conftest import keyword_map
+from search.batch_search import score_matrix
+from search.fuzzy_index import sort_key
+from search.venue_search import VenueSearchEngine
+
+QUERIES = [
+    "Casino Hotel", "le meridian", "crown plaza", "bolgaty palace", "the croft", "trinity casa",
+    "kochi wedding venue", "taj malabar resort", "Marine Drive banquet", "", "   ", "!!!", "Café Ωmega", "a"
+]
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    return VenueSearchEngine(index_directory=tmp_path_factory.mktemp("index"))
+
+
+def test_score_matrix_matches_token_sort_ratio():
+    rng = random.Random(12)
+    keys = ["grand hyatt", "hotel casino", "", "!!!", "ÉVÉNEMENT hall", "x"]
+    keys += [''.join(rng.choice("abc ") for _ in range(rng.randint(1, 12))) for _ in range(300)]
+    queries = QUERIES + [''.join(rng.choice("abc ") for _ in range(rng.randint(1, 12))) for _ in range(300)]
+
+    scores = score_matrix(queries, [sort_key(k) for k in keys])
+    expected = np.array([[fuzz.token_sort_ratio(q, k) for k in keys] for q in queries], dtype=np.uint8)
+    assert np.array_equal(scores, expected)
+    assert score_matrix(queries, []).shape == (len(queries), 0)
+
+
+def test_keyword_scores_match_fuzzywuzzy(engine):
+    result = engine.search_many(QUERIES, keyword_scores=True)
+    assert result.keywords == list(keyword_map(engine.venues))
+    expected = np.array([[fuzz.token_sort_ratio(q, k) for k in result.keywords] for q in QUERIES])
+    assert np.array_equal(result.keyword_scores, expected)
+
+
+def test_top_matches_agree_with_search(engine):
+    result = engine.search_many(QUERIES)
+    for i, query in enumerate(QUERIES):
+        # Best keyword score per venue, found by scanning every keyword
+        best = {}
+        for keyword, venue_ids in keyword_map(engine.venues).items():
+            for venue_id in venue_ids:
+                best[venue_id] = max(best.get(venue_id, 0), fuzz.token_sort_ratio(query, keyword))
+        ranked = dict(result.top(i, max_results=len(engine.venues), threshold=0))
+        assert ranked == best, query
+
+        # search() only expands the 20 best keywords, but every venue it returns has the same score
+        batch = dict(result.top(i, max_results=len(engine.venues)))
+        for venue in engine.search(query, max_results=len(engine.venues)):
+            assert batch[venue['venue_id']] == venue['match_score'], (query, venue['venue_id'])
+
+
+def test_filters_zero_excluded_venues(engine):
+    filters = {'min_capacity': 300, 'has_kitchen': True}
+    allowed = {venue['venue_id'] for venue in engine.filter_venues(filters)}
+    assert 0 < len(allowed) < len(engine.venues)
+
+    unfiltered = engine.search_many(QUERIES)
+    filtered = engine.search_many(QUERIES, filters=filters)
+    for ordinal, venue_id in enumerate(filtered.venue_ids):
+        column = unfiltered.venue_scores[:, ordinal] if venue_id in allowed else np.zeros(len(QUERIES))
+        assert np.array_equal(filtered.venue_scores[:, ordinal], column), venue_id
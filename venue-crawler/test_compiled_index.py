@@ -0,0 +1,129 @@
+"""Compiled index - a reopened snapshot answers like the venue files it was built from"""
+
+import json
+import shutil
+
+import numpy as np
+import pytest
+
+from config import VENUES_DIR
+from conftest import keyword_map
+from search import index_store
+from search.filter_columns import FilterColumns
+from search.fuzzy_index import TrigramIndex
+from search.index_store import CompiledIndex, StringTable, source_signature
+from search.venue_search import VenueSearchEngine
+
+QUERIES = ["Casino Hotel", "crowne plaza kochi", "wedding venue", "the croft", "le meridien"]
+FILTERS = [None, {'min_capacity': 300}, {'has_kitchen': True, 'price_max': 1500}]
+
+
+@pytest.fixture
+def venues_dir(tmp_path):
+    """Private copy of the venue files, so they can be edited"""
+    directory = tmp_path / "venues"
+    shutil.copytree(VENUES_DIR, directory)
+    return directory
+
+
+def load_venues(venues_dir):
+    venues = {}
+    for venue_file in venues_dir.glob("*.json"):
+        with open(venue_file, 'r', encoding='utf-8') as f:
+            venue = json.load(f)
+        venues[venue['venue_id']] = venue
+    return venues
+
+
+def answers(engine):
+    return [[(venue['venue_id'], venue['match_score']) for venue in engine.search(query, filters)]
+            for query in QUERIES for filters in FILTERS]
+
+
+def test_string_table_lookup():
+    strings = ["kochi", "", "café", "banquet hall", "Kochi", "zz", "a"]
+    buffer, offsets, sorted_order = StringTable.pack(strings)
+    table = StringTable(buffer, offsets, sorted_order)
+    assert list(table) == strings and table[2] == "café" and table[-1] == "a" and table[1:3] == ["", "café"]
+    for ordinal, string in enumerate(strings):
+        assert table.index(string) == ordinal
+    assert table.index("missing") == -1 and "missing" not in table and "Kochi" in table
+    with pytest.raises(IndexError):
+        table[len(strings)]
+
+
+def test_snapshot_matches_source_files(venues_dir, tmp_path):
+    engine = VenueSearchEngine(venues_dir, tmp_path / "index")
+    venues = load_venues(venues_dir)
+
+    assert engine.get_venue_count() == len(venues)
+    assert {venue['venue_id']: venue for venue in engine.get_all_venues()} == venues
+    for venue_id, venue in venues.items():
+        assert engine.get_venue_by_id(venue_id) == venue
+    assert engine.get_venue_by_id("no_such_venue") is None
+
+    # Keywords, trigram postings and filter columns equal the in-memory structures they replace
+    documents = list(engine.venues)
+    assert list(engine.keywords) == list(keyword_map(documents))
+    built = TrigramIndex(list(engine.keywords))
+    for query in QUERIES + ["casino", "kochi"]:
+        assert engine.fuzzy_index.candidates(query.lower(), 80) == built.candidates(query.lower(), 80)
+    columns = FilterColumns(documents)
+    for filters in FILTERS[1:] + [{'has_parking': True}, {'venue_type': 'hotel_banquet'}]:
+        assert np.array_equal(engine.filter_columns.mask(filters), columns.mask(filters))
+
+
+def test_reopen_rebuild_and_prune(venues_dir, tmp_path, monkeypatch):
+    index_dir = tmp_path / "index"
+    first = VenueSearchEngine(venues_dir, index_dir)
+    expected = answers(first)
+
+    # Unchanged files: the snapshot is reopened, not rebuilt
+    def no_build(*args, **kwargs):
+        raise AssertionError("index rebuilt for unchanged venue files")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(CompiledIndex, 'build', no_build)
+        reopened = VenueSearchEngine(venues_dir, index_dir)
+    assert reopened.index.signature == first.index.signature
+    assert answers(reopened) == expected
+    assert answers(VenueSearchEngine(venues_dir, index_dir, rebuild_index=True)) == expected
+
+    # Editing a venue file changes the signature: recompile, and drop the superseded snapshot
+    venue_file = venues_dir / "kochi_the_croft_008.json"
+    venue = json.loads(venue_file.read_text(encoding='utf-8'))
+    venue['basic_info']['aliases'].append("Zephyr Courtyard")
+    venue_file.write_text(json.dumps(venue), encoding='utf-8')
+    edited = VenueSearchEngine(venues_dir, index_dir)
+    assert edited.index.signature == source_signature(venues_dir) != first.index.signature
+    assert edited.search("Zephyr Courtyard")[0]['venue_id'] == venue['venue_id']
+    assert sorted(path.name for path in index_dir.iterdir()) == [edited.index.signature]
+
+
+def test_prune_keeps_other_venue_directories(venues_dir, tmp_path):
+    """Engines over different venue directories share an index dir without deleting each other's snapshots"""
+    index_dir = tmp_path / "index"
+    other_dir = tmp_path / "other_venues"
+    shutil.copytree(venues_dir, other_dir)
+    (other_dir / "kochi_the_croft_008.json").unlink()
+    other = VenueSearchEngine(other_dir, index_dir)
+    first = VenueSearchEngine(venues_dir, index_dir)
+
+    (venues_dir / "kochi_the_croft_008.json").unlink()
+    edited = VenueSearchEngine(venues_dir, index_dir)
+    assert sorted(path.name for path in index_dir.iterdir()) == sorted([other.index.signature, edited.index.signature])
+    assert first.index.signature not in {other.index.signature, edited.index.signature}
+    assert answers(VenueSearchEngine(other_dir, index_dir)) == answers(other)
+
+
+def test_unreadable_or_outdated_snapshots_are_rebuilt(venues_dir, tmp_path, monkeypatch):
+    index_dir = tmp_path / "index"
+    expected = answers(VenueSearchEngine(venues_dir, index_dir))
+    signature = source_signature(venues_dir)
+
+    (index_dir / signature / "keywords_offsets.npy").write_bytes(b"corrupt")
+    assert CompiledIndex.open(index_dir, signature) is None
+    assert answers(VenueSearchEngine(venues_dir, index_dir)) == expected
+
+    monkeypatch.setattr(index_store, 'INDEX_FORMAT_VERSION', index_store.INDEX_FORMAT_VERSION + 1)
+    assert CompiledIndex.open(index_dir, signature) is None
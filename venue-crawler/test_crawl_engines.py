@@ -0,0 +1,53 @@
+"""Crawl engines - every engine saves the same venues as the sequential sync engine"""
+
+from conftest import FixtureCrawler, saved_venues
+
+
+def crawl(site, crawl_dirs, engine, **kwargs):
+    venues_dir = crawl_dirs(engine)
+    venues = FixtureCrawler(site.url).crawl_all(engine=engine, **kwargs)
+    return venues, saved_venues(venues_dir)
+
+
+def test_async_engine_matches_sync(site, crawl_dirs):
+    site.detail_delay = 0.05
+    site.broken.add('/venue/hall-003')
+
+    sync_venues, sync_saved = crawl(site, crawl_dirs, 'sync')
+    assert site.max_in_flight == 1
+
+    site.max_in_flight = 0
+    async_venues, async_saved = crawl(site, crawl_dirs, 'async')
+
+    assert len(sync_saved) == len(site.venues) - 1 and 'fixture_hall_003' not in sync_saved
+    assert async_saved == sync_saved
+    assert sorted(v.venue_id for v in async_venues) == sorted(v.venue_id for v in sync_venues)
+    assert site.max_in_flight > 1
+
+
+def test_async_engine_respects_limit(site, crawl_dirs):
+    venues, saved = crawl(site, crawl_dirs, 'async', max_venues=4)
+    assert sorted(saved) == [f"fixture_hall_{i:03d}" for i in range(4)]
+    assert len(venues) == 4
+
+
+def test_pipeline_engine_matches_sync(site, crawl_dirs):
+    site.broken.add('/venue/hall-003')
+    _, sync_saved = crawl(site, crawl_dirs, 'sync')
+
+    venues_dir = crawl_dirs('pipeline')
+    crawler = FixtureCrawler(site.url)
+    venues = crawler.crawl_all(engine='pipeline')
+    assert saved_venues(venues_dir) == sync_saved
+    assert sorted(venue.venue_id for venue in venues) == sorted(sync_saved)
+    assert crawler.last_crawl_stats == {'added': len(site.venues) - 1, 'changed': 0, 'unchanged': 0,
+                                        'removed': 0, 'failed': 1}
+
+    # Incremental re-run through the pipeline: only the renamed venue is parsed into a change
+    site.venues['hall-005'] = ("Renamed Hall", 700)
+    crawler = FixtureCrawler(site.url)
+    crawler.http_cache.ttl_seconds = 0
+    crawler.crawl_all(engine='pipeline', incremental=True)
+    assert crawler.last_crawl_stats['changed'] == 1
+    assert crawler.last_crawl_stats['unchanged'] == len(site.venues) - 2
+    assert saved_venues(venues_dir)['fixture_hall_005']['basic_info']['official_name'] == "Renamed Hall"
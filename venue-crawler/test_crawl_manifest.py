@@ -0,0 +1,68 @@
+"""Crawl manifest - fingerprints, and incremental re-crawls that match a full crawl"""
+
+from datetime import datetime
+
+import pytest
+
+from conftest import FixtureCrawler, saved_venues
+from crawl_manifest import CrawlManifest, fingerprint_venue
+
+
+def test_fingerprint_ignores_volatile_fields():
+    venue = {'venue_id': 'a', 'basic_info': {'official_name': 'A', 'aliases': ['A']}, 'last_updated': datetime.now()}
+    reordered = {'last_updated': '2020-01-01', 'basic_info': {'aliases': ['A'], 'official_name': 'A'}, 'venue_id': 'a'}
+    assert fingerprint_venue(venue) == fingerprint_venue(reordered)
+
+    renamed = dict(venue, basic_info={'official_name': 'B', 'aliases': ['A']})
+    assert fingerprint_venue(renamed) != fingerprint_venue(venue)
+
+
+def test_manifest_roundtrip(tmp_path):
+    manifest = CrawlManifest('fixture', tmp_path)
+    manifest.record('venue_a', 'https://example.com/a', 'h1', 'd1')
+    manifest.record('venue_b', 'https://example.com/b', 'h2', 'd2')
+    manifest.save()
+
+    reloaded = CrawlManifest('fixture', tmp_path)
+    venue_id, entry = reloaded.lookup('https://example.com/b')
+    assert venue_id == 'venue_b' and entry['html_hash'] == 'h2' and entry['data_hash'] == 'd2'
+    assert reloaded.lookup('https://example.com/c') == (None, None)
+
+    assert reloaded.remove_unlisted(['https://example.com/a']) == ['venue_b']
+    assert reloaded.lookup('https://example.com/b') == (None, None)
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async'])
+def test_incremental_crawl_matches_full_crawl(site, crawl_dirs, engine):
+    venues_dir = crawl_dirs(engine)
+    crawler = FixtureCrawler(site.url)
+    crawler.crawl_all(engine=engine, incremental=True)
+    assert crawler.last_crawl_stats['added'] == len(site.venues)
+    mtimes = {path.name: path.stat().st_mtime_ns for path in venues_dir.iterdir()}
+
+    # Nothing changed: no venue file is rewritten
+    crawler = FixtureCrawler(site.url)
+    crawler.http_cache.ttl_seconds = 0
+    crawler.crawl_all(engine=engine, incremental=True)
+    assert crawler.last_crawl_stats['unchanged'] == len(site.venues)
+    assert {path.name: path.stat().st_mtime_ns for path in venues_dir.iterdir()} == mtimes
+
+    # Markup-only change, one renamed venue, one delisted venue
+    site.banner = '<div class="ad">Book now</div>'
+    site.venues['hall-002'] = ("Renamed Hall", 640)
+    del site.venues['hall-007']
+    crawler = FixtureCrawler(site.url)
+    crawler.http_cache.ttl_seconds = 0
+    crawler.crawl_all(engine=engine, incremental=True)
+    assert crawler.last_crawl_stats == {
+        'added': 0, 'changed': 1, 'unchanged': len(site.venues) - 1, 'removed': 1, 'failed': 0
+    }
+    changed = {path.name for path in venues_dir.iterdir() if mtimes.get(path.name) != path.stat().st_mtime_ns}
+    assert changed == {'fixture_hall_002.json'}
+
+    # Same venue data as a from-scratch full crawl of the current site (delisted files are kept)
+    full_dir = crawl_dirs(f"{engine}-full")
+    FixtureCrawler(site.url).crawl_all(engine=engine)
+    incremental = saved_venues(venues_dir)
+    assert incremental.pop('fixture_hall_007')
+    assert incremental == saved_venues(full_dir)
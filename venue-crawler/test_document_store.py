@@ -0,0 +1,77 @@
+"""Document store - lazily decoded, LRU-cached documents equal the venue files"""
+
+import json
+import random
+import threading
+
+import pytest
+
+from config import VENUES_DIR
+from search.index_store import DocumentStore, StringTable
+from search.venue_search import VenueSearchEngine
+
+MATCH_FIELDS = ('match_score', 'match_type', 'matched_keyword')
+
+
+def make_store(count, cache_size):
+    documents = [{'venue_id': f"doc_{i}", 'tags': ['x'] * (i % 3), 'name': f"Hall {i}"} for i in range(count)]
+    blob = StringTable(*StringTable.pack([json.dumps(document) for document in documents]))
+    return documents, DocumentStore(blob, cache_size)
+
+
+def test_lru_eviction_and_stats():
+    documents, store = make_store(10, cache_size=3)
+    for ordinal in (0, 1, 2, 0, 3):  # 1 is the least recently used when 3 arrives
+        assert store[ordinal] == documents[ordinal]
+    assert store.stats() == {'cached': 3, 'capacity': 3, 'hits': 1, 'misses': 4}
+    assert list(store._cache.entries) == [2, 0, 3]
+
+    # Catalogue scans decode past the cache
+    assert list(store) == documents
+    assert list(store._cache.entries) == [2, 0, 3] and store.stats()['misses'] == 4
+
+    # Stores extended by incremental updates append decoded documents and share the cache
+    extended = store.extended([{'venue_id': 'added'}])
+    assert len(extended) == 11 and extended[10] == {'venue_id': 'added'} and list(extended)[-1] == extended[10]
+    assert extended[3] == documents[3] and store.stats()['hits'] == 2
+
+    _, uncached = make_store(3, cache_size=0)
+    assert uncached[2] == documents[2] and uncached.stats()['cached'] == 0
+
+
+def test_concurrent_reads():
+    documents, store = make_store(200, cache_size=16)
+    errors = []
+
+    def read(seed):
+        rng = random.Random(seed)
+        for _ in range(500):
+            ordinal = rng.randrange(len(documents))
+            if store[ordinal] != documents[ordinal]:
+                errors.append(ordinal)
+
+    threads = [threading.Thread(target=read, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = store.stats()
+    assert not errors and stats['cached'] <= 16 and stats['hits'] + stats['misses'] == 8 * 500
+
+
+@pytest.mark.parametrize("cache_size", [0, 1, 256])
+def test_results_carry_full_documents(tmp_path, cache_size):
+    venues = {}
+    for venue_file in VENUES_DIR.glob("*.json"):
+        with open(venue_file, 'r', encoding='utf-8') as f:
+            venue = json.load(f)
+        venues[venue['venue_id']] = venue
+
+    engine = VenueSearchEngine(index_directory=tmp_path)
+    engine.venues._cache.capacity = cache_size
+    for query, filters in [("wedding venue kochi", None), ("bolgatty palace", {'min_capacity': 300}), ("taj malabar", None)]:
+        results = engine.search(query, filters, max_results=3)
+        assert results, query
+        for result in results:
+            assert {key: value for key, value in result.items() if key not in MATCH_FIELDS} == venues[result['venue_id']]
+    assert engine.venues.stats()['cached'] <= cache_size
@@ -0,0 +1,90 @@
+"""Filter columns - vectorized filter masks select the same venues as the original per-venue checks"""
+
+import copy
+import json
+import random
+
+import pytest
+
+from conftest import SAMPLE_VENUE_FILE
+from search.filter_columns import FilterColumns
+from search.venue_search import VenueSearchEngine
+
+
+FILTER_VALUES = [
+    ('min_capacity', [0, 100, 300, 1000]),
+    ('max_capacity', [250, 600]),
+    ('has_kitchen', [True, False]),
+    ('has_parking', [True, False]),
+    ('has_accommodation', [True, False]),
+    ('venue_type', ['resort', 'hotel_banquet', 'no_such_type']),
+    ('price_max', [0, 1000, 2000]),
+]
+
+
+def baseline_passes(venue, filters):
+    """The per-venue checks VenueSearchEngine._apply_filters ran before filter columns"""
+    if 'min_capacity' in filters or 'max_capacity' in filters:
+        event_spaces = venue.get('capacity', {}).get('event_spaces', [])
+        min_required = filters.get('min_capacity', 0)
+        max_required = filters.get('max_capacity', float('inf'))
+        if not any(min_required <= space.get('max_guests', 0) <= max_required for space in event_spaces):
+            return False
+    if 'has_kitchen' in filters and not venue.get('catering', {}).get('in_house_catering'):
+        return False
+    if 'has_parking' in filters:
+        parking_capacity = venue.get('capacity', {}).get('parking_capacity')
+        if not parking_capacity or parking_capacity < 1:
+            return False
+    if filters.get('has_accommodation') and not venue.get('facilities', {}).get('accommodation_available'):
+        return False
+    if 'venue_type' in filters and venue.get('basic_info', {}).get('venue_type') != filters['venue_type']:
+        return False
+    if 'price_max' in filters:
+        price_max_venue = venue.get('pricing', {}).get('per_plate_cost_max')
+        if price_max_venue and price_max_venue > filters['price_max']:
+            return False
+    return True
+
+
+def make_venues(count, rng):
+    """Copies of the sample venue with every filterable field varied, including missing values"""
+    with open(SAMPLE_VENUE_FILE, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    venues = []
+    for i in range(count):
+        venue = copy.deepcopy(sample)
+        venue['venue_id'] = f"filter_{i}"
+        venue['capacity']['parking_capacity'] = rng.choice([None, 0, 5, 100])
+        venue['capacity']['event_spaces'] = [{'max_guests': rng.choice([50, 200, 250, 500, 1200])}
+                                             for _ in range(rng.randint(0, 3))]
+        venue['catering']['in_house_catering'] = rng.choice([True, False, None])
+        venue['facilities']['accommodation_available'] = rng.choice([True, False])
+        venue['pricing']['per_plate_cost_max'] = rng.choice([None, 0, 800, 1000, 1500, 3000])
+        venue['basic_info']['venue_type'] = rng.choice(['hotel_banquet', 'resort', 'convention_center'])
+        venues.append(venue)
+    return venues
+
+
+def random_filters(rng):
+    return {key: rng.choice(values) for key, values in FILTER_VALUES if rng.random() < 0.4}
+
+
+def test_mask_matches_per_venue_checks():
+    rng = random.Random(13)
+    venues = make_venues(300, rng)
+    columns = FilterColumns(venues)
+    for _ in range(500):
+        filters = random_filters(rng)
+        assert columns.mask(filters).tolist() == [baseline_passes(venue, filters) for venue in venues], filters
+    assert FilterColumns([]).mask({'min_capacity': 10}).tolist() == []
+
+
+@pytest.mark.parametrize("filters", [
+    {}, {'min_capacity': 300}, {'max_capacity': 400, 'has_parking': True}, {'has_kitchen': True},
+    {'venue_type': 'hotel_banquet', 'price_max': 1500}, {'has_accommodation': True, 'min_capacity': 1000}
+])
+def test_engine_filters_match_per_venue_checks(filters, tmp_path):
+    engine = VenueSearchEngine(index_directory=tmp_path)
+    expected = [venue['venue_id'] for venue in engine.venues if baseline_passes(venue, filters)]
+    assert [venue['venue_id'] for venue in engine.filter_venues(filters)] == expected
@@ -0,0 +1,92 @@
+"""Fuzzy index - trigram pruning never drops a keyword a full fuzzy scan would match"""
+
+import random
+from fuzzywuzzy import fuzz, process
+
+from search.fuzzy_index import TrigramIndex, sort_key
+
+WORDS = [
+    'grand', 'hyatt', 'bolgatty', 'casino', 'hotel', 'crowne', 'plaza', 'taj', 'malabar', 'le', 'meridien',
+    'ramada', 'resort', 'croft', 'trinita', 'casa', 'palace', 'marine', 'drive', 'kochi', 'ernakulam',
+    'banquet', 'hall', 'convention', 'centre', 'auditorium', 'lakeside', 'residency', 'gardens', 'island'
+]
+THRESHOLDS = [50, 60, 70, 80, 90, 100]
+
+
+def make_keywords(count, rng):
+    keywords = set()
+    while len(keywords) < count:
+        words = rng.sample(WORDS, rng.randint(1, 4))
+        keywords.add(' '.join(words) + (f' {rng.randint(1, 99)}' if rng.random() < 0.5 else ''))
+    return sorted(keywords)
+
+
+def typo(text, rng):
+    """Drop, swap or insert up to three characters"""
+    chars = list(text)
+    for _ in range(rng.randint(0, 3)):
+        position = rng.randrange(len(chars))
+        operation = rng.choice(('drop', 'swap', 'insert'))
+        if operation == 'drop' and len(chars) > 2:
+            del chars[position]
+        elif operation == 'swap' and position + 1 < len(chars):
+            chars[position], chars[position + 1] = chars[position + 1], chars[position]
+        else:
+            chars.insert(position, rng.choice('abcdefghijklmnopqrstuvwxyz '))
+    return ''.join(chars)
+
+
+def make_queries(keywords, count, rng):
+    queries = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            queries.append(typo(rng.choice(keywords), rng))
+        elif kind < 0.8:
+            queries.append(' '.join(rng.sample(WORDS, rng.randint(1, 3))))
+        else:
+            queries.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(rng.randint(1, 20))))
+    return queries
+
+
+def missed_matches(index, keywords, queries):
+    """(query, threshold, keywords matched by a full scan but not among the candidates)"""
+    missed = []
+    for query in queries:
+        for threshold in THRESHOLDS:
+            expected = {keyword for keyword, _ in process.extractBests(
+                query, keywords, scorer=fuzz.token_sort_ratio, score_cutoff=threshold, limit=None)}
+            dropped = expected - set(index.candidates(query, threshold))
+            if dropped:
+                missed.append((query, threshold, sorted(dropped)))
+    return missed
+
+
+def test_candidates_cover_full_scan():
+    rng = random.Random(11)
+    keywords = make_keywords(400, rng)
+    missed = missed_matches(TrigramIndex(keywords), keywords, make_queries(keywords, 100, rng))
+    assert not missed, f"{len(missed)} dropped, e.g. {missed[:3]}"
+
+
+def test_extended_candidates_cover_full_scan():
+    """Keywords appended by incremental updates are pruned with the same bound"""
+    rng = random.Random(12)
+    keywords = make_keywords(300, rng)
+    base, added = keywords[::2], keywords[1::2]
+    combined = base + added
+    index = TrigramIndex(base).extended(combined, [sort_key(keyword) for keyword in combined])
+    missed = missed_matches(index, combined, make_queries(keywords, 100, rng))
+    assert not missed, f"{len(missed)} dropped, e.g. {missed[:3]}"
+
+
+def test_top_matches_equal_full_scan():
+    """What the engine takes from process.extract: the top 20 above the threshold, in order"""
+    rng = random.Random(13)
+    keywords = make_keywords(1000, rng)
+    index = TrigramIndex(keywords)
+    for query in make_queries(keywords, 100, rng):
+        for threshold in (60, 70, 80):
+            full = process.extract(query, keywords, scorer=fuzz.token_sort_ratio, limit=20)
+            pruned = process.extract(query, index.candidates(query, threshold), scorer=fuzz.token_sort_ratio, limit=20)
+            assert [m for m in pruned if m[1] >= threshold] == [m for m in full if m[1] >= threshold], query
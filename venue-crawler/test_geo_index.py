@@ -0,0 +1,131 @@
+"""Geo index - grid radius and nearest-venue search return what a full haversine scan does"""
+
+import random
+
+import numpy as np
+import pytest
+
+from config import VENUES_DIR
+from search.geo_index import GeoIndex, haversine_km
+from search.venue_search import VenueSearchEngine
+
+
+def make_venues(count, rng):
+    """Mostly clustered around Kochi, plus points spread worldwide (poles and antimeridian included)"""
+    venues = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            point = (9.9 + rng.gauss(0, 0.1), 76.28 + rng.gauss(0, 0.1))
+        elif kind < 0.7:
+            point = (rng.uniform(85, 90) * rng.choice((-1, 1)), rng.uniform(-180, 180))
+        elif kind < 0.8:
+            point = (rng.uniform(-60, 60), rng.choice((-1, 1)) * rng.uniform(178, 180))
+        else:
+            point = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+        coordinates = None if rng.random() < 0.05 else {'latitude': point[0], 'longitude': point[1]}
+        venues.append({'venue_id': f"geo_{i}", 'location': {'coordinates': coordinates}})
+    return venues
+
+
+def make_index(venues):
+    arrays = GeoIndex.build_arrays(venues)
+    return GeoIndex(arrays['latitudes'], arrays['longitudes'], arrays['order'], arrays['cells'])
+
+
+def make_queries(venues, count, rng):
+    located = [venue['location']['coordinates'] for venue in venues if venue['location']['coordinates']]
+    queries = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            coordinates = rng.choice(located)
+            queries.append((coordinates['latitude'], coordinates['longitude']))
+        else:
+            queries.append((rng.uniform(-90, 90), rng.uniform(-180, 180)))
+    return queries
+
+
+def check_index(index, queries, rng, mask=None):
+    """Mismatches between the index and a full scan: (query, radius or k, expected, got)"""
+    mismatches = []
+    for latitude, longitude in queries:
+        distances = haversine_km(latitude, longitude, index.latitudes, index.longitudes)
+        eligible = ~np.isnan(distances) if mask is None else ~np.isnan(distances) & mask
+
+        for radius_km in (0.5, 5, 50, 500, 5000):
+            expected = sorted(np.flatnonzero(eligible & (distances <= radius_km)).tolist())
+            ordinals, _ = index.within(latitude, longitude, radius_km, mask)
+            if sorted(ordinals.tolist()) != expected:
+                mismatches.append(((latitude, longitude), radius_km, len(expected), len(ordinals)))
+
+        k = rng.choice((1, 5, 25))
+        expected = np.sort(distances[eligible])[:k]
+        _, nearest = index.nearest(latitude, longitude, k, mask)
+        if not np.allclose(nearest, expected):
+            mismatches.append(((latitude, longitude), f"k={k}", expected.tolist(), nearest.tolist()))
+    return mismatches
+
+
+def test_within_and_nearest_match_full_scan():
+    rng = random.Random(19)
+    venues = make_venues(3000, rng)
+    mismatches = check_index(make_index(venues), make_queries(venues, 150, rng), rng)
+    assert not mismatches, f"{len(mismatches)} mismatches, e.g. {mismatches[:3]}"
+
+
+def test_masked_and_extended_match_full_scan():
+    """Filters (mask) and venues appended by incremental updates use the same grid"""
+    rng = random.Random(20)
+    venues = make_venues(3000, rng)
+    index = make_index(venues[:2000]).extended(venues[2000:])
+    mask = np.array([rng.random() < 0.5 for _ in venues])
+    mismatches = check_index(index, make_queries(venues, 150, rng), rng, mask)
+    assert not mismatches, f"{len(mismatches)} mismatches, e.g. {mismatches[:3]}"
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    return VenueSearchEngine(VENUES_DIR, tmp_path_factory.mktemp("index"))
+
+
+def scan(engine, point, filters=None):
+    """(venue_id, distance_km) of every located venue passing the filters, nearest first"""
+    allowed = {venue['venue_id'] for venue in engine.filter_venues(filters or {})}
+    located = []
+    for venue in engine.venues:
+        coordinates = venue['location'].get('coordinates')
+        if coordinates and venue['venue_id'] in allowed:
+            distance = haversine_km(point[0], point[1], np.array([coordinates['latitude']]),
+                                    np.array([coordinates['longitude']]))[0]
+            located.append((venue['venue_id'], round(float(distance), 2)))
+    return sorted(located, key=lambda item: item[1])
+
+
+@pytest.mark.parametrize("filters", [None, {'min_capacity': 300}, {'has_kitchen': True}])
+def test_search_nearby_matches_scan(engine, filters):
+    point = (9.9312, 76.2673)
+    expected = scan(engine, point, filters)
+    nearest = engine.search_nearby(point, filters=filters, max_results=4)
+    assert [(venue['venue_id'], venue['distance_km']) for venue in nearest] == expected[:4]
+    assert all(venue['match_type'] == 'nearby' for venue in nearest)
+
+    within = engine.search_nearby({'latitude': point[0], 'longitude': point[1]}, radius_km=8, filters=filters,
+                                  max_results=50)
+    assert [(venue['venue_id'], venue['distance_km']) for venue in within] == [
+        item for item in expected if item[1] <= 8]
+
+
+def test_near_filter_and_area_names(engine):
+    latitude, longitude = engine.resolve_point("Willingdon Island")
+    located = [venue['location']['coordinates'] for venue in engine.search_by_location("Willingdon Island")]
+    assert latitude == pytest.approx(np.mean([c['latitude'] for c in located]))
+    assert longitude == pytest.approx(np.mean([c['longitude'] for c in located]))
+    with pytest.raises(ValueError):
+        engine.resolve_point("Atlantis")
+
+    near = {'near': "Willingdon Island", 'radius_km': 3}
+    inside = {venue_id for venue_id, distance in scan(engine, (latitude, longitude)) if distance <= 3}
+    assert inside and {venue['venue_id'] for venue in engine.filter_venues(near)} == inside
+    results = engine.search("wedding venue kochi", near, max_results=50)
+    assert {venue['venue_id'] for venue in results} <= inside
+    assert set(results[0]) >= {'match_score', 'match_type'}
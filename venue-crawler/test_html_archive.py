@@ -0,0 +1,73 @@
+"""HTML archive - deduplicated snapshots, and offline re-parsing that matches a fresh crawl"""
+
+import pytest
+
+from conftest import FixtureCrawler, saved_venues
+from html_archive import HtmlArchive
+
+
+class BrandedCrawler(FixtureCrawler):
+    """An updated extractor: also fills in the brand name"""
+
+    def parse_venue_details(self, venue_url, html_content):
+        venue = super().parse_venue_details(venue_url, html_content)
+        if venue:
+            venue['basic_info']['brand_name'] = venue['basic_info']['official_name'].split()[0]
+        return venue
+
+
+def test_snapshots_are_deduplicated(tmp_path):
+    archive = HtmlArchive(tmp_path, codec='gzip')
+    first = archive.store('fixture', 'https://example.com/a', '<html>v1</html>', name='A', fetched_at=1.0)
+    assert archive.store('fixture', 'https://example.com/a', '<html>v1</html>', fetched_at=2.0) == first
+    assert archive.store('fixture', 'https://example.com/b', '<html>v1</html>', fetched_at=3.0) == first
+    second = archive.store('fixture', 'https://example.com/a', '<html>v2</html>', fetched_at=4.0)
+
+    assert [snapshot['content_hash'] for snapshot in archive.history('fixture', 'https://example.com/a')] == [
+        second, first
+    ]
+    assert len(list((tmp_path / "blobs").rglob('*.html.gz'))) == 2
+    assert {page['url']: page['html'] for page in archive.iter_latest_pages('fixture')} == {
+        'https://example.com/a': '<html>v2</html>', 'https://example.com/b': '<html>v1</html>'
+    }
+    assert archive.latest('other') == []
+
+
+def test_unknown_codec(tmp_path):
+    with pytest.raises(ValueError):
+        HtmlArchive(tmp_path, codec='brotli')
+
+
+def test_reparse_matches_a_fresh_crawl_without_network(site, crawl_dirs):
+    venues_dir = crawl_dirs('archived')
+    FixtureCrawler(site.url).crawl_all(engine='sync')
+    archived = saved_venues(venues_dir)
+    requests = len(site.requests)
+    assert len(HtmlArchive(venues_dir.parent / "archive").latest('fixture')) == len(site.venues)
+
+    crawler = FixtureCrawler(site.url)
+    assert len(crawler.reparse_archive()) == len(site.venues)
+    assert crawler.last_crawl_stats['unchanged'] == len(site.venues)
+    assert saved_venues(venues_dir) == archived
+
+    # A changed extractor rewrites every venue from the archived pages alone
+    crawler = BrandedCrawler(site.url)
+    crawler.reparse_archive()
+    assert crawler.last_crawl_stats['changed'] == len(site.venues)
+    assert len(site.requests) == requests
+
+    # Re-parsing only reads the archive: no snapshot is re-stored or re-timestamped
+    archive = HtmlArchive(venues_dir.parent / "archive")
+    snapshots = archive.latest('fixture')
+    history = [archive.history('fixture', snapshot['url']) for snapshot in snapshots]
+    stored = []
+    crawler = BrandedCrawler(site.url)
+    crawler.archive.store = lambda *args, **kwargs: stored.append(args)
+    crawler.reparse_archive()
+    assert crawler.last_crawl_stats['unchanged'] == len(site.venues) and stored == []
+    assert archive.latest('fixture') == snapshots
+    assert [archive.history('fixture', snapshot['url']) for snapshot in snapshots] == history
+
+    fresh_dir = crawl_dirs('fresh')
+    BrandedCrawler(site.url).crawl_all(engine='sync')
+    assert saved_venues(venues_dir) == saved_venues(fresh_dir)
@@ -0,0 +1,71 @@
+"""HTTP cache - validators, freshness, and re-crawls that revalidate instead of refetching"""
+
+import pytest
+
+from conftest import FixtureCrawler, saved_venues
+from http_cache import HttpCache
+
+
+def detail_requests(site):
+    return [headers for path, headers in site.requests if path.startswith('/venue/')]
+
+
+def test_store_and_revalidate(tmp_path):
+    cache = HttpCache(tmp_path, ttl_hours=1)
+    url = "https://example.com/venue/a"
+    assert cache.get(url) is None
+    assert cache.conditional_headers(None) == {}
+
+    cache.store(url, "<html>a</html>", {'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+    entry = cache.get(url)
+    assert entry['body'] == "<html>a</html>" and cache.is_fresh(entry)
+    assert cache.conditional_headers(entry) == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'
+    }
+
+    # A 304 keeps the body, refreshes the validators it sent and restarts the TTL
+    entry_time = entry['fetched_at']
+    cache.touch(url, {'ETag': '"v2"'})
+    entry = cache.get(url)
+    assert entry['body'] == "<html>a</html>" and entry['etag'] == '"v2"'
+    assert entry['last_modified'] == 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert entry['fetched_at'] >= entry_time
+
+    assert not HttpCache(tmp_path, ttl_hours=0).is_fresh(entry)
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async'])
+def test_fresh_pages_skip_the_network(site, crawl_dirs, engine):
+    venues_dir = crawl_dirs(engine)
+    FixtureCrawler(site.url).crawl_all(engine=engine)
+    first = saved_venues(venues_dir)
+    fetched = len(detail_requests(site))
+
+    FixtureCrawler(site.url).crawl_all(engine=engine)
+    assert len(detail_requests(site)) == fetched
+    assert saved_venues(venues_dir) == first
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async'])
+def test_stale_pages_are_revalidated(site, crawl_dirs, engine):
+    venues_dir = crawl_dirs(engine)
+    FixtureCrawler(site.url).crawl_all(engine=engine)
+    first = saved_venues(venues_dir)
+    site.requests.clear()
+    site.served.clear()
+
+    site.venues['hall-004'] = ("Renamed Hall", 900)
+    crawler = FixtureCrawler(site.url)
+    crawler.http_cache.ttl_seconds = 0
+    crawler.crawl_all(engine=engine)
+
+    # Every detail page is asked for conditionally; only the changed one comes back in full
+    requests = detail_requests(site)
+    assert len(requests) == len(site.venues)
+    assert all('If-None-Match' in headers for headers in requests)
+    assert site.served == ['/venue/hall-004']
+
+    second = saved_venues(venues_dir)
+    assert second['fixture_hall_004']['basic_info']['official_name'] == "Renamed Hall"
+    assert {k: v for k, v in second.items() if k != 'fixture_hall_004'} == \
+        {k: v for k, v in first.items() if k != 'fixture_hall_004'}
@@ -0,0 +1,190 @@
+"""Incremental updates - add / update / remove / sync_directory reach every index the engine queries"""
+
+import copy
+import json
+import shutil
+import threading
+import time
+
+import pytest
+
+from config import VENUES_DIR
+from conftest import SAMPLE_VENUE_FILE
+from search import venue_search
+from search.result_cache import MemoryCacheBackend
+from search.venue_search import VenueSearchEngine
+
+VENUE_ID = "test_zephyr_lagoon_001"
+OLD_POINT = (10.5200, 76.2100)      # well away from the Kochi venues
+NEW_POINT = (10.8000, 76.6500)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine over a private copy of the venue files"""
+    shutil.copytree(VENUES_DIR, tmp_path / "venues")
+    return VenueSearchEngine(tmp_path / "venues", tmp_path / "index", cache_backend=MemoryCacheBackend())
+
+
+def make_venue(name, aliases, point):
+    with open(SAMPLE_VENUE_FILE, 'r', encoding='utf-8') as f:
+        venue = copy.deepcopy(json.load(f))
+    venue['venue_id'] = VENUE_ID
+    venue['basic_info'].update({'official_name': name, 'brand_name': None, 'aliases': aliases})
+    venue['location'].update({'address': f"{name}, Lakeshore Road", 'landmark': None,
+                              'coordinates': {'latitude': point[0], 'longitude': point[1]}})
+    venue['search_keywords'] = {'primary_keywords': [name] + aliases, 'secondary_keywords': [], 'location_keywords': []}
+    return venue
+
+
+def found(engine, name, point):
+    """Where the test venue shows up: {query kind: bool}"""
+    def ids(results):
+        return {result['venue_id'] for result in results}
+
+    return {
+        'search': VENUE_ID in ids(engine.search(name)),
+        'search_by_location': VENUE_ID in ids(engine.search_by_location(name)),
+        'search_nearby': VENUE_ID in ids(engine.search_nearby(point, radius_km=2)),
+        'search_keywords': VENUE_ID in ids(engine.search_keywords([name.lower()])),
+        'search_text': VENUE_ID in ids(engine.search_text(name)),
+        'autocomplete': VENUE_ID in ids(engine.autocomplete(name[:6])),
+        'get_venue_by_id': engine.get_venue_by_id(VENUE_ID) is not None
+    }
+
+
+def test_add_update_remove(engine):
+    count = engine.get_venue_count()
+
+    # Cache the (empty) results first: the update must not be hidden by them
+    engine.search("Zephyr Lagoon Retreat")
+    engine.search("Zephyr Lagoon Retreat")
+    assert engine.cache_stats()['results']['hits'] >= 1
+    before = found(engine, "Zephyr Lagoon Retreat", OLD_POINT)
+    assert not any(before.values()), before
+
+    engine.add_venue(make_venue("Zephyr Lagoon Retreat", ["Lagoon Zephyr"], OLD_POINT))
+    added = found(engine, "Zephyr Lagoon Retreat", OLD_POINT)
+    assert all(added.values()), added
+    assert engine.get_venue_count() == count + 1
+    with pytest.raises(ValueError):
+        engine.add_venue(make_venue("Zephyr Lagoon Retreat", [], OLD_POINT))
+
+    engine.update_venue(make_venue("Quartz Bay Pavilion", ["Pavilion Quartz"], NEW_POINT))
+    old = found(engine, "Zephyr Lagoon Retreat", OLD_POINT)
+    assert not any(value for kind, value in old.items() if kind != 'get_venue_by_id'), old
+    new = found(engine, "Quartz Bay Pavilion", NEW_POINT)
+    assert all(new.values()), new
+    assert engine.get_venue_by_id(VENUE_ID)['basic_info']['official_name'] == "Quartz Bay Pavilion"
+    assert engine.get_venue_count() == count + 1
+
+    assert engine.remove_venue(VENUE_ID)
+    removed = found(engine, "Quartz Bay Pavilion", NEW_POINT)
+    assert not any(removed.values()), removed
+    assert engine.get_venue_count() == count
+    assert not engine.remove_venue(VENUE_ID)
+    with pytest.raises(KeyError):
+        engine.update_venue(make_venue("Quartz Bay Pavilion", [], NEW_POINT))
+
+
+def test_sync_directory_matches_rebuild(engine, tmp_path):
+    venues_dir = tmp_path / "venues"
+    with open(venues_dir / f"{VENUE_ID}.json", 'w', encoding='utf-8') as f:
+        json.dump(make_venue("Zephyr Lagoon Retreat", ["Lagoon Zephyr"], OLD_POINT), f)
+    (venues_dir / "kochi_the_croft_008.json").unlink()
+    assert engine.sync_directory() == 2
+    synced = found(engine, "Zephyr Lagoon Retreat", OLD_POINT)
+    assert all(synced.values()), synced
+
+    # Same answers as an index compiled from scratch over the synced files
+    rebuilt = VenueSearchEngine(venues_dir, tmp_path / "rebuilt", cache_backend=MemoryCacheBackend())
+    assert engine.get_venue_count() == rebuilt.get_venue_count()
+    for query in ["Casino Hotel", "The Croft", "wedding venue kochi", "Zephyr Lagoon"]:
+        assert engine.search(query) == rebuilt.search(query), query
+        assert engine.search(query, {'min_capacity': 300}) == rebuilt.search(query, {'min_capacity': 300}), query
+        assert engine.search_text(query) == rebuilt.search_text(query), query
+    assert engine.search_nearby(OLD_POINT, max_results=20) == rebuilt.search_nearby(OLD_POINT, max_results=20)
+    assert engine.search_by_location("Willingdon Island") == rebuilt.search_by_location("Willingdon Island")
+    for prefix in ["c", "ze", "grand h", "bolgaty"]:
+        assert engine.autocomplete(prefix) == rebuilt.autocomplete(prefix), prefix
+
+    (venues_dir / f"{VENUE_ID}.json").unlink()
+    assert engine.sync_directory() == 1
+    deleted = found(engine, "Zephyr Lagoon Retreat", OLD_POINT)
+    assert not any(deleted.values()), deleted
+
+
+def test_concurrent_add_and_remove_apply_once(engine, monkeypatch):
+    """The existence check and the patch are one critical section: racing writers can't both pass it"""
+    count = engine.get_venue_count()
+    apply_changes = engine.apply_changes
+
+    def slow_apply_changes(*args, **kwargs):
+        time.sleep(0.05)  # a writer that checked first must not lose the lock before patching
+        return apply_changes(*args, **kwargs)
+
+    monkeypatch.setattr(engine, 'apply_changes', slow_apply_changes)
+
+    def race(operation):
+        barrier, outcomes = threading.Barrier(8), []
+
+        def run():
+            barrier.wait()
+            try:
+                outcomes.append(operation())
+            except ValueError:
+                outcomes.append('duplicate')
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    added = race(lambda: engine.add_venue(make_venue("Zephyr Lagoon Retreat", [], OLD_POINT)))
+    assert added.count('duplicate') == 7 and engine.get_venue_count() == count + 1
+    assert engine._snapshot.generation == 1
+
+    removed = race(lambda: engine.remove_venue(VENUE_ID))
+    assert removed.count(True) == 1 and engine.get_venue_count() == count
+    assert engine._snapshot.generation == 2
+
+
+def test_compaction_keeps_results(engine, tmp_path, monkeypatch):
+    """Past INDEX_COMPACT_THRESHOLD patched venues the live ones are recompiled, answering the same way"""
+    patched = VenueSearchEngine(tmp_path / "venues", tmp_path / "patched", cache_backend=MemoryCacheBackend())
+
+    def changes(target):
+        for name, point in [("Zephyr Lagoon Retreat", OLD_POINT), ("Quartz Bay Pavilion", NEW_POINT)]:
+            venue = make_venue(name, [name.split()[0]], point)
+            venue['venue_id'] = f"{VENUE_ID}_{name.split()[0].lower()}"
+            yield lambda venue=venue: target.add_venue(venue)
+        yield lambda: target.update_venue(make_venue("Casino Hotel Annexe", [], OLD_POINT) | {'venue_id': 'kochi_casino_hotel_001'})
+        yield lambda: target.remove_venue(f"{VENUE_ID}_quartz")
+        yield lambda: target.remove_venue('kochi_the_croft_008')
+        yield lambda: target.update_venue(make_venue("Zephyr Lagoon Resort", [], NEW_POINT) | {'venue_id': f"{VENUE_ID}_zephyr"})
+
+    for change in changes(patched):
+        change()
+    monkeypatch.setattr(venue_search, 'INDEX_COMPACT_THRESHOLD', 3)
+    versions = [change() for change in changes(engine)]
+
+    # Compacted after the 3rd and 6th change (4 patched venues each time); versions count on
+    assert engine._snapshot.generation == patched._snapshot.generation == 6
+    assert engine.index_version == patched.index_version and len(set(versions[:3])) == 3
+    assert engine._snapshot.live is None and engine._snapshot.patch_count() == 0
+    assert patched._snapshot.patch_count() > 3
+    assert sorted(path.name for path in (tmp_path / "index").iterdir()) == [
+        engine.index.signature.split('+')[0], engine.index.signature
+    ]
+
+    assert engine.get_venue_count() == patched.get_venue_count()
+    for query in ["Casino Hotel", "Zephyr Lagoon", "Quartz Bay", "The Croft", "wedding venue kochi"]:
+        assert engine.search(query) == patched.search(query), query
+        assert engine.search(query, {'min_capacity': 300}) == patched.search(query, {'min_capacity': 300}), query
+        assert engine.search_text(query) == patched.search_text(query), query
+        assert engine.autocomplete(query[:4]) == patched.autocomplete(query[:4]), query
+    assert engine.search_nearby(NEW_POINT, max_results=20) == patched.search_nearby(NEW_POINT, max_results=20)
+    assert engine.search_by_location("Lakeshore") == patched.search_by_location("Lakeshore")
+    assert engine.get_venue_by_id(f"{VENUE_ID}_zephyr")['basic_info']['official_name'] == "Zephyr Lagoon Resort"
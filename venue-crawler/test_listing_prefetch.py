@@ -0,0 +1,37 @@
+"""Listing prefetch - speculative page fetches return what paging one page at a time does"""
+
+from conftest import FixtureCrawler
+
+
+def page_url(site):
+    return lambda page: f"{site.url}/venues?page={page}"
+
+
+def listed(venues):
+    return [(venue['name'], venue['url']) for venue in venues]
+
+
+def test_prefetch_matches_sequential_paging(site, crawl_dirs):
+    crawl_dirs('listing')
+    crawler = FixtureCrawler(site.url)
+    sequential = crawler.get_venue_list()
+
+    for prefetch in (0, 1, 3, 10):
+        venues = crawler.fetch_paginated_listing(page_url(site), max_pages=10, prefetch=prefetch)
+        assert listed(venues) == listed(sequential)
+        assert [venue['preview']['capacity_hint'] for venue in venues] == [
+            f"Up to {site.venues[url.rsplit('/', 1)[-1]][1]} guests" for _, url in listed(sequential)
+        ]
+
+
+def test_prefetch_stops_at_failed_page_and_page_limit(site, crawl_dirs):
+    crawl_dirs('listing')
+    crawler = FixtureCrawler(site.url)
+    site.broken.add('/venues')
+    assert crawler.fetch_paginated_listing(page_url(site), max_pages=10, prefetch=3) == []
+
+    site.broken.clear()
+    site.requests.clear()
+    venues = crawler.fetch_paginated_listing(page_url(site), max_pages=2, prefetch=3)
+    assert len(venues) == 10
+    assert len(site.requested('/venues')) == 2
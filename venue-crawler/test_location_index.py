@@ -0,0 +1,127 @@
+"""Location index - area lookups match a scan of every venue's location tokens"""
+
+import random
+
+import pytest
+
+from config import VENUES_DIR
+from search.location_index import NEARBY, PRIMARY, LocationIndex, tokenize
+from search.venue_search import VenueSearchEngine
+
+PLACES = ['Willingdon Island', 'Marine Drive', 'Fort Kochi', 'Edappally', 'Kakkanad', 'Kaloor', 'Lulu Mall',
+          'Drive In', 'Marine Lines', 'Island Road', 'Metro Station', 'Cochin Port', 'Vyttila Hub']
+
+
+def location_tokens(venue):
+    """token -> best weight, found by tokenizing every location field of one venue"""
+    areas = [area for area in LocationIndex.area_phrases() if ' ' in area]
+    location = venue.get('location') or {}
+    nearby = (location.get('accessibility') or {}).get('landmarks_nearby') or []
+    primary = [location.get('address'), location.get('landmark'), str(location.get('pin_code') or '')]
+
+    weights = {}
+    for weight, texts in ((NEARBY, nearby), (PRIMARY, primary)):
+        for text in texts:
+            tokens = tokenize(text)
+            phrases = [area for area in areas if f" {area} " in f" {' '.join(tokens)} "]
+            for token in tokens + phrases:
+                weights[token] = max(weights.get(token, 0), weight)
+    return weights
+
+
+def scan(venues, area):
+    """venue ordinal -> weight: the phrase rule first, then every query token prefixing a location token"""
+    tokens = tokenize(area)
+    if not tokens:
+        return {}
+    per_venue = [location_tokens(venue) for venue in venues]
+
+    def best(weights, prefix):
+        return max((weight for token, weight in weights.items() if token.startswith(prefix)), default=0)
+
+    if len(tokens) > 1:
+        phrase = ' '.join(tokens)
+        matches = {ordinal: best(weights, phrase) for ordinal, weights in enumerate(per_venue)}
+        matches = {ordinal: weight for ordinal, weight in matches.items() if weight}
+        if matches:
+            return matches
+    matches = {ordinal: min(best(weights, token) for token in tokens) for ordinal, weights in enumerate(per_venue)}
+    return {ordinal: weight for ordinal, weight in matches.items() if weight}
+
+
+def make_venues(count, rng):
+    venues = []
+    for i in range(count):
+        location = {
+            'address': ', '.join(rng.sample(PLACES, rng.randint(1, 3))) + f", Kochi 68{rng.randint(0, 9999):04d}",
+            'landmark': rng.choice([None, '', f"Near {rng.choice(PLACES)}"]),
+            'pin_code': rng.choice([None, f"68{rng.randint(0, 99):02d}"]),
+            'accessibility': rng.choice([None, {'landmarks_nearby': rng.sample(PLACES, rng.randint(0, 3))}])
+        }
+        venues.append({'venue_id': f"location_{i}", 'location': location})
+    return venues
+
+
+def make_index(venues):
+    vocabulary, arrays = LocationIndex.build_arrays(venues)
+    return LocationIndex(vocabulary, arrays['offsets'], arrays['venues'], arrays['weights'])
+
+
+def test_lookup_matches_token_scan():
+    rng = random.Random(18)
+    venues = make_venues(400, rng)
+    index = make_index(venues)
+    queries = PLACES + ['marine', 'marine dr', 'willing isl', 'island', 'dr', 'k', 'kochi 68', '68', 'metro',
+                        'Near', 'lulu mall kochi', 'fort', 'nowhere', '', '  ', '!!!']
+    for area in queries:
+        ordinals, scores = index.lookup(area)
+        assert ordinals.tolist() == sorted(ordinals.tolist()), area
+        expected = {ordinal: 90 if weight == PRIMARY else 80 for ordinal, weight in scan(venues, area).items()}
+        assert dict(zip(ordinals.tolist(), scores.tolist())) == expected, area
+
+
+def test_extended_overlay_matches_one_build():
+    """Venues added over several patches are found as if the index had been built over all of them"""
+    rng = random.Random(19)
+    venues = make_venues(300, rng)
+    index = make_index(venues[:200])
+    for start, end in [(200, 240), (240, 241), (241, 241), (241, 300)]:
+        index = index.extended(venues[start:end], start)
+    built = make_index(venues)
+    for area in PLACES + ['marine', 'willing isl', 'k', 'kochi 68', 'fort', 'nowhere']:
+        ordinals, scores = index.lookup(area)
+        expected_ordinals, expected_scores = built.lookup(area)
+        assert ordinals.tolist() == expected_ordinals.tolist(), area
+        assert scores.tolist() == expected_scores.tolist(), area
+
+
+@pytest.mark.parametrize("area", ["Willingdon Island", "Marine Drive", "Edappally", "Bolgatty", "682304", "Lulu Mall",
+                                  "Maradu", "Kochi"])
+def test_engine_covers_substring_scan(tmp_path, area):
+    engine = VenueSearchEngine(VENUES_DIR, tmp_path)
+    venues = list(engine.venues)
+
+    # Every venue the old address / landmark substring scan found is still found, with its old score
+    results = {result['venue_id']: result['match_score'] for result in engine.search_by_location(area, max_results=50)}
+    for venue in venues:
+        location = venue['location']
+        if area.lower() in location['address'].lower() or area.lower() in location['landmark'].lower():
+            assert results.get(venue['venue_id']) == 90, (area, venue['venue_id'])
+
+    expected = {venues[ordinal]['venue_id']: 90 if weight == PRIMARY else 80
+                for ordinal, weight in scan(venues, area).items()}
+    assert results == expected
+
+
+@pytest.mark.parametrize("area", ["", " ", "   ", ",", "!!!", "-"])
+def test_areas_without_tokens_keep_substring_scan(tmp_path, area):
+    """An empty area listed every venue before the location index: it still does"""
+    engine = VenueSearchEngine(VENUES_DIR, tmp_path)
+    expected = [venue['venue_id'] for venue in engine.venues
+                if area.lower() in venue['location']['address'].lower()
+                or area.lower() in venue['location']['landmark'].lower()]
+    for max_results in (3, 50):
+        results = engine.search_by_location(area, max_results=max_results)
+        assert [result['venue_id'] for result in results] == expected[:max_results]
+        assert all(result['match_score'] == 90 and result['match_type'] == 'location' for result in results)
+    assert len(engine.search_by_location("", max_results=50)) == engine.get_venue_count()
@@ -0,0 +1,93 @@
+"""Keyword postings - sorted venue-ordinal arrays hold exactly what a keyword -> venues map does"""
+
+import random
+
+import numpy as np
+import pytest
+
+from config import VENUES_DIR
+from conftest import keyword_map
+from search.postings import KeywordPostings, intersect, merge_token_postings, union
+from search.venue_search import VenueSearchEngine
+
+WORDS = ['grand', 'hyatt', 'casino', 'crowne', 'plaza', 'malabar', 'ramada', 'croft', 'palace', 'lakeside']
+COMMON = ['kochi', 'wedding venue', 'banquet hall', 'event venue', 'ernakulam']
+
+
+def make_venues(count, rng):
+    """Venues sharing common keywords, repeating keywords across fields, or carrying none"""
+    venues = []
+    for i in range(count):
+        name = ' '.join(rng.sample(WORDS, 2))
+        primary = [name, name.split()[0]] if rng.random() < 0.9 else []
+        secondary = rng.sample(COMMON, rng.randint(0, 3)) + ([name.upper()] if rng.random() < 0.3 else [])
+        aliases = [name.title()] if rng.random() < 0.5 else []
+        venues.append({'venue_id': f"posting_{i}", 'basic_info': {'aliases': aliases},
+                       'search_keywords': {'primary_keywords': primary, 'secondary_keywords': secondary}})
+    return venues
+
+
+def test_postings_match_keyword_map():
+    rng = random.Random(22)
+    for count in (0, 1, 50, 2000):
+        venues = make_venues(count, rng)
+        ordinals = {venue['venue_id']: ordinal for ordinal, venue in enumerate(venues)}
+        postings = KeywordPostings.build(venues, VenueSearchEngine._venue_keywords)
+        expected = {keyword: sorted(ordinals[venue_id] for venue_id in venue_ids)
+                    for keyword, venue_ids in keyword_map(venues).items()}
+
+        assert postings.keywords == list(expected), count
+        for ordinal, venue_list in enumerate(expected.values()):
+            assert postings.posting(ordinal).tolist() == venue_list, (count, postings.keywords[ordinal])
+        assert postings.pair_keywords().tolist() == [
+            ordinal for ordinal, venue_list in enumerate(expected.values()) for _ in venue_list
+        ]
+
+
+def test_intersect_and_union_match_set_operations():
+    rng = random.Random(23)
+    for _ in range(200):
+        lists = [sorted(rng.sample(range(300), rng.randint(0, 60))) for _ in range(rng.randint(1, 4))]
+        arrays = [np.array(values, dtype=np.int32) for values in lists]
+        assert intersect(arrays).tolist() == sorted(set.intersection(*map(set, lists)))
+        assert union(arrays).tolist() == sorted(set.union(*map(set, lists)))
+    assert intersect([]).tolist() == [] and union([]).tolist() == []
+
+
+def test_merge_token_postings_matches_dict_union():
+    rng = random.Random(24)
+
+    def csr(postings):
+        tokens = sorted(postings)
+        offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum([len(postings[token]) for token in tokens], out=offsets[1:])
+        venues = np.array([venue for token in tokens for venue in postings[token]], dtype=np.int32)
+        return tokens, offsets, [venues, venues.astype(np.float32) * 2]
+
+    for _ in range(50):
+        old = {word: sorted(rng.sample(range(100), rng.randint(1, 5))) for word in rng.sample(WORDS, rng.randint(0, 6))}
+        new = {word: sorted(rng.sample(range(100, 150), rng.randint(1, 5))) for word in rng.sample(WORDS, rng.randint(0, 6))}
+        vocabulary, offsets, (venues, doubled) = merge_token_postings(*csr(old), *csr(new))
+        expected = {word: old.get(word, []) + new.get(word, []) for word in set(old) | set(new)}
+        assert vocabulary == sorted(expected)
+        assert {word: venues[offsets[i]:offsets[i + 1]].tolist() for i, word in enumerate(vocabulary)} == expected
+        assert np.array_equal(doubled, venues * 2)
+
+
+@pytest.mark.parametrize("keywords", [["Wedding Venue Kochi"], ["banquet hall kochi", "wedding venue kochi"],
+                                      ["5 star wedding venue", "luxury wedding"], ["kochi", "no such keyword"]])
+def test_search_keywords_matches_set_operations(tmp_path, keywords):
+    engine = VenueSearchEngine(VENUES_DIR, tmp_path)
+    venues = list(engine.venues)
+    mapping = keyword_map(venues)
+    sets = [set(mapping.get(keyword.lower(), [])) for keyword in keywords]
+    order = [venue['venue_id'] for venue in venues]
+
+    for match_all, expected in ((True, set.intersection(*sets)), (False, set.union(*sets))):
+        results = engine.search_keywords(keywords, match_all, max_results=50)
+        assert [result['venue_id'] for result in results] == [venue_id for venue_id in order if venue_id in expected]
+        assert all(result['match_score'] == 100 for result in results)
+
+        allowed = {venue['venue_id'] for venue in engine.filter_venues({'min_capacity': 500})}
+        filtered = engine.search_keywords(keywords, match_all, {'min_capacity': 500}, max_results=50)
+        assert {result['venue_id'] for result in filtered} == expected & allowed
@@ -0,0 +1,144 @@
+"""Query planner - both execution plans return what a full scan of the allowed keywords does"""
+
+import copy
+import json
+import random
+
+import numpy as np
+import pytest
+from fuzzywuzzy import fuzz, process
+
+from config import FUZZY_MATCH_THRESHOLD
+from conftest import SAMPLE_VENUE_FILE, keyword_map
+from search.filter_columns import FilterColumns
+from search.query_planner import FILTER_FIRST, FUZZY_FIRST, QueryPlanner
+from search.venue_search import VenueSearchEngine
+
+WORDS = ['grand', 'hyatt', 'casino', 'crowne', 'plaza', 'malabar', 'ramada', 'croft', 'palace', 'lakeside']
+QUERIES = ["grand palace", "casino hotel", "crown plaza", "lakeside ramada resort", "malabar", "zzz"]
+FILTERS = [
+    {}, {'has_kitchen': True}, {'min_capacity': 800}, {'venue_type': 'resort'}, {'venue_type': 'no_such_type'},
+    {'has_parking': True, 'price_max': 1000}, {'has_accommodation': True, 'max_capacity': 300}
+]
+
+
+def make_venue(sample, venue_id, name, rng):
+    venue = copy.deepcopy(sample)
+    venue['venue_id'] = venue_id
+    venue['basic_info'].update({'official_name': name, 'aliases': [name.title()],
+                                'venue_type': rng.choice(['hotel_banquet', 'resort'])})
+    venue['search_keywords'] = {'primary_keywords': [name, name.split()[0]], 'secondary_keywords': ['kochi']}
+    venue['capacity']['parking_capacity'] = rng.choice([0, 50])
+    venue['capacity']['event_spaces'] = [{'max_guests': rng.choice([100, 300, 1000])}]
+    venue['catering']['in_house_catering'] = rng.random() < 0.2
+    venue['facilities']['accommodation_available'] = rng.random() < 0.5
+    venue['pricing']['per_plate_cost_max'] = rng.choice([None, 800, 1500])
+    return venue
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    """200 synthetic venues; of the 25 'grand palace' venues only the weakest match has a kitchen"""
+    rng = random.Random(14)
+    with open(SAMPLE_VENUE_FILE, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    root = tmp_path_factory.mktemp("planner")
+    venues_dir = root / "venues"
+    venues_dir.mkdir()
+    for i in range(200):
+        if i < 25:
+            name = "grand palace hall" if i == 24 else f"grand palace {i:02d}"
+            venue = make_venue(sample, f"planner_{i:03d}", name, rng)
+            venue['catering']['in_house_catering'] = i == 24
+        else:
+            venue = make_venue(sample, f"planner_{i:03d}", ' '.join(rng.sample(WORDS, 2)) + f" venue {i}", rng)
+        with open(venues_dir / f"{venue['venue_id']}.json", 'w', encoding='utf-8') as f:
+            json.dump(venue, f)
+    return VenueSearchEngine(venues_dir, root / "index")
+
+
+def full_scan(engine, query, filters):
+    """venue_id -> score: the 20 best keywords of allowed venues, no trigram pruning"""
+    allowed = {venue['venue_id'] for venue in engine.filter_venues(filters)}
+    keywords = keyword_map(engine.venues)
+    allowed_keywords = [keyword for keyword, venue_ids in keywords.items() if allowed & set(venue_ids)]
+    scores = {}
+    for keyword, score in process.extract(query, allowed_keywords, scorer=fuzz.token_sort_ratio, limit=20):
+        if score >= FUZZY_MATCH_THRESHOLD:
+            for venue_id in keywords[keyword]:
+                if venue_id in allowed:
+                    scores.setdefault(venue_id, 100 if keyword == query else score)
+    return scores
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_plans_match_full_scan(engine, query):
+    for filters in FILTERS:
+        expected = full_scan(engine, query, filters)
+        for plan in (FUZZY_FIRST, FILTER_FIRST):
+            report = engine.explain(query, filters, max_results=len(engine.venues), plan=plan)
+            assert report['plan'] == plan
+            assert set(report['venue_ids']) == set(expected), (query, filters, plan)
+        results = engine.search(query, filters, max_results=len(engine.venues))
+        assert {venue['venue_id']: venue['match_score'] for venue in results} == expected, (query, filters)
+
+
+def test_filtered_search_looks_past_excluded_keywords(engine):
+    # The 20 best 'grand palace' keywords all belong to venues without a kitchen
+    unfiltered = engine.search("grand palace", max_results=50)
+    assert 'planner_024' not in {venue['venue_id'] for venue in unfiltered}
+    filtered = engine.search("grand palace", {'has_kitchen': True})
+    assert filtered and filtered[0]['venue_id'] == 'planner_024'
+
+
+def test_selectivity_estimates(engine):
+    planner = engine.planner
+    columns = engine.filter_columns
+    # Single boolean / equality / price filters are estimated exactly
+    for filters in ({'has_kitchen': True}, {'has_parking': True}, {'has_accommodation': True},
+                    {'venue_type': 'resort'}, {'venue_type': 'no_such_type'}, {'price_max': 1000}):
+        assert planner.estimate_selectivity(filters) == pytest.approx(columns.mask(filters).mean()), filters
+    # One space per venue: the capacity estimate is exact as well
+    assert planner.estimate_selectivity({'min_capacity': 800}) == pytest.approx(
+        columns.mask({'min_capacity': 800}).mean())
+
+
+def test_extended_statistics_match_fresh_planner(engine):
+    """Statistics merged over several patches are the ones a planner over all the columns computes"""
+    venues = copy.deepcopy(list(engine.venues))
+    # Types only seen after the first columns get new codes
+    venues[150]['basic_info']['venue_type'] = 'convention_centre'
+    columns = FilterColumns(venues[:100])
+    planner = QueryPlanner(columns, engine.fuzzy_index, 0)
+    for start, end in [(100, 140), (140, 141), (141, 141), (141, 200)]:
+        columns = columns.extended(venues[start:end])
+        planner = planner.extended(columns, engine.fuzzy_index, 5 * end)
+
+    fresh = QueryPlanner(FilterColumns(venues), engine.fuzzy_index, 1000)
+    for name in ('sorted_space_guests', 'sorted_prices'):
+        assert np.array_equal(getattr(planner, name), getattr(fresh, name)), name
+    for name in ('venue_count', 'keywords_per_venue', 'spaces_per_venue', 'unpriced_share', 'catering_share',
+                 'parking_share', 'accommodation_share', 'venue_type_share'):
+        assert getattr(planner, name) == pytest.approx(getattr(fresh, name)), name
+    for filters in FILTERS + [{'venue_type': 'convention_centre'}]:
+        assert planner.estimate_selectivity(filters) == pytest.approx(fresh.estimate_selectivity(filters)), filters
+
+
+def test_plan_choice_and_explain(engine):
+    assert engine.planner.choose("grand palace", {}).name == FUZZY_FIRST
+    assert engine.planner.choose("grand palace", {'venue_type': 'no_such_type'}).name == FILTER_FIRST
+
+    report = engine.explain("grand palace", {'has_kitchen': True})
+    assert report['plan'] == engine.planner.choose("grand palace", {'has_kitchen': True}).name
+    assert report['actual']['surviving_venues'] == int(engine.filter_columns.mask({'has_kitchen': True}).sum())
+    assert report['actual']['results'] == len(report['venue_ids']) > 0
+    assert report['venue_ids'] == [venue['venue_id'] for venue in engine.search("grand palace", {'has_kitchen': True})]
+    assert set(report['timings_ms']) >= {'plan', 'filter', 'exact', 'fuzzy', 'rank', 'total'}
+
+    kitchens = {venue['venue_id'] for venue in engine.venues if venue['catering']['in_house_catering']}
+    filter_first = engine.explain("grand palace", {'has_kitchen': True}, plan=FILTER_FIRST)
+    assert filter_first['actual']['keywords_scored'] == sum(
+        1 for venue_ids in keyword_map(engine.venues).values() if kitchens & set(venue_ids))
+    assert engine.explain("   ")['venue_ids'] == []
+    with pytest.raises(ValueError):
+        engine.explain("grand palace", plan='index_scan')
@@ -0,0 +1,99 @@
+"""Rate limiter - token bucket burst/AIMD schedule, Retry-After parsing and throttled crawls"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from conftest import FixtureCrawler, saved_venues
+from rate_limiter import TokenBucket, get_host_limiter, parse_retry_after
+from config import RATE_LIMIT_DECREASE_FACTOR, RATE_LIMIT_INCREASE_STEP
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(' 7 ') == 7.0
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(retry_at, usegmt=True)) == pytest.approx(30, abs=2)
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+
+def test_burst_then_steady_rate():
+    bucket = TokenBucket(rate=10, capacity=4, min_rate=1, max_rate=20)
+    waits = [bucket._reserve() for _ in range(8)]
+
+    # The burst goes out immediately, then one request every 1/rate seconds
+    assert waits[:4] == [0.0] * 4
+    for extra, wait in enumerate(waits[4:], 1):
+        assert wait == pytest.approx(extra / 10, abs=0.01)
+
+
+def test_additive_increase_multiplicative_decrease():
+    bucket = TokenBucket(rate=4, capacity=4, min_rate=1, max_rate=5)
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == pytest.approx(4 + 10 * RATE_LIMIT_INCREASE_STEP)
+    for _ in range(100):
+        bucket.on_success()
+    assert bucket.rate == 5
+
+    bucket.on_throttle()
+    assert bucket.rate == pytest.approx(5 * RATE_LIMIT_DECREASE_FACTOR)
+    assert bucket.tokens <= 0
+    for _ in range(20):
+        bucket.on_throttle(retry_after=0)
+    assert bucket.rate == 1
+
+
+def test_retry_after_pauses_the_host():
+    bucket = TokenBucket(rate=100, capacity=4, min_rate=1, max_rate=100)
+    bucket.on_throttle(retry_after=2.0)
+    assert bucket._reserve() == pytest.approx(2.0, abs=0.05)
+
+
+def test_async_acquire_follows_the_same_schedule():
+    bucket = TokenBucket(rate=20, capacity=2, min_rate=1, max_rate=20)
+
+    async def acquire_all():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(6)))
+        return time.monotonic() - start
+
+    assert asyncio.run(acquire_all()) >= (6 - 2) / 20 - 0.02
+
+
+def test_cancelled_acquire_returns_its_token():
+    bucket = TokenBucket(rate=2, capacity=1, min_rate=1, max_rate=2)
+    assert bucket._reserve() == 0.0
+
+    async def cancel_waiter():
+        waiter = asyncio.create_task(bucket.acquire_async())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(cancel_waiter())
+
+    # Without the refund the next request would queue behind the cancelled one (about 1s)
+    assert bucket._reserve() == pytest.approx(0.5 - 0.05, abs=0.05)
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async'])
+def test_crawl_honours_retry_after(site, crawl_dirs, engine):
+    venues_dir = crawl_dirs(engine)
+    site.fail('/venue/hall-001', (429, {'Retry-After': '0'}))
+    site.fail('/venue/hall-002', (503, {}))
+
+    start = time.monotonic()
+    FixtureCrawler(site.url).crawl_all(engine=engine)
+
+    # Throttled pages are retried after the requested pause, not a fixed multi-second sleep
+    assert len(saved_venues(venues_dir)) == len(site.venues)
+    assert len(site.requested('/venue/hall-001')) == 2
+    assert time.monotonic() - start < 3
+    assert get_host_limiter(site.url).rate < get_host_limiter(site.url).max_rate / 2
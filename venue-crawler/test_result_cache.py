@@ -0,0 +1,111 @@
+"""Result cache - cached rankings equal uncached ones and never outlive their index version"""
+
+import json
+import shutil
+import time
+
+import pytest
+
+from config import VENUES_DIR
+from search.result_cache import MemoryCacheBackend, ResultCache, SQLiteCacheBackend
+from search.results import VenueHit
+from search.venue_search import VenueSearchEngine
+
+QUERIES = [("wedding venue kochi", None, 10), ("Bolgatty Palace", {'min_capacity': 300}, 10),
+           ("BOLGATTY PALACE", {'min_capacity': 300}, 10), (" bolgatty  palace ", {'min_capacity': 300}, 10),
+           ("bolgatty palace", None, 2), ("taj malabar", None, 5), ("Casino Hotel", None, 10),
+           ("casino   hotel", None, 10), ("nothing like it", None, 10)]
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_backend(request, tmp_path):
+    backends = []
+
+    def make(max_entries=1024, ttl_seconds=300):
+        if request.param == 'memory':
+            backend = MemoryCacheBackend(max_entries, ttl_seconds)
+        else:
+            backend = SQLiteCacheBackend(tmp_path / "result_cache.db", max_entries, ttl_seconds)
+        backends.append(backend)
+        return backend
+
+    yield make
+    for backend in backends:
+        if isinstance(backend, SQLiteCacheBackend):
+            backend.close()
+
+
+def test_backend_bounds_and_expiry(make_backend):
+    backend = make_backend(max_entries=3)
+    for i in range(4):
+        backend.set(f"key_{i}", [[i, f"venue_{i}", 90, 'fuzzy']], 'v1')
+        time.sleep(0.01)  # SQLite orders by access time
+    assert len(backend) == 3 and backend.evictions == 1 and backend.get("key_0") is None
+    assert backend.get("key_3") == [[3, "venue_3", 90, 'fuzzy']]
+
+    expiring = make_backend(ttl_seconds=0)
+    expiring.set("key", [1], 'v1')
+    time.sleep(0.01)
+    assert expiring.get("key") is None and expiring.expirations == 1
+
+
+def test_hits_roundtrip_and_count(make_backend):
+    cache = ResultCache(make_backend())
+    hits = [(4, VenueHit("venue_a", 100, 'exact')), (1, VenueHit("venue_b", 85, 'fuzzy', "venue b"))]
+    key = ResultCache.make_key('v1', 'search', "Venue A", {'min_capacity': 10}, 10)
+    assert key == ResultCache.make_key('v1', 'search', "venue a", {'min_capacity': 10}, 10)
+    assert key == ResultCache.make_key('v1', 'search', "  venue \t A ", {'min_capacity': 10}, 10)
+    assert key != ResultCache.make_key('v2', 'search', "venue a", {'min_capacity': 10}, 10)
+
+    assert cache.get('v1', key) is None
+    cache.set('v1', key, hits)
+    assert cache.get('v1', key) == hits
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1 and cache.stats()['hit_rate'] == 0.5
+
+
+def test_new_version_drops_in_process_entries():
+    cache = ResultCache(MemoryCacheBackend())
+    cache.set('v1', 'old', [])
+    cache.get('v2', 'other')
+    assert len(cache.backend) == 0
+
+
+def test_cached_search_matches_uncached(tmp_path, make_backend):
+    engine = VenueSearchEngine(VENUES_DIR, tmp_path / "index", cache_backend=make_backend())
+    uncached = VenueSearchEngine(VENUES_DIR, tmp_path / "index")
+    uncached.result_cache = None
+
+    for _ in range(2):
+        for query, filters, max_results in QUERIES:
+            assert engine.search(query, filters, max_results) == uncached.search(query, filters, max_results)
+            assert engine.search_hits(query, filters, max_results) == uncached.search_hits(query, filters, max_results)
+    stats = engine.cache_stats()['results']
+    assert stats['misses'] == len(QUERIES) - 3  # case / whitespace variants of a query share its key
+    assert stats['hits'] == 4 * len(QUERIES) - stats['misses']
+
+    # A variant answers exactly like the normalized query, whether it was served from the cache or not
+    for search_engine in (engine, uncached):
+        assert search_engine.search("casino   hotel") == search_engine.search("Casino Hotel")
+        assert search_engine.search("casino   hotel")[0]['match_type'] == 'exact'
+
+    # Results are materialized per call: mutating one can't leak into the cache
+    engine.search("taj malabar")[0]['match_score'] = 0
+    assert engine.search("taj malabar") == uncached.search("taj malabar")
+
+
+def test_edited_venues_are_never_served_stale(tmp_path, make_backend):
+    venues_dir = tmp_path / "venues"
+    shutil.copytree(VENUES_DIR, venues_dir)
+    backend = make_backend()
+    engine = VenueSearchEngine(venues_dir, tmp_path / "index", cache_backend=backend)
+    assert engine.search("Zephyr Courtyard") == []
+
+    venue_file = venues_dir / "kochi_the_croft_008.json"
+    venue = json.loads(venue_file.read_text(encoding='utf-8'))
+    venue['basic_info']['aliases'].append("Zephyr Courtyard")
+    venue_file.write_text(json.dumps(venue), encoding='utf-8')
+
+    # A second worker sharing the backend sees the edit, and so does the first one after a reload
+    assert VenueSearchEngine(venues_dir, tmp_path / "index", cache_backend=backend).search("Zephyr Courtyard")
+    engine._build_search_index()
+    assert [result['venue_id'] for result in engine.search("Zephyr Courtyard")] == [venue['venue_id']]
@@ -0,0 +1,66 @@
+"""Search results - bounded-heap top-k and field projection agree with sort + slice and full documents"""
+
+import random
+
+import pytest
+
+from search.results import VenueHit, project, top_hits
+from search.venue_search import VenueSearchEngine
+
+QUERIES = ["wedding venue kochi", "bolgatty palace", "crowne plaza", "5 star wedding venue", "taj malabar"]
+MATCH_KEYS = ('match_score', 'match_type', 'matched_keyword')
+FIELDS = ["basic_info.official_name", "location.address", "capacity.event_spaces", "no_such.field",
+          "basic_info.no_such_field"]
+
+
+def match_info(result):
+    return {key: result[key] for key in MATCH_KEYS if key in result}
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    return VenueSearchEngine(index_directory=tmp_path_factory.mktemp("index"))
+
+
+def test_top_hits_match_sort_and_slice():
+    rng = random.Random(17)
+    for _ in range(200):
+        hits = [(ordinal, VenueHit(f"venue_{ordinal}", rng.choice([80, 85, 90, 100]), 'fuzzy'))
+                for ordinal in rng.sample(range(1000), rng.randint(0, 60))]
+        for max_results in (0, 1, 10, 100):
+            expected = sorted(hits, key=lambda item: item[1].match_score, reverse=True)[:max_results]
+            assert top_hits(hits, max_results) == expected
+
+
+def test_project_keeps_nesting_and_skips_missing_paths():
+    document = {'venue_id': 'v', 'basic_info': {'official_name': 'Hall', 'aliases': ['H']},
+                'location': {'address': 'Road', 'coordinates': None}, 'pricing': 5}
+    assert project(document, ["basic_info.official_name", "location.address", "pricing"]) == {
+        'basic_info': {'official_name': 'Hall'}, 'location': {'address': 'Road'}, 'pricing': 5}
+    assert project(document, ["location.coordinates.latitude", "pricing.max", "nope", "basic_info.nope"]) == {}
+    assert project(document, ["location.coordinates"]) == {'location': {'coordinates': None}}
+    assert project(document, []) == {}
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_top_k_and_projection(engine, query):
+    everything = engine.search(query, max_results=len(engine.venues))
+    assert everything, query
+    for max_results in (1, 2, 5):
+        assert engine.search(query, max_results=max_results) == everything[:max_results]
+
+    hits = engine.search_hits(query, max_results=len(engine.venues))
+    assert [(hit.venue_id, hit.match_info()) for hit in hits] == [
+        (result['venue_id'], match_info(result)) for result in everything]
+
+    projected = engine.search(query, max_results=len(engine.venues), fields=FIELDS)
+    for full, result in zip(everything, projected):
+        assert result == {'venue_id': full['venue_id'], **project(full, FIELDS), **match_info(full)}
+
+
+def test_location_projection(engine):
+    full = engine.search_by_location("Willingdon Island")
+    projected = engine.search_by_location("Willingdon Island", fields=["location.landmark"])
+    assert full and [result['venue_id'] for result in projected] == [result['venue_id'] for result in full]
+    assert projected[0] == {'venue_id': full[0]['venue_id'], 'location': {'landmark': full[0]['location']['landmark']},
+                            'match_score': 90, 'match_type': 'location'}
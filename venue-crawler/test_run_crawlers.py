@@ -0,0 +1,37 @@
+"""run_crawlers - parallel sources crawl side by side and report what a sequential run does"""
+
+from functools import partial
+
+import main
+from conftest import FixtureCrawler, saved_venues
+
+
+class BrokenCrawler:
+    def crawl_all(self, **kwargs):
+        raise RuntimeError("listing markup changed")
+
+
+def use_sources(monkeypatch, site):
+    monkeypatch.setattr(main, 'CRAWLERS', {
+        'first': partial(FixtureCrawler, site.url, 'first'),
+        'broken': BrokenCrawler,
+        'second': partial(FixtureCrawler, site.url, 'second')
+    })
+
+
+def test_parallel_matches_sequential(site, crawl_dirs, monkeypatch):
+    use_sources(monkeypatch, site)
+    site.detail_delay = 0.05
+
+    sequential_dir = crawl_dirs('sequential')
+    sequential_total = main.run_crawlers(['first', 'broken', 'second', 'unknown'], engine='sync')
+    assert site.max_in_flight == 1
+
+    site.max_in_flight = 0
+    parallel_dir = crawl_dirs('parallel')
+    parallel_total = main.run_crawlers(['first', 'broken', 'second', 'unknown'], engine='sync', parallel=True)
+
+    # One failing source neither aborts the others nor counts towards the total
+    assert parallel_total == sequential_total == 2 * len(site.venues)
+    assert saved_venues(parallel_dir) == saved_venues(sequential_dir)
+    assert site.max_in_flight > 1
@@ -0,0 +1,167 @@
+"""Search server - every endpoint answers what the engine answers in-process"""
+
+import asyncio
+import itertools
+import json
+import shutil
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from config import FUZZY_MATCH_THRESHOLD, VENUES_DIR
+from search.server import MAX_RESULTS_LIMIT, SearchService, _filters, _limit, create_app
+from search.venue_search import VenueSearchEngine
+
+
+@pytest.fixture
+def service(tmp_path):
+    venues_dir = tmp_path / "venues"
+    shutil.copytree(VENUES_DIR, venues_dir)
+    engine = VenueSearchEngine(venues_dir, tmp_path / "index")
+    service = SearchService(venues_dir, tmp_path / "index", workers=2, engine=engine)
+    yield service
+    service.close()
+
+
+def serve(service, scenario):
+    """Run scenario(client, engine) against the service's app"""
+    async def run():
+        async with TestClient(TestServer(create_app(service))) as client:
+            await scenario(client, service.engine)
+    asyncio.run(run())
+
+
+def test_search_endpoints_match_engine(service):
+    async def scenario(client, engine):
+        for query, filters in [("wedding venue kochi", None), ("bolgatty palace", {'min_capacity': 300})]:
+            response = await client.post('/search', json={'query': query, 'filters': filters, 'max_results': 3})
+            data = await response.json()
+            assert response.status == 200 and data['results'] == engine.search(query, filters, 3)
+
+        response = await client.post('/search', json={'query': "wedding venue for 300 guests", 'mode': 'text',
+                                                      'fields': ["basic_info.official_name"]})
+        data = await response.json()
+        assert data['results'] == engine.search_text("wedding venue for 300 guests", None, 10,
+                                                     ["basic_info.official_name"])
+
+        venue_id = engine.venue_ids[0]
+        assert (await (await client.get(f'/venues/{venue_id}')).json())['venue'] == engine.get_venue_by_id(venue_id)
+        assert (await client.get('/venues/no_such_venue')).status == 404
+
+        data = await (await client.get('/location', params={'area': "Willingdon Island"})).json()
+        assert data['results'] == engine.search_by_location("Willingdon Island")
+
+        data = await (await client.get('/autocomplete', params={'q': "gra", 'max_results': 5})).json()
+        assert data['completions'] == engine.autocomplete("gra", 5)
+
+        queries = ["Casino Hotel", "crowne plaza", "nothing like it"]
+        data = await (await client.post('/batch', json={'queries': queries})).json()
+        batch = engine.search_many(queries)
+        assert [[[match['venue_id'], match['match_score']] for match in result['matches']]
+                for result in data['results']] == [[list(match) for match in batch.top(i, 10, FUZZY_MATCH_THRESHOLD)]
+                                                  for i in range(len(queries))]
+
+    serve(service, scenario)
+
+
+def nextjs_apply_filters(venue, filters):
+    """Port of applyFilters in src/lib/venue-search.ts (unset = falsy)"""
+    if filters.get('min_capacity') or filters.get('max_capacity'):
+        low, high = filters.get('min_capacity') or 0, filters.get('max_capacity') or float('inf')
+        if not any(low <= space['max_guests'] <= high for space in venue['capacity']['event_spaces']):
+            return False
+    if filters.get('has_kitchen') and not venue['catering']['in_house_catering']:
+        return False
+    if filters.get('has_parking') and not venue['capacity'].get('parking_capacity'):
+        return False
+    if filters.get('has_accommodation') and not venue['facilities']['accommodation_available']:
+        return False
+    if filters.get('venue_type') and venue['basic_info']['venue_type'] != filters['venue_type']:
+        return False
+    price = venue['pricing'].get('per_plate_cost_max')
+    return not (filters.get('price_max') and price and price > filters['price_max'])
+
+
+def test_filters_match_nextjs_semantics(service):
+    engine = service.engine
+    options = {
+        'has_kitchen': [None, False, True], 'has_parking': [None, False, True], 'has_accommodation': [False, True],
+        'min_capacity': [None, 0, 700], 'max_capacity': [0, 900], 'venue_type': ['', 'hotel_banquet'],
+        'price_max': [0, 3000]
+    }
+    for values in itertools.product(*options.values()):
+        filters = dict(zip(options, values))
+        expected = [venue['venue_id'] for venue in engine.venues if nextjs_apply_filters(venue, filters)]
+        normalized = _filters({'filters': filters})
+        assert [venue['venue_id'] for venue in engine.filter_venues(normalized)] == expected, filters
+
+    assert _filters({'filters': {'has_kitchen': False, 'has_parking': True, 'min_capacity': 0, 'venue_type': '',
+                                 'price_max': 1500}}) == {'has_parking': True, 'price_max': 1500}
+
+    async def scenario(client, engine):
+        for filters in ({'has_kitchen': False, 'has_parking': False}, {'near': "Willingdon Island", 'radius_km': 3}):
+            response = await client.post('/search', json={'query': "wedding venue kochi", 'filters': filters})
+            data = await response.json()
+            assert response.status == 200 and data['results'] == engine.search("wedding venue kochi", _filters(
+                {'filters': filters}), 10), filters
+
+    serve(service, scenario)
+
+
+def test_limit_is_clamped():
+    assert (_limit(None), _limit("3"), _limit(0), _limit(10 ** 6)) == (10, 3, 1, MAX_RESULTS_LIMIT)
+
+
+def test_bad_requests(service):
+    async def scenario(client, engine):
+        assert (await client.post('/search', json={'filters': {}})).status == 400
+        assert (await client.post('/search', data="not json")).status == 400
+        assert (await client.post('/search', json=["a list"])).status == 400
+        assert (await client.get('/location')).status == 400
+        assert (await client.post('/batch', json={'queries': "one string"})).status == 400
+        assert (await client.post('/batch', json={'queries': ["a"], 'threshold': "high"})).status == 400
+        assert (await client.get('/autocomplete', params={'q': "gra", 'max_results': "many"})).status == 400
+
+        for filters in [{'min_capacity': "300"}, {'min_capacity': True}, {'has_kitchen': "yes"}, {'venue_type': 3},
+                        {'near': [10.0]}, {'radius_km': "3"}, {'no_such_filter': 1}, {'near': "Atlantis", 'radius_km': 2}]:
+            response = await client.post('/search', json={'query': "wedding", 'filters': filters})
+            data = await response.json()
+            assert response.status == 400 and not data['success'] and data['error'], filters
+
+    serve(service, scenario)
+
+
+def test_engine_errors_are_server_errors(service, monkeypatch):
+    """Only request validation answers 400: a ValueError from inside the engine is a 500"""
+    def fail(*args, **kwargs):
+        raise ValueError("broken index")
+
+    monkeypatch.setattr(service.engine, 'search', fail)
+
+    async def scenario(client, engine):
+        response = await client.post('/search', json={'query': "wedding"})
+        assert response.status == 500 and (await response.json())['error'] == 'Internal server error'
+
+    serve(service, scenario)
+
+
+def test_reload_and_health(service):
+    async def scenario(client, engine):
+        health = await (await client.get('/health')).json()
+        assert health['status'] == 'ok' and health['venue_count'] == engine.get_venue_count()
+
+        venue_file = service.venues_dir / "kochi_the_croft_008.json"
+        venue = json.loads(venue_file.read_text(encoding='utf-8'))
+        venue['basic_info']['aliases'].append("Zephyr Courtyard")
+        venue_file.write_text(json.dumps(venue), encoding='utf-8')
+
+        data = await (await client.post('/reload')).json()
+        assert data['mode'] == 'sync' and data['synced_files'] == 1
+        results = (await (await client.post('/search', json={'query': "Zephyr Courtyard"})).json())['results']
+        assert [result['venue_id'] for result in results] == [venue['venue_id']]
+
+        data = await (await client.post('/reload', json={'rebuild': True})).json()
+        assert data['mode'] == 'rebuild' and service.engine is not engine
+        assert service.engine.search("Zephyr Courtyard") == results
+
+    serve(service, scenario)
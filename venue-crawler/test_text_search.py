@@ -0,0 +1,158 @@
+"""Text search - numeric intents, BM25 scores against a brute-force reference, and engine ranking"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+from fuzzywuzzy import fuzz
+
+from config import TEXT_FUZZY_THRESHOLD, VENUES_DIR
+from search.query_parser import parse_query
+from search.text_index import B, FIELD_WEIGHTS, FUZZY_EXPANSIONS, FUZZY_MIN_TOKEN_LENGTH, K1, TextIndex, venue_fields
+from search.venue_search import VenueSearchEngine
+
+WORDS = ['grand', 'hyatt', 'bolgatty', 'casino', 'hotel', 'crowne', 'plaza', 'malabar', 'palace', 'marine', 'drive',
+         'banquet', 'hall', 'convention', 'centre', 'lakeside', 'gardens', 'island', 'wedding', 'kakkanad']
+
+
+@pytest.mark.parametrize("query, text, tokens, filters", [
+    ("wedding venue for 300 guests under 1500 per plate", "wedding venue for", ['wedding', 'venue'],
+     {'min_capacity': 300, 'price_max': 1500}),
+    ("between 200 and 400 people near kakkanad", "near kakkanad", ['kakkanad'],
+     {'min_capacity': 200, 'max_capacity': 400}),
+    ("hall 200-400 guests", "hall", ['hall'], {'min_capacity': 200, 'max_capacity': 400}),
+    ("up to 150 pax", "", [], {'max_capacity': 150}),
+    ("capacity of 500", "", [], {'min_capacity': 500}),
+    ("500+ guests", "", [], {'min_capacity': 500}),
+    ("Rs. 900/- per plate banquet", "banquet", ['banquet'], {'price_max': 900}),
+    ("₹1200 a plate", "", [], {'price_max': 1200}),
+    ("the best 2 venues", "the best 2 venues", ['2', 'venues'], {}),
+])
+def test_parse_query(query, text, tokens, filters):
+    assert parse_query(query) == (text, tokens, filters)
+
+
+def make_venues(count, rng):
+    def phrase(low, high):
+        return ' '.join(rng.sample(WORDS, rng.randint(low, high)))
+
+    return [{
+        'venue_id': f"text_{i}",
+        'basic_info': {'official_name': phrase(1, 3), 'brand_name': rng.choice([None, phrase(1, 1)]),
+                       'aliases': [phrase(1, 2) for _ in range(rng.randint(0, 2))],
+                       'venue_type': rng.choice(['banquet_hall', 'hotel', None])},
+        'search_keywords': {'primary_keywords': [phrase(1, 2)], 'secondary_keywords': [phrase(1, 3)]},
+        'location': {'address': phrase(1, 2), 'landmark': rng.choice(['', phrase(1, 1)])}
+    } for i in range(count)]
+
+
+def reference_scores(venues, tokens, live):
+    """BM25 over the live venues, one field-weighted term-frequency dict per venue, vocabulary scanned in full"""
+    frequencies, lengths = [], []
+    for venue in venues:
+        counts, length = {}, 0.0
+        for field, field_tokens in venue_fields(venue):
+            for token in field_tokens:
+                counts[token] = counts.get(token, 0.0) + FIELD_WEIGHTS[field]
+            length += FIELD_WEIGHTS[field] * len(field_tokens)
+        frequencies.append(counts)
+        lengths.append(length)
+    vocabulary = sorted({token for counts in frequencies for token in counts})
+    live_ordinals = [ordinal for ordinal in range(len(venues)) if live[ordinal]]
+    average_length = sum(lengths[ordinal] for ordinal in live_ordinals) / len(live_ordinals)
+
+    scores = [0.0] * len(venues)
+    for token in dict.fromkeys(tokens):
+        if token in vocabulary or len(token) < FUZZY_MIN_TOKEN_LENGTH:
+            expansions = [(token, 1.0)]
+        else:
+            scored = [(word, fuzz.ratio(token, word)) for word in vocabulary]
+            scored = sorted([item for item in scored if item[1] >= TEXT_FUZZY_THRESHOLD], key=lambda item: -item[1])
+            expansions = [(word, score / 100.0) for word, score in scored[:FUZZY_EXPANSIONS]]
+        best = [0.0] * len(venues)
+        for word, similarity in expansions:
+            matching = [ordinal for ordinal in live_ordinals if word in frequencies[ordinal]]
+            idf = math.log(1.0 + (len(live_ordinals) - len(matching) + 0.5) / (len(matching) + 0.5))
+            for ordinal in matching:
+                tf = frequencies[ordinal][word]
+                norm = K1 * (1.0 - B + B * lengths[ordinal] / average_length)
+                best[ordinal] = max(best[ordinal], similarity * idf * tf * (K1 + 1.0) / (tf + norm))
+        scores = [score + token_best for score, token_best in zip(scores, best)]
+    return scores
+
+
+def test_scores_match_reference():
+    rng = random.Random(23)
+    venues = make_venues(150, rng)
+    vocabulary, arrays = TextIndex.build_arrays(venues)
+    index = TextIndex(vocabulary, arrays['offsets'], arrays['venues'], arrays['frequencies'], arrays['lengths'])
+    live = np.array([rng.random() < 0.8 for _ in venues])
+
+    queries = [['grand', 'palace'], ['hall'], ['bolgaty'], ['weding', 'kakanad'], ['malabar', 'malabar'],
+               ['nowhere'], ['hal'], ['banquet', 'hotel', 'island']]
+    for tokens in queries:
+        scores, _ = index.score(tokens, live)
+        expected = reference_scores(venues, tokens, live)
+        assert np.allclose(scores[live], np.array(expected)[live]), tokens
+
+
+def test_extended_overlay_matches_reference():
+    """Venues added over several patches score as if the index had been built over all of them"""
+    rng = random.Random(25)
+    venues = make_venues(150, rng)
+    vocabulary, arrays = TextIndex.build_arrays(venues[:100])
+    index = TextIndex(vocabulary, arrays['offsets'], arrays['venues'], arrays['frequencies'], arrays['lengths'])
+    for start, end in [(100, 120), (120, 121), (121, 121), (121, 150)]:
+        index = index.extended(venues[start:end], start)
+    live = np.array([rng.random() < 0.8 for _ in venues])
+
+    for tokens in [['grand', 'palace'], ['hall'], ['bolgaty'], ['weding', 'kakanad'], ['nowhere']]:
+        scores, _ = index.score(tokens, live)
+        expected = reference_scores(venues, tokens, live)
+        assert np.allclose(scores[live], np.array(expected)[live]), tokens
+
+
+def test_typo_expansion():
+    venues = make_venues(60, random.Random(24))
+    vocabulary, arrays = TextIndex.build_arrays(venues)
+    index = TextIndex(vocabulary, arrays['offsets'], arrays['venues'], arrays['frequencies'], arrays['lengths'])
+    assert index.expansions('bolgatty') == [('bolgatty', 1.0)]
+    assert index.expansions('bolgaty')[0] == ('bolgatty', fuzz.ratio('bolgaty', 'bolgatty') / 100.0)
+    assert index.expansions('hal') == [('hal', 1.0)]  # too short to expand
+    _, matched = index.score(['bolgaty', 'qqqqqq'])
+    assert matched == {'bolgaty': ['bolgatty']}
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    return VenueSearchEngine(VENUES_DIR, tmp_path_factory.mktemp("index"))
+
+
+@pytest.mark.parametrize("query", ["bolgatty palace", "crowne plaza", "taj malabar", "the croft", "Casino Hotel"])
+def test_names_rank_like_fuzzy_search(engine, query):
+    """The venue the original fuzzy search puts first is also the best text hit, typo or not"""
+    best = engine.search(query)[0]['venue_id']
+    for variant in (query, query.replace('a', '', 1)):
+        results = engine.search_text(variant)
+        assert results[0]['venue_id'] == best and results[0]['match_score'] == 100, variant
+        assert all(result['match_type'] == 'text' for result in results)
+        scores = [result['match_score'] for result in results]
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_numeric_intents_become_filters(engine):
+    every = engine.search_text("wedding venue", max_results=len(engine.venues))
+    filtered = engine.search_text("wedding venue for 300 guests", max_results=len(engine.venues))
+    expected = {venue['venue_id'] for venue in engine.filter_venues({'min_capacity': 300})}
+    assert {result['venue_id'] for result in filtered} == {result['venue_id'] for result in every} & expected
+
+    # Explicit filters take precedence over parsed ones
+    overridden = engine.search_text("wedding venue for 300 guests", {'min_capacity': 0}, max_results=len(engine.venues))
+    assert [result['venue_id'] for result in overridden] == [result['venue_id'] for result in every]
+
+    # Only filter phrases: the venues passing them, in catalogue order
+    only_filters = engine.search_text("300+ guests", max_results=len(engine.venues))
+    assert [result['venue_id'] for result in only_filters] == [venue['venue_id'] for venue in
+                                                              engine.filter_venues({'min_capacity': 300})]
+    assert engine.search_text("   ") == []
@@ -0,0 +1,103 @@
+"""Crawl work queue - claim order, backoff, dead letters, and resuming an interrupted crawl"""
+
+import time
+
+import pytest
+
+import base_crawler
+from conftest import FixtureCrawler, saved_venues
+from config import QUEUE_MAX_ATTEMPTS
+from work_queue import CrawlQueue, DEAD, DONE, FAILED, IN_FLIGHT, PENDING
+
+
+def make_queue(tmp_path, count=6):
+    queue = CrawlQueue(tmp_path / "queue.db")
+    queue.reset('fixture', 'Kochi', [{'url': f"u{i}", 'name': f"n{i}"} for i in range(count)], max_venues=None)
+    return queue
+
+
+def test_claim_in_listing_order(tmp_path):
+    queue = make_queue(tmp_path)
+    assert [task['url'] for task in queue.claim('fixture', 4)] == ['u0', 'u1', 'u2', 'u3']
+    assert [task['url'] for task in queue.claim('fixture', 4)] == ['u4', 'u5']
+    assert queue.claim('fixture', 4) == []
+    assert queue.counts('fixture') == {IN_FLIGHT: 6}
+
+    # A crashed run leaves tasks in flight; recovery makes them claimable again
+    queue.mark_done('fixture', 'u0')
+    assert queue.recover('fixture') == 5
+    assert queue.counts('fixture') == {DONE: 1, PENDING: 5}
+    assert queue.get_run('fixture')['city'] == 'Kochi'
+
+
+def test_backoff_and_dead_letters(tmp_path, monkeypatch):
+    import work_queue
+    monkeypatch.setattr(work_queue, 'QUEUE_BACKOFF_SECONDS', 10.0)
+    queue = make_queue(tmp_path, count=2)
+    queue.claim('fixture', 2)
+
+    before = time.time()
+    assert queue.mark_failed('fixture', 'u0', 'fetch failed') == FAILED
+    assert queue.next_retry_at('fixture') == pytest.approx(before + 10, abs=1)
+    assert queue.claim('fixture', 2) == []
+
+    for attempt in range(2, QUEUE_MAX_ATTEMPTS):
+        assert queue.mark_failed('fixture', 'u0', 'fetch failed') == FAILED
+    assert queue.next_retry_at('fixture') == pytest.approx(before + 10 * 2 ** (QUEUE_MAX_ATTEMPTS - 2), abs=1)
+    assert queue.mark_failed('fixture', 'u0', 'fetch failed') == DEAD
+
+    # Deterministic failures skip the retries
+    assert queue.mark_failed('fixture', 'u1', 'validation failed', retry=False) == DEAD
+    assert [(dead['url'], dead['attempts']) for dead in queue.dead_letters('fixture')] == [
+        ('u0', QUEUE_MAX_ATTEMPTS), ('u1', 1)
+    ]
+    assert queue.next_retry_at('fixture') is None
+
+
+class Interrupted(BaseException):
+    """Stands in for a crash / Ctrl-C part-way through a crawl"""
+
+
+@pytest.mark.parametrize('engine', ['sync', 'async'])
+def test_resume_continues_an_interrupted_crawl(site, crawl_dirs, monkeypatch, engine):
+    monkeypatch.setattr(base_crawler, 'QUEUE_BATCH_SIZE', 4)
+    full_dir = crawl_dirs('full')
+    FixtureCrawler(site.url).crawl_all(engine=engine)
+
+    venues_dir = crawl_dirs('interrupted')
+    crawler = FixtureCrawler(site.url)
+    save_venue = crawler.save_venue
+
+    def save_then_crash(venue):
+        if len(list(venues_dir.iterdir())) == 6:
+            raise Interrupted()
+        save_venue(venue)
+
+    crawler.save_venue = save_then_crash
+    with pytest.raises(Interrupted):
+        crawler.crawl_all(engine=engine)
+
+    site.requests.clear()
+    crawler = FixtureCrawler(site.url)
+    crawler.crawl_all(engine=engine, resume=True)
+
+    # No new listing fetch, no refetch of checkpointed venues, same result as an uninterrupted run
+    assert site.requested('/venues') == []
+    assert len([path for path, _ in site.requests if path.startswith('/venue/')]) <= len(site.venues) - 4
+    assert saved_venues(venues_dir) == saved_venues(full_dir)
+
+
+def test_failed_fetches_are_retried_then_dead_lettered(site, crawl_dirs):
+    venues_dir = crawl_dirs('retries')
+    site.fail('/venue/hall-001', *[(500, {})] * 4)
+    site.broken.add('/venue/hall-002')
+
+    crawler = FixtureCrawler(site.url)
+    crawler.crawl_all(engine='sync')
+
+    saved = saved_venues(venues_dir)
+    assert 'fixture_hall_001' in saved and 'fixture_hall_002' not in saved
+    assert crawler.last_crawl_stats['failed'] == 1
+
+    queue = CrawlQueue(venues_dir.parent / "crawl_queue.db")
+    assert [dead['url'] for dead in queue.dead_letters('fixture')] == [f"{site.url}/venue/hall-002"]